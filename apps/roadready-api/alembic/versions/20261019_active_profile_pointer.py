@@ -0,0 +1,45 @@
+"""replace onboarding_profiles.is_active with user.active_profile_id
+
+Revision ID: 20261019_active_profile_pointer
+Revises: 20261019_test_record_profiles
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '20261019_active_profile_pointer'
+down_revision = '20261019_test_record_profiles'
+branch_labels = None
+depends_on = None
+
+user = sa.table('user', sa.column('id', sa.Integer), sa.column('active_profile_id', sa.Integer))
+profiles = sa.table(
+    'onboarding_profiles',
+    sa.column('id', sa.Integer), sa.column('user_id', sa.Integer),
+    sa.column('is_active', sa.Boolean), sa.column('updated_at', sa.DateTime)
+)
+
+def upgrade() -> None:
+    op.add_column('user', sa.Column('active_profile_id', sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        'fk_user_active_profile', 'user', 'onboarding_profiles',
+        ['active_profile_id'], ['id'], ondelete='SET NULL'
+    )
+    # Profiles per user are few: point each user at their (most recently updated) active profile
+    op.execute(user.update().values(active_profile_id=(
+        sa.select(profiles.c.id)
+        .where(profiles.c.user_id == user.c.id, profiles.c.is_active == sa.true())
+        .order_by(profiles.c.updated_at.desc())
+        .limit(1)
+        .scalar_subquery()
+    )))
+    op.drop_column('onboarding_profiles', 'is_active')
+
+def downgrade() -> None:
+    op.add_column('onboarding_profiles', sa.Column('is_active', sa.Boolean(), nullable=False, server_default=sa.false()))
+    op.execute(profiles.update().values(is_active=sa.true()).where(
+        profiles.c.id.in_(sa.select(user.c.active_profile_id).where(user.c.active_profile_id.isnot(None)))
+    ))
+    op.drop_constraint('fk_user_active_profile', 'user', type_='foreignkey')
+    op.drop_column('user', 'active_profile_id')
@@ -0,0 +1,53 @@
+"""add user and cohort statistics written by the batch analytics job
+
+Revision ID: 20261019_batch_analytics
+Revises: 20261019_readiness_scores
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '20261019_batch_analytics'
+down_revision = '20261019_readiness_scores'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table('user_statistics',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('total_tests', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('average_score', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('best_score', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('worst_score', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('pass_rate', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('total_time_spent', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('improvement_rate', sa.Float(), nullable=True),
+        sa.Column('current_streak', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('longest_streak', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_test_at', sa.DateTime(), nullable=True),
+        sa.Column('computed_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id')
+    )
+    op.create_table('cohort_statistics',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('state_code', sa.String(length=2), nullable=False),
+        sa.Column('test_type', sa.String(length=50), nullable=False),
+        sa.Column('users', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('total_tests', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('average_score', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('pass_rate', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('score_histogram', sa.JSON(), nullable=False),
+        sa.Column('attempt_curve', sa.JSON(), nullable=False),
+        sa.Column('computed_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('state_code', 'test_type', name='uq_cohort_statistics_state_type')
+    )
+    # Rows are populated nightly by scripts/run_batch_analytics.py
+
+def downgrade() -> None:
+    op.drop_table('cohort_statistics')
+    op.drop_table('user_statistics')
@@ -0,0 +1,217 @@
+"""store test record payloads in compact binary form
+
+Revision ID: 20261019_compact_test_payloads
+Revises: 20261019_question_bank
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import json
+
+revision = '20261019_compact_test_payloads'
+down_revision = '20261019_question_bank'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+COLUMNS = ('questions', 'user_answers', 'is_correct')
+
+# Frozen copy of the codecs as they were at this revision (app.models.types may change later)
+RAW = 0x00
+PACKED = 0x01
+QUESTION_FIELDS = {"id", "stateCode", "testType", "category", "question", "options",
+                   "correctAnswer", "explanation", "imageUrl"}
+OPTIONAL_QUESTION_FIELDS = ("testType", "explanation", "imageUrl")
+
+
+def _raw(value: str) -> bytes:
+    return bytes([RAW]) + value.encode("utf-8")
+
+
+def _decode_raw(value: bytes) -> str:
+    if value[:1] == b"[" or value[:1] == b"{":
+        return value.decode("utf-8")
+    return value[1:].decode("utf-8")
+
+
+def _load_list(value: str):
+    try:
+        parsed = json.loads(value)
+    except (TypeError, ValueError):
+        return None
+    return parsed if isinstance(parsed, list) else None
+
+
+def _write_varint(n: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = n & 0x7F
+        n >>= 7
+        if n:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _read_varint(data: bytes, offset: int):
+    n = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        n |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return n, offset
+        shift += 7
+
+
+def _encode_bools(value: str):
+    values = _load_list(value)
+    if values is None or not all(isinstance(v, bool) for v in values):
+        return None
+    bits = bytearray((len(values) + 7) // 8)
+    for index, flag in enumerate(values):
+        if flag:
+            bits[index >> 3] |= 1 << (index & 7)
+    return bytes([PACKED]) + _write_varint(len(values)) + bytes(bits)
+
+
+def _decode_bools(data: bytes) -> str:
+    length, offset = _read_varint(data, 0)
+    return json.dumps([bool(data[offset + (i >> 3)] & (1 << (i & 7))) for i in range(length)])
+
+
+def _encode_answers(value: str):
+    values = _load_list(value)
+    if values is None:
+        return None
+    packed = bytearray([PACKED])
+    for answer in values:
+        if answer is None:
+            packed.append(0)
+        elif isinstance(answer, int) and not isinstance(answer, bool) and 0 <= answer < 255:
+            packed.append(answer + 1)
+        else:
+            return None
+    return bytes(packed)
+
+
+def _decode_answers(data: bytes) -> str:
+    return json.dumps([byte - 1 if byte else None for byte in data])
+
+
+def _load_bank(bind) -> dict:
+    """Active questions in the client shape, keyed by (state_code, question_id)"""
+    questions = sa.table(
+        'questions',
+        *[sa.column(name) for name in ('question_id', 'state_code', 'test_type', 'category', 'prompt',
+                                       'correct_answer', 'explanation', 'image_url', 'is_active')],
+        sa.column('options', sa.JSON()),
+    )
+    return {
+        (row.state_code, row.question_id): {
+            "id": row.question_id,
+            "stateCode": row.state_code,
+            "testType": row.test_type,
+            "category": row.category,
+            "question": row.prompt,
+            "options": list(row.options or ()),
+            "correctAnswer": row.correct_answer,
+            "explanation": row.explanation,
+            "imageUrl": row.image_url,
+        }
+        for row in bind.execute(sa.select(questions).where(questions.c.is_active == sa.true()))
+    }
+
+
+def _encode_questions(bank: dict, value: str):
+    questions = _load_list(value)
+    if not questions:
+        return None
+    refs = []
+    for question in questions:
+        if not isinstance(question, dict) or not set(question) <= QUESTION_FIELDS:
+            return None
+        state_code, question_id = question.get("stateCode"), question.get("id")
+        if not isinstance(state_code, str) or not isinstance(question_id, str) or ":" in state_code:
+            return None
+        expected = bank.get((state_code, question_id))
+        if expected is None:
+            return None
+        if any(question.get(key, expected[key]) != expected[key] for key in expected):
+            return None
+        if any(key not in question for key in expected if key not in OPTIONAL_QUESTION_FIELDS):
+            return None
+        refs.append(f"{state_code}:{question_id}")
+    return bytes([PACKED]) + "\n".join(refs).encode("utf-8")
+
+
+def _decode_questions(bank: dict, data: bytes) -> str:
+    questions = []
+    for ref in data.decode("utf-8").split("\n"):
+        state_code, question_id = ref.split(":", 1)
+        questions.append(bank.get((state_code, question_id)) or {"id": question_id, "stateCode": state_code})
+    return json.dumps(questions)
+
+
+def _convert(source_type, target_type, convert) -> None:
+    """Copy each payload column into a ``<name>_new`` column in keyset-paginated batches"""
+    bind = op.get_bind()
+    for name in COLUMNS:
+        op.add_column('test_records', sa.Column(f'{name}_new', target_type, nullable=True))
+
+    table = sa.table(
+        'test_records',
+        sa.column('id', sa.Integer()),
+        *[sa.column(name, source_type) for name in COLUMNS],
+        *[sa.column(f'{name}_new', target_type) for name in COLUMNS],
+    )
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(table.c.id, *[table.c[name] for name in COLUMNS])
+            .where(table.c.id > last_id)
+            .order_by(table.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        bind.execute(
+            table.update().where(table.c.id == sa.bindparam('_id')),
+            [
+                {'_id': row[0], **{f'{name}_new': convert(name, row[i + 1]) for i, name in enumerate(COLUMNS)}}
+                for row in rows
+            ]
+        )
+        last_id = rows[-1][0]
+
+    for name in COLUMNS:
+        op.drop_column('test_records', name)
+        op.alter_column('test_records', f'{name}_new', new_column_name=name, nullable=False)
+
+
+def upgrade() -> None:
+    # Questions identical to the bank are stored as references
+    bank = _load_bank(op.get_bind())
+    encoders = {
+        'questions': lambda value: _encode_questions(bank, value),
+        'user_answers': _encode_answers,
+        'is_correct': _encode_bools,
+    }
+    _convert(sa.Text(), sa.LargeBinary(), lambda name, value: encoders[name](value) or _raw(value))
+
+
+def downgrade() -> None:
+    bank = _load_bank(op.get_bind())
+    decoders = {
+        'questions': lambda data: _decode_questions(bank, data),
+        'user_answers': _decode_answers,
+        'is_correct': _decode_bools,
+    }
+
+    def convert(name, value):
+        value = bytes(value)
+        return decoders[name](value[1:]) if value and value[0] == PACKED else _decode_raw(value)
+
+    _convert(sa.LargeBinary(), sa.Text(), convert)
@@ -0,0 +1,105 @@
+"""compress large marketplace text columns
+
+Revision ID: 20261019_compressed_text
+Revises: 20261019_compact_test_payloads
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import zlib
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+revision = '20261019_compressed_text'
+down_revision = '20261019_compact_test_payloads'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+# Frozen copy of CompressedText's format as of this revision (app.models.types may change later)
+RAW = 0x00
+ZLIB = 0x01
+ZSTD = 0x02
+THRESHOLD = 256
+LEVEL = 3
+COLUMNS = [
+    ('partner_product', 'description', True),
+    ('user_listing', 'description', True),
+    ('listing_inquiry', 'message', False),
+]
+
+
+def _compress(value):
+    if value is None:
+        return None
+    raw = value.encode("utf-8")
+    if len(raw) >= THRESHOLD:
+        # zlib, readable on every host: the codec must not depend on which packages are installed
+        compressed = bytes([ZLIB]) + zlib.compress(raw, LEVEL)
+        if len(compressed) < len(raw) + 1:
+            return compressed
+    return bytes([RAW]) + raw
+
+
+def _decompress(value):
+    if value is None:
+        return None
+    value = bytes(value)
+    if not value:
+        return ""
+    if value[0] == ZLIB:
+        return zlib.decompress(value[1:]).decode("utf-8")
+    if value[0] == ZSTD:
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read zstd-compressed values")
+        return zstandard.ZstdDecompressor().decompress(value[1:]).decode("utf-8")
+    if value[0] == RAW:
+        return value[1:].decode("utf-8")
+    return value.decode("utf-8")
+
+
+def _rewrite(table_name: str, column_name: str, source_type, target_type, convert) -> None:
+    """Copy a column into ``<name>_new`` in keyset-paginated batches, then swap it in"""
+    bind = op.get_bind()
+    op.add_column(table_name, sa.Column(f'{column_name}_new', target_type, nullable=True))
+    table = sa.table(
+        table_name,
+        sa.column('id', sa.Integer()),
+        sa.column(column_name, source_type),
+        sa.column(f'{column_name}_new', target_type),
+    )
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(table.c.id, table.c[column_name])
+            .where(table.c.id > last_id)
+            .order_by(table.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        bind.execute(
+            table.update().where(table.c.id == sa.bindparam('_id')),
+            [{'_id': row_id, f'{column_name}_new': convert(value)} for row_id, value in rows]
+        )
+        last_id = rows[-1][0]
+    op.drop_column(table_name, column_name)
+    op.alter_column(table_name, f'{column_name}_new', new_column_name=column_name)
+
+
+def upgrade() -> None:
+    for table_name, column_name, nullable in COLUMNS:
+        _rewrite(table_name, column_name, sa.Text(), sa.LargeBinary(), _compress)
+        if not nullable:
+            op.alter_column(table_name, column_name, nullable=False)
+
+
+def downgrade() -> None:
+    for table_name, column_name, nullable in COLUMNS:
+        _rewrite(table_name, column_name, sa.LargeBinary(), sa.Text(), _decompress)
+        if not nullable:
+            op.alter_column(table_name, column_name, nullable=False)
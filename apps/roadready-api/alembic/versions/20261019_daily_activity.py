@@ -0,0 +1,34 @@
+"""add daily activity rollup and user timezone
+
+Revision ID: 20261019_daily_activity
+Revises: 20250128_marketplace
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '20261019_daily_activity'
+down_revision = '20250128_marketplace'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.add_column('user', sa.Column('timezone', sa.String(length=64), nullable=True))
+    
+    op.create_table('daily_activity',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('activity_date', sa.Date(), nullable=False),
+        sa.Column('test_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('total_score', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('time_spent', sa.Integer(), nullable=False, server_default='0'),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'activity_date', name='uq_daily_activity_user_date')
+    )
+    # Existing rows are populated by scripts/backfill_daily_activity.py
+
+def downgrade() -> None:
+    op.drop_table('daily_activity')
+    op.drop_column('user', 'timezone')
@@ -0,0 +1,22 @@
+"""add weekly digest opt-out and last sent date to users
+
+Revision ID: 20261019_digest_preferences
+Revises: 20261019_inline_test_questions
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '20261019_digest_preferences'
+down_revision = '20261019_inline_test_questions'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.add_column('user', sa.Column('digest_opt_out', sa.Boolean(), nullable=False, server_default=sa.false()))
+    op.add_column('user', sa.Column('last_digest_on', sa.Date(), nullable=True))
+
+def downgrade() -> None:
+    op.drop_column('user', 'last_digest_on')
+    op.drop_column('user', 'digest_opt_out')
@@ -0,0 +1,34 @@
+"""add email outbox drained by the background email worker
+
+Revision ID: 20261019_email_outbox
+Revises: 20261019_active_profile_pointer
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '20261019_email_outbox'
+down_revision = '20261019_active_profile_pointer'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table('email_outbox',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(length=50), nullable=False),
+        sa.Column('to_email', sa.String(length=255), nullable=False),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='pending'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+        sa.Column('last_error', sa.String(length=500), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('sent_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_email_outbox_status_next_attempt', 'email_outbox', ['status', 'next_attempt_at'])
+
+def downgrade() -> None:
+    op.drop_index('ix_email_outbox_status_next_attempt', table_name='email_outbox')
+    op.drop_table('email_outbox')
@@ -0,0 +1,119 @@
+"""store full question content in test records instead of question bank references
+
+Revision ID: 20261019_inline_test_questions
+Revises: 20261019_question_ratings_test_type
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import json
+import logging
+import zlib
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+revision = '20261019_inline_test_questions'
+down_revision = '20261019_question_ratings_test_type'
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger('alembic.runtime.migration')
+
+BATCH_SIZE = 1000
+# Headers: references written by 20261019_compact_test_payloads, and CompressedText's
+RAW = 0x00
+REFS = 0x01
+ZLIB = 0x01
+ZSTD = 0x02
+
+test_records = sa.table('test_records', sa.column('id', sa.Integer()), sa.column('questions', sa.LargeBinary()))
+
+
+def _load_questions(bind) -> dict:
+    """Every question (deactivated ones too) in the client shape, keyed by (state_code, question_id)"""
+    questions = sa.table(
+        'questions',
+        *[sa.column(name) for name in ('question_id', 'state_code', 'test_type', 'category', 'prompt',
+                                       'correct_answer', 'explanation', 'image_url')],
+        sa.column('options', sa.JSON()),
+    )
+    return {
+        (row.state_code, row.question_id): {
+            "id": row.question_id,
+            "stateCode": row.state_code,
+            "testType": row.test_type,
+            "category": row.category,
+            "question": row.prompt,
+            "options": list(row.options or ()),
+            "correctAnswer": row.correct_answer,
+            "explanation": row.explanation,
+            "imageUrl": row.image_url,
+        }
+        for row in bind.execute(sa.select(questions))
+    }
+
+
+def _rewrite(convert) -> None:
+    """Rewrite test_records.questions in keyset-paginated batches; ``convert`` returns None to keep a value"""
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(test_records.c.id, test_records.c.questions)
+            .where(test_records.c.id > last_id)
+            .order_by(test_records.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        updates = [
+            {'_id': row_id, 'questions': new}
+            for row_id, value in rows
+            if (new := convert(bytes(value))) is not None
+        ]
+        if updates:
+            bind.execute(test_records.update().where(test_records.c.id == sa.bindparam('_id')), updates)
+        last_id = rows[-1][0]
+
+
+def upgrade() -> None:
+    # References resolve to the question's current content: the best this history has,
+    # since references never recorded which version was asked
+    bank = _load_questions(op.get_bind())
+    missing = 0
+
+    def convert(value: bytes):
+        nonlocal missing
+        if value[:1] != bytes([REFS]):
+            return None
+        questions = []
+        for ref in value[1:].decode('utf-8').split('\n'):
+            state_code, question_id = ref.split(':', 1)
+            question = bank.get((state_code, question_id))
+            if question is None:
+                missing += 1
+                question = {"id": question_id, "stateCode": state_code}
+            questions.append(question)
+        return bytes([ZLIB]) + zlib.compress(json.dumps(questions).encode('utf-8'), 6)
+
+    _rewrite(convert)
+    if missing:
+        logger.warning(f"{missing} referenced questions no longer exist; stored as id and state only")
+
+
+def downgrade() -> None:
+    # Plain JSON (RAW) is readable by the previous column type
+    def convert(value: bytes):
+        if value[:1] == bytes([ZLIB]):
+            return bytes([RAW]) + zlib.decompress(value[1:])
+        if value[:1] == bytes([ZSTD]):
+            if zstandard is None:
+                raise RuntimeError("zstandard is required to read zstd-compressed values")
+            return bytes([RAW]) + zstandard.ZstdDecompressor().decompress(value[1:])
+        return None
+
+    _rewrite(convert)
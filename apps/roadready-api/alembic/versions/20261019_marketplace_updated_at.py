@@ -0,0 +1,28 @@
+"""add updated_at to marketplace tables for incremental exports
+
+Revision ID: 20261019_marketplace_updated_at
+Revises: 20261019_digest_preferences
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '20261019_marketplace_updated_at'
+down_revision = '20261019_digest_preferences'
+branch_labels = None
+depends_on = None
+
+TABLES = ('partner_product', 'user_listing', 'listing_inquiry')
+
+def upgrade() -> None:
+    for table_name in TABLES:
+        op.add_column(table_name, sa.Column('updated_at', sa.DateTime(), nullable=True))
+        # Existing rows count as last changed when they were created
+        table = sa.table(table_name, sa.column('created_at', sa.DateTime()), sa.column('updated_at', sa.DateTime()))
+        op.execute(table.update().values(updated_at=table.c.created_at))
+        op.alter_column(table_name, 'updated_at', nullable=False)
+
+def downgrade() -> None:
+    for table_name in TABLES:
+        op.drop_column(table_name, 'updated_at')
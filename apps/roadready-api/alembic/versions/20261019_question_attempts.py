@@ -0,0 +1,43 @@
+"""add question attempts table
+
+Revision ID: 20261019_question_attempts
+Revises: 20261019_daily_activity
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '20261019_question_attempts'
+down_revision = '20261019_daily_activity'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table('question_attempts',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('test_record_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('question_id', sa.String(length=64), nullable=False),
+        sa.Column('state_code', sa.String(length=2), nullable=False),
+        sa.Column('test_type', sa.String(length=50), nullable=False),
+        sa.Column('category', sa.String(length=50), nullable=False),
+        sa.Column('is_correct', sa.Boolean(), nullable=False),
+        sa.Column('user_answer', sa.Integer(), nullable=True),
+        sa.Column('attempted_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['test_record_id'], ['test_records.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_question_attempts_test_record_id', 'question_attempts', ['test_record_id'])
+    op.create_index('ix_question_attempts_state_question', 'question_attempts', ['state_code', 'question_id'])
+    op.create_index('ix_question_attempts_state_category', 'question_attempts', ['state_code', 'category'])
+    op.create_index('ix_question_attempts_user_question', 'question_attempts', ['user_id', 'question_id'])
+    # Existing rows are populated by scripts/backfill_question_attempts.py
+
+def downgrade() -> None:
+    op.drop_index('ix_question_attempts_user_question', table_name='question_attempts')
+    op.drop_index('ix_question_attempts_state_category', table_name='question_attempts')
+    op.drop_index('ix_question_attempts_state_question', table_name='question_attempts')
+    op.drop_index('ix_question_attempts_test_record_id', table_name='question_attempts')
+    op.drop_table('question_attempts')
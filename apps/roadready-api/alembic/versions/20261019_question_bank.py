@@ -0,0 +1,39 @@
+"""add question bank table
+
+Revision ID: 20261019_question_bank
+Revises: 20261019_review_items
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '20261019_question_bank'
+down_revision = '20261019_review_items'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table('questions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('question_id', sa.String(length=64), nullable=False),
+        sa.Column('state_code', sa.String(length=2), nullable=False),
+        sa.Column('test_type', sa.String(length=50), nullable=False),
+        sa.Column('category', sa.String(length=50), nullable=False),
+        sa.Column('prompt', sa.Text(), nullable=False),
+        sa.Column('options', sa.JSON(), nullable=False),
+        sa.Column('correct_answer', sa.Integer(), nullable=False),
+        sa.Column('explanation', sa.Text(), nullable=True),
+        sa.Column('image_url', sa.String(length=500), nullable=True),
+        sa.Column('version', sa.Integer(), nullable=False, server_default='1'),
+        sa.Column('is_active', sa.Boolean(), nullable=False, server_default='true'),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('state_code', 'question_id', name='uq_questions_state_question')
+    )
+    op.create_index('ix_questions_state_type_category', 'questions', ['state_code', 'test_type', 'category'])
+
+def downgrade() -> None:
+    op.drop_index('ix_questions_state_type_category', table_name='questions')
+    op.drop_table('questions')
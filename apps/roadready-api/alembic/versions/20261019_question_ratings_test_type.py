@@ -0,0 +1,28 @@
+"""key question ratings by test type
+
+Revision ID: 20261019_question_ratings_test_type
+Revises: 20261019_email_outbox
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+
+revision = '20261019_question_ratings_test_type'
+down_revision = '20261019_email_outbox'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.drop_constraint('uq_question_ratings_state_question', 'question_ratings', type_='unique')
+    op.create_unique_constraint(
+        'uq_question_ratings_state_type_question', 'question_ratings', ['state_code', 'test_type', 'question_id']
+    )
+
+def downgrade() -> None:
+    # Ratings of the same question under different test types can't share one row again
+    op.execute(
+        "DELETE FROM question_ratings a USING question_ratings b "
+        "WHERE a.state_code = b.state_code AND a.question_id = b.question_id AND a.id > b.id"
+    )
+    op.drop_constraint('uq_question_ratings_state_type_question', 'question_ratings', type_='unique')
+    op.create_unique_constraint('uq_question_ratings_state_question', 'question_ratings', ['state_code', 'question_id'])
@@ -0,0 +1,47 @@
+"""add question difficulty and user skill ratings
+
+Revision ID: 20261019_ratings
+Revises: 20261019_question_attempts
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '20261019_ratings'
+down_revision = '20261019_question_attempts'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table('question_ratings',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('question_id', sa.String(length=64), nullable=False),
+        sa.Column('state_code', sa.String(length=2), nullable=False),
+        sa.Column('test_type', sa.String(length=50), nullable=False),
+        sa.Column('category', sa.String(length=50), nullable=False),
+        sa.Column('difficulty', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('state_code', 'question_id', name='uq_question_ratings_state_question')
+    )
+    op.create_index('ix_question_ratings_state_test_type', 'question_ratings', ['state_code', 'test_type'])
+    
+    op.create_table('user_skill_ratings',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('category', sa.String(length=50), nullable=False),
+        sa.Column('ability', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'category', name='uq_user_skill_ratings_user_category')
+    )
+    # Existing attempts are replayed by scripts/rebuild_ratings.py
+
+def downgrade() -> None:
+    op.drop_table('user_skill_ratings')
+    op.drop_index('ix_question_ratings_state_test_type', table_name='question_ratings')
+    op.drop_table('question_ratings')
@@ -0,0 +1,37 @@
+"""add readiness scores per user and state/test type
+
+Revision ID: 20261019_readiness_scores
+Revises: 20261019_session_last_write
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '20261019_readiness_scores'
+down_revision = '20261019_session_last_write'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table('readiness_scores',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('state_code', sa.String(length=2), nullable=False),
+        sa.Column('test_type', sa.String(length=50), nullable=False),
+        sa.Column('total_tests', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('weight', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('weighted_score', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('weighted_passes', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('last_test_at', sa.DateTime(), nullable=True),
+        sa.Column('readiness_score', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('pass_probability', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'state_code', 'test_type', name='uq_readiness_scores_user_state_type')
+    )
+    # Existing rows are populated by scripts/backfill_readiness.py
+
+def downgrade() -> None:
+    op.drop_table('readiness_scores')
@@ -0,0 +1,37 @@
+"""add spaced-repetition review items
+
+Revision ID: 20261019_review_items
+Revises: 20261019_ratings
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '20261019_review_items'
+down_revision = '20261019_ratings'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table('review_items',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('question_id', sa.String(length=64), nullable=False),
+        sa.Column('state_code', sa.String(length=2), nullable=False),
+        sa.Column('category', sa.String(length=50), nullable=False),
+        sa.Column('easiness', sa.Float(), nullable=False, server_default='2.5'),
+        sa.Column('interval_days', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('repetitions', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('lapses', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('due_at', sa.DateTime(), nullable=False),
+        sa.Column('last_reviewed_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'state_code', 'question_id', name='uq_review_items_user_question')
+    )
+    op.create_index('ix_review_items_user_due', 'review_items', ['user_id', 'due_at'])
+
+def downgrade() -> None:
+    op.drop_index('ix_review_items_user_due', table_name='review_items')
+    op.drop_table('review_items')
@@ -0,0 +1,37 @@
+"""add score distributions per state/test type/category for percentile benchmarks
+
+Revision ID: 20261019_score_distributions
+Revises: 20261019_batch_analytics
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '20261019_score_distributions'
+down_revision = '20261019_batch_analytics'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table('score_distributions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('state_code', sa.String(length=2), nullable=False),
+        sa.Column('test_type', sa.String(length=50), nullable=False),
+        sa.Column('category', sa.String(length=50), nullable=False),
+        sa.Column('total_tests', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('counts', sa.JSON(), nullable=False),
+        sa.Column('p10', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('p25', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('p50', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('p75', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('p90', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_record_id', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('state_code', 'test_type', 'category', name='uq_score_distributions_state_type_category')
+    )
+    # Rows are populated by scripts/refresh_percentiles.py
+
+def downgrade() -> None:
+    op.drop_table('score_distributions')
@@ -0,0 +1,20 @@
+"""add sessions.last_write_at for read-after-write routing
+
+Revision ID: 20261019_session_last_write
+Revises: 20261019_compressed_text
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '20261019_session_last_write'
+down_revision = '20261019_compressed_text'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.add_column('sessions', sa.Column('last_write_at', sa.DateTime(), nullable=True))
+
+def downgrade() -> None:
+    op.drop_column('sessions', 'last_write_at')
@@ -0,0 +1,20 @@
+"""add user stats version for the statistics response cache
+
+Revision ID: 20261019_stats_version
+Revises: 20261019_score_distributions
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '20261019_stats_version'
+down_revision = '20261019_score_distributions'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.add_column('user', sa.Column('stats_version', sa.Integer(), nullable=False, server_default='0'))
+
+def downgrade() -> None:
+    op.drop_column('user', 'stats_version')
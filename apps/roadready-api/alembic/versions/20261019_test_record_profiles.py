@@ -0,0 +1,28 @@
+"""link test records to onboarding profiles
+
+Revision ID: 20261019_test_record_profiles
+Revises: 20261019_stats_version
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '20261019_test_record_profiles'
+down_revision = '20261019_stats_version'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.add_column('test_records', sa.Column(
+        'onboarding_profile_id', sa.Integer(),
+        sa.ForeignKey('onboarding_profiles.id', name='fk_test_records_onboarding_profile', ondelete='SET NULL'),
+        nullable=True
+    ))
+    op.create_index('ix_test_records_user_profile_created', 'test_records', ['user_id', 'onboarding_profile_id', 'created_at'])
+    # Existing rows are populated by scripts/backfill_test_record_profiles.py
+
+def downgrade() -> None:
+    op.drop_index('ix_test_records_user_profile_created', table_name='test_records')
+    op.drop_constraint('fk_test_records_onboarding_profile', 'test_records', type_='foreignkey')
+    op.drop_column('test_records', 'onboarding_profile_id')
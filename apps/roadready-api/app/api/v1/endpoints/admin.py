@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Depends
+from app.core.config import settings
+from app.core.database import pool_stats, replica_stats
+from app.core.security import require_admin
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+@router.get("/db-pool", summary="Connection pool statistics")
+async def get_db_pool():
+    """Current pool usage and the configuration it was sized from (requires X-Admin-Token)"""
+    return {
+        **pool_stats(),
+        "pre_ping": settings.DB_POOL_PRE_PING,
+        "pgbouncer": settings.DB_PGBOUNCER,
+        "workers": settings.WEB_CONCURRENCY,
+        "replicas": replica_stats(),
+    }
+
+admin = router
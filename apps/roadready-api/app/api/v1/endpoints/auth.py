@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request
 from fastapi.responses import RedirectResponse
+from starlette.concurrency import run_in_threadpool
 from sqlmodel import Session, select
 from datetime import timedelta, datetime
 from app.core.database import get_db
@@ -9,6 +10,7 @@ from app.core.security import (
 )
 from app.core.oauth import oauth
 from app.models.user import User
+from app.models.onboarding_profile import OnboardingProfile
 from app.schemas.user import Token, LoginRequest, UserRead, UserCreate
 from app.schemas.auth import SignupRequest, UserProfileUpdate, TokenResponse, ChangePasswordRequest, ChangeEmailRequest
 from app.core.config import settings
@@ -17,6 +19,12 @@ import warnings
 import logging
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+def _user_read(user: User, db: Session) -> UserRead:
+    """User with the active profile (already in the identity map after get_current_user)"""
+    profile = db.get(OnboardingProfile, user.active_profile_id) if user.active_profile_id else None
+    return UserRead.from_user(user, profile)
 
 @router.post(
     "/signup",
@@ -29,7 +37,7 @@ router = APIRouter()
         400: {"description": "Email already registered"},
     },
 )
-async def signup(signup_data: SignupRequest, request: Request, db: Session = Depends(get_db)):
+def signup(signup_data: SignupRequest, request: Request, db: Session = Depends(get_db)):
     from app.core.validation import validate_email, validate_password_strength
     from app.services.email_service import EmailService
     
@@ -47,10 +55,7 @@ async def signup(signup_data: SignupRequest, request: Request, db: Session = Dep
     db.add(db_user)
     db.flush()
     
-    try:
-        await EmailService.send_welcome_email(email)
-    except Exception as e:
-        logger.error(f"Failed to send welcome email: {e}")
+    EmailService.send_welcome_email(db, email)
     
     access_token, refresh_token = create_tokens(db_user.id, db, request)
     return {
@@ -69,7 +74,7 @@ async def signup(signup_data: SignupRequest, request: Request, db: Session = Dep
         401: {"description": "Invalid credentials"},
     },
 )
-async def login(login_data: LoginRequest, request: Request, db: Session = Depends(get_db)):
+def login(login_data: LoginRequest, request: Request, db: Session = Depends(get_db)):
     if '@' not in login_data.email:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -112,9 +117,9 @@ async def login(login_data: LoginRequest, request: Request, db: Session = Depend
         401: {"description": "Not authenticated"},
     },
 )
-async def get_me(request: Request, current_user: User = Depends(get_current_user)):
+def get_me(request: Request, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
     logger.debug(f"GET /api/v1/me | user_id={current_user.id} | email={current_user.email}")
-    return current_user
+    return _user_read(current_user, db)
 
 @router.post(
     "/refresh",
@@ -122,7 +127,7 @@ async def get_me(request: Request, current_user: User = Depends(get_current_user
     summary="Refresh access token",
     description="Get new access token using refresh token",
 )
-async def refresh_token(refresh_data: dict, request: Request, db: Session = Depends(get_db)):
+def refresh_token(refresh_data: dict, request: Request, db: Session = Depends(get_db)):
     from jose import jwt, JWTError
     from app.models.session import Session as SessionModel
     
@@ -169,7 +174,7 @@ async def refresh_token(refresh_data: dict, request: Request, db: Session = Depe
         401: {"description": "Not authenticated"},
     },
 )
-async def logout(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+def logout(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
     from jose import jwt
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
@@ -189,7 +194,7 @@ async def logout(token: str = Depends(oauth2_scheme), db: Session = Depends(get_
         401: {"description": "Not authenticated"},
     },
 )
-async def logout_all(
+def logout_all(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -206,14 +211,14 @@ async def logout_all(
         401: {"description": "Not authenticated"},
     },
 )
-async def update_profile(
+def update_profile(
     profile_data: UserProfileUpdate,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     from app.core.validation import (
         validate_phone_number, validate_state_code, 
-        validate_test_type, validate_date_of_birth
+        validate_test_type, validate_date_of_birth, validate_timezone
     )
     
     if profile_data.first_name is not None:
@@ -232,12 +237,12 @@ async def update_profile(
         current_user.test_type = validate_test_type(profile_data.test_type)
     if profile_data.license_number is not None:
         current_user.license_number = profile_data.license_number
+    if profile_data.timezone is not None:
+        current_user.timezone = validate_timezone(profile_data.timezone)
     
     current_user.updated_at = datetime.utcnow()
     db.add(current_user)
-    db.commit()
-    db.refresh(current_user)
-    return current_user
+    return _user_read(current_user, db)
 
 @router.post(
     "/change-password",
@@ -248,7 +253,7 @@ async def update_profile(
         401: {"description": "Invalid current password"},
     },
 )
-async def change_password(
+def change_password(
     password_data: ChangePasswordRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -267,7 +272,6 @@ async def change_password(
     current_user.hashed_password = get_password_hash(password_data.new_password)
     current_user.updated_at = datetime.utcnow()
     db.add(current_user)
-    db.commit()
     return {"message": "Password changed successfully"}
 
 @router.post(
@@ -281,7 +285,7 @@ async def change_password(
         401: {"description": "Invalid password"},
     },
 )
-async def change_email(
+def change_email(
     email_data: ChangeEmailRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -300,8 +304,6 @@ async def change_email(
     current_user.email_verified = False
     current_user.updated_at = datetime.utcnow()
     db.add(current_user)
-    db.commit()
-    db.refresh(current_user)
     return current_user
 
 @router.post(
@@ -309,7 +311,7 @@ async def change_email(
     summary="Send verification email",
     description="Send email verification link to user's email"
 )
-async def send_verification_email(
+def send_verification_email(
     request: Request,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -324,12 +326,12 @@ async def send_verification_email(
         current_user.verification_token = token
         current_user.verification_token_expires = datetime.utcnow() + timedelta(hours=24)
         db.add(current_user)
-        db.commit()
+        db.flush()
         
         base_url = str(request.base_url).rstrip('/')
-        result = await EmailService.send_verification_email(current_user.email, token, base_url)
+        result = EmailService.send_verification_email(db, current_user.email, token, base_url)
         
-        logger.info(f"VERIFICATION_EMAIL_SENT | user={current_user.email} | {result}")
+        logger.info(f"VERIFICATION_EMAIL_QUEUED | user={current_user.email} | {result}")
         
         return {"message": "Verification email sent", **result}
     except HTTPException:
@@ -343,7 +345,7 @@ async def send_verification_email(
     summary="Verify email",
     description="Verify user email with token",
 )
-async def verify_email(token: str, db: Session = Depends(get_db)):
+def verify_email(token: str, db: Session = Depends(get_db)):
     user = db.exec(select(User).where(
         User.verification_token == token,
         User.verification_token_expires > datetime.utcnow()
@@ -357,7 +359,6 @@ async def verify_email(token: str, db: Session = Depends(get_db)):
     user.verification_token_expires = None
     user.updated_at = datetime.utcnow()
     db.add(user)
-    db.commit()
     
     return {"message": "Email verified successfully"}
 
@@ -402,38 +403,40 @@ async def oauth_callback(provider: str, request: Request, db: Session = Depends(
         if not email:
             raise HTTPException(status_code=400, detail="Email not provided by OAuth provider")
         
-        # Find or create user
-        user = db.exec(select(User).where(User.email == email)).first()
-        
-        if not user:
-            # Create new user with OAuth
-            user = User(
-                email=email,
-                oauth_provider=provider,
-                oauth_provider_id=provider_id,
-                state="CA",  # Default, should be updated by user
-                test_type="car",  # Default, should be updated by user
-            )
-            db.add(user)
-            db.commit()
-            db.refresh(user)
-        elif not user.oauth_provider:
-            # Link OAuth to existing email account
-            user.oauth_provider = provider
-            user.oauth_provider_id = provider_id
-            db.add(user)
-            db.commit()
-        
-        # Create access token
-        access_token, refresh_token = create_tokens(user.id, db, request)
-        return {
-            "access_token": access_token,
-            "refresh_token": refresh_token,
-            "token_type": "bearer"
-        }
+        # Writes wait for SQLite's writer lock, which must not happen on the event loop
+        return await run_in_threadpool(_oauth_sign_in, provider, email, provider_id, request, db)
     
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"OAuth authentication failed: {str(e)}")
 
+def _oauth_sign_in(provider: str, email: str, provider_id: str, request: Request, db: Session) -> dict:
+    """Find or create the OAuth user and open a session"""
+    user = db.exec(select(User).where(User.email == email)).first()
+    
+    if not user:
+        # Create new user with OAuth
+        user = User(
+            email=email,
+            oauth_provider=provider,
+            oauth_provider_id=provider_id,
+            state="CA",  # Default, should be updated by user
+            test_type="car",  # Default, should be updated by user
+        )
+        db.add(user)
+        db.flush()
+    elif not user.oauth_provider:
+        # Link OAuth to existing email account
+        user.oauth_provider = provider
+        user.oauth_provider_id = provider_id
+        db.add(user)
+    
+    # Create access token
+    access_token, refresh_token = create_tokens(user.id, db, request)
+    return {
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+        "token_type": "bearer"
+    }
+
 
 auth = router
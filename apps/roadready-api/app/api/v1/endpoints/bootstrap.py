@@ -0,0 +1,64 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlmodel import Session
+from typing import Optional
+import orjson
+from app.core.config import settings
+from app.core.database import get_db, get_read_db, run_in_sessions
+from app.core.security import get_current_user
+from app.models.onboarding_profile import OnboardingProfile
+from app.models.user import User
+from app.schemas.bootstrap import BootstrapRead
+from app.schemas.onboarding_profile import OnboardingProfileRead
+from app.schemas.user import UserRead
+from app.services.gamification_service import GamificationService
+from app.services.statistics_service import StatisticsService
+from app.services.stats_cache import StatsCache
+
+router = APIRouter()
+
+SECTIONS = tuple(BootstrapRead.model_fields)
+
+@router.get(
+    "/",
+    response_model=BootstrapRead,
+    response_model_exclude_unset=True,
+    summary="Get app startup data",
+    description="The user, active profile, statistics, gamification stats and achievements in one request",
+    responses={400: {"description": "Unknown section in fields"}},
+)
+async def get_bootstrap(
+    fields: Optional[str] = Query(None, description=f"Comma-separated sections to include (default: all of {', '.join(SECTIONS)})"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    read_db: Session = Depends(get_read_db)
+):
+    """One auth lookup for all sections; the ones that need queries run concurrently"""
+    sections = {name.strip() for name in fields.split(",") if name.strip()} if fields else set(SECTIONS)
+    unknown = sections - set(SECTIONS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    
+    # The user and active profile were loaded by get_current_user: no queries
+    profile = db.get(OnboardingProfile, current_user.active_profile_id) if current_user.active_profile_id else None
+    result = {}
+    if "me" in sections:
+        result["me"] = UserRead.from_user(current_user, profile)
+    if "active_profile" in sections:
+        result["active_profile"] = OnboardingProfileRead.from_profile(profile, current_user.active_profile_id) if profile else None
+    if "gamification" in sections:
+        result["gamification"] = GamificationService.stats(current_user)
+    
+    loaders = {}
+    if "statistics" in sections:
+        # Shares the cache entry of GET /statistics/, so a hit needs no query at all
+        loaders["statistics"] = lambda session: orjson.loads(StatsCache.cached(
+            current_user, f"{settings.API_V1_STR}/statistics/?",
+            lambda fresh: StatisticsService.calculate_user_statistics(current_user.id, fresh),
+            session, db
+        ))
+    if "achievements" in sections:
+        loaders["achievements"] = lambda session: GamificationService.achievements(current_user.id, session)
+    result.update(await run_in_sessions(read_db, loaders))
+    return result
+
+bootstrap = router
@@ -11,7 +11,7 @@ from app.schemas.email_verification import (
     PasswordResetRequest, PasswordResetConfirm, MessageResponse
 )
 from app.services.email_service import EmailService
-from app.core.security import get_password_hash
+from app.core.security import get_password_hash, verify_unsubscribe_token
 from app.core.validation import validate_password_strength
 
 router = APIRouter()
@@ -22,7 +22,7 @@ router = APIRouter()
     summary="Send email verification",
     description="Send verification email to user's email address"
 )
-async def send_verification_email(
+def send_verification_email(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -50,10 +50,8 @@ async def send_verification_email(
         expires_at=expires_at
     )
     db.add(verification)
-    db.commit()
-    
-    # Send email
-    await EmailService.send_verification_email(current_user.email, token)
+    # Sent by the outbox worker once this transaction (token included) commits
+    EmailService.send_verification_email(db, current_user.email, token)
     
     return MessageResponse(message="Verification email sent successfully")
 
@@ -63,7 +61,7 @@ async def send_verification_email(
     summary="Verify email",
     description="Verify email using token from email"
 )
-async def verify_email(
+def verify_email(
     verification_data: EmailVerificationConfirm,
     db: Session = Depends(get_db)
 ):
@@ -91,8 +89,6 @@ async def verify_email(
         user.updated_at = datetime.utcnow()
         db.add(user)
     
-    db.commit()
-    
     return MessageResponse(message="Email verified successfully")
 
 @router.post(
@@ -101,7 +97,7 @@ async def verify_email(
     summary="Request password reset",
     description="Send password reset email"
 )
-async def request_password_reset(
+def request_password_reset(
     reset_request: PasswordResetRequest,
     db: Session = Depends(get_db)
 ):
@@ -134,10 +130,8 @@ async def request_password_reset(
         expires_at=expires_at
     )
     db.add(reset)
-    db.commit()
-    
-    # Send email
-    await EmailService.send_password_reset_email(user.email, token)
+    # Sent by the outbox worker once this transaction (token included) commits
+    EmailService.send_password_reset_email(db, user.email, token)
     
     return MessageResponse(message="If the email exists, a password reset link has been sent")
 
@@ -147,7 +141,7 @@ async def request_password_reset(
     summary="Reset password",
     description="Reset password using token from email"
 )
-async def reset_password(
+def reset_password(
     reset_data: PasswordResetConfirm,
     db: Session = Depends(get_db)
 ):
@@ -180,9 +174,27 @@ async def reset_password(
     
     db.add(user)
     db.add(reset)
-    db.commit()
     
     return MessageResponse(message="Password reset successfully")
 
+@router.post(
+    "/unsubscribe-digest",
+    response_model=MessageResponse,
+    summary="Unsubscribe from the weekly digest",
+    description="One-click unsubscribe (RFC 8058) with the token from the digest's List-Unsubscribe header",
+    responses={400: {"description": "Invalid unsubscribe token"}},
+)
+def unsubscribe_digest(token: str, db: Session = Depends(get_db)):
+    user_id = verify_unsubscribe_token(token)
+    user = db.get(User, user_id) if user_id is not None else None
+    if not user:
+        raise HTTPException(status_code=400, detail="Invalid unsubscribe token")
+    
+    user.digest_opt_out = True
+    user.updated_at = datetime.utcnow()
+    db.add(user)
+    
+    return MessageResponse(message="Unsubscribed from the weekly digest")
+
 
 email_verification = router
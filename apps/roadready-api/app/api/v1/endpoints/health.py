@@ -9,3 +9,5 @@ async def root():
 @router.get("/health")
 async def health():
     return {"status": "healthy"}
+
+health = router
@@ -1,20 +1,28 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlmodel import Session, select
 from typing import Optional, List
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.core.security import get_current_user
 from app.models.user import User
 from app.models.marketplace import PartnerProduct, UserListing, ListingInquiry, PartnerLead
+from app.schemas.marketplace import PartnerProductRead, UserListingRead, ListingWithSeller, ListingInquiryRead
 from datetime import datetime, timedelta
 import json
 
 router = APIRouter()
 
+def _with_seller(listing: UserListing, user: User) -> ListingWithSeller:
+    """Listing read from the ORM object's attributes (no intermediate dict) with seller details"""
+    seller_name = f"{user.first_name or ''} {user.last_name or ''}".strip() or user.email.split('@')[0]
+    return ListingWithSeller.model_validate(listing).model_copy(
+        update={"seller_name": seller_name, "seller_contact": user.email}
+    )
+
 # Partner Products Endpoints
-@router.get("/partner-products")
-async def get_partner_products(
+@router.get("/partner-products", response_model=List[PartnerProductRead])
+def get_partner_products(
     category: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     query = select(PartnerProduct).where(PartnerProduct.is_active == True)
     if category:
@@ -22,15 +30,15 @@ async def get_partner_products(
     products = db.exec(query).all()
     return products
 
-@router.get("/partner-products/{product_id}")
-async def get_partner_product(product_id: int, db: Session = Depends(get_db)):
+@router.get("/partner-products/{product_id}", response_model=PartnerProductRead)
+def get_partner_product(product_id: int, db: Session = Depends(get_read_db)):
     product = db.get(PartnerProduct, product_id)
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
     return product
 
 @router.post("/partner-products/{product_id}/track-lead")
-async def track_lead(
+def track_lead(
     product_id: int,
     lead_data: dict,
     current_user: User = Depends(get_current_user),
@@ -42,33 +50,24 @@ async def track_lead(
         action=lead_data.get("contact_method", "view")
     )
     db.add(lead)
-    db.commit()
     return {"message": "Lead tracked"}
 
 # User Listings Endpoints
-@router.get("/listings")
-async def get_listings(
+@router.get("/listings", response_model=List[ListingWithSeller])
+def get_listings(
     category: Optional[str] = None,
     status: str = "active",
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     query = select(UserListing, User).join(User).where(UserListing.status == status)
     if category:
         query = query.where(UserListing.category == category)
     query = query.order_by(UserListing.created_at.desc())
     results = db.exec(query).all()
-    
-    listings = []
-    for listing, user in results:
-        listing_dict = listing.model_dump()
-        seller_name = f"{user.first_name or ''} {user.last_name or ''}".strip() or user.email.split('@')[0]
-        listing_dict["seller_name"] = seller_name
-        listing_dict["seller_contact"] = user.email
-        listings.append(listing_dict)
-    return listings
+    return [_with_seller(listing, user) for listing, user in results]
 
-@router.get("/listings/{listing_id}")
-async def get_listing(listing_id: int, db: Session = Depends(get_db)):
+@router.get("/listings/{listing_id}", response_model=ListingWithSeller)
+def get_listing(listing_id: int, db: Session = Depends(get_read_db)):
     result = db.exec(
         select(UserListing, User).join(User).where(UserListing.id == listing_id)
     ).first()
@@ -76,14 +75,10 @@ async def get_listing(listing_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Listing not found")
     
     listing, user = result
-    listing_dict = listing.model_dump()
-    seller_name = f"{user.first_name or ''} {user.last_name or ''}".strip() or user.email.split('@')[0]
-    listing_dict["seller_name"] = seller_name
-    listing_dict["seller_contact"] = user.email
-    return listing_dict
+    return _with_seller(listing, user)
 
-@router.post("/listings")
-async def create_listing(
+@router.post("/listings", response_model=UserListingRead)
+def create_listing(
     listing_data: dict,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -104,12 +99,11 @@ async def create_listing(
         expires_at=datetime.utcnow() + timedelta(days=30)
     )
     db.add(listing)
-    db.commit()
-    db.refresh(listing)
+    db.flush()
     return listing
 
-@router.put("/listings/{listing_id}")
-async def update_listing(
+@router.put("/listings/{listing_id}", response_model=UserListingRead)
+def update_listing(
     listing_id: int,
     listing_data: dict,
     current_user: User = Depends(get_current_user),
@@ -125,12 +119,10 @@ async def update_listing(
         setattr(listing, key, value)
     
     db.add(listing)
-    db.commit()
-    db.refresh(listing)
     return listing
 
 @router.delete("/listings/{listing_id}")
-async def delete_listing(
+def delete_listing(
     listing_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -142,49 +134,52 @@ async def delete_listing(
         raise HTTPException(status_code=403, detail="Not authorized")
     
     db.delete(listing)
-    db.commit()
     return {"message": "Listing deleted"}
 
-@router.get("/my-listings")
-async def get_my_listings(
+@router.get("/my-listings", response_model=List[UserListingRead])
+def get_my_listings(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     listings = db.exec(
         select(UserListing)
         .where(UserListing.user_id == current_user.id)
         .order_by(UserListing.created_at.desc())
     ).all()
-    return [listing.model_dump() for listing in listings]
+    return listings
 
 # Inquiry Endpoints
 @router.post("/listings/{listing_id}/inquire")
-async def create_inquiry(
+def create_inquiry(
     listing_id: int,
     inquiry_data: dict,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    listing = db.get(UserListing, listing_id)
-    if not listing:
+    # Seller id and contact in the same round trip as the existence check
+    seller = db.exec(
+        select(UserListing.user_id, User.email)
+        .join(User, User.id == UserListing.user_id)
+        .where(UserListing.id == listing_id)
+    ).first()
+    if not seller:
         raise HTTPException(status_code=404, detail="Listing not found")
     
+    seller_user_id, seller_email = seller
     inquiry = ListingInquiry(
         listing_id=listing_id,
         buyer_user_id=current_user.id,
-        seller_user_id=listing.user_id,
+        seller_user_id=seller_user_id,
         message=inquiry_data.get("message", "I am interested in this item"),
         contact_info=current_user.email
     )
     db.add(inquiry)
-    db.commit()
-    db.refresh(inquiry)
-    return {"message": "Inquiry sent", "seller_contact": db.get(User, listing.user_id).email}
+    return {"message": "Inquiry sent", "seller_contact": seller_email}
 
-@router.get("/inquiries")
-async def get_inquiries(
+@router.get("/inquiries", response_model=List[ListingInquiryRead])
+def get_inquiries(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     # Get inquiries where user is buyer or seller
     inquiries = db.exec(
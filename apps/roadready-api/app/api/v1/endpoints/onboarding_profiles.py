@@ -6,11 +6,12 @@ from app.core.security import get_current_user
 from app.models.user import User
 from app.models.onboarding_profile import OnboardingProfile
 from app.schemas.onboarding_profile import OnboardingProfileCreate, OnboardingProfileRead, OnboardingProfileUpdate
+from app.services.stats_cache import StatsCache
 
 router = APIRouter()
 
 @router.post("/", response_model=OnboardingProfileRead, status_code=201)
-async def create_profile(
+def create_profile(
     profile_data: OnboardingProfileCreate,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -23,29 +24,26 @@ async def create_profile(
     )
     db.add(profile)
     db.flush()
-    return profile
+    StatsCache.bump(current_user.id, db)
+    return OnboardingProfileRead.from_profile(profile, current_user.active_profile_id)
 
 @router.get("/", response_model=list[OnboardingProfileRead])
-async def list_profiles(
+def list_profiles(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     profiles = db.exec(
         select(OnboardingProfile).where(OnboardingProfile.user_id == current_user.id)
     ).all()
-    return profiles
+    return [OnboardingProfileRead.from_profile(p, current_user.active_profile_id) for p in profiles]
 
 @router.get("/active")
-async def get_active_profile(
+def get_active_profile(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    profile = db.exec(
-        select(OnboardingProfile).where(
-            OnboardingProfile.user_id == current_user.id,
-            OnboardingProfile.is_active == True
-        )
-    ).first()
+    # Loaded with the user by get_current_user: no query
+    profile = db.get(OnboardingProfile, current_user.active_profile_id) if current_user.active_profile_id else None
     if not profile:
         return {"profile": None}
     return {
@@ -54,13 +52,13 @@ async def get_active_profile(
         "profile_name": profile.profile_name,
         "state": profile.state,
         "test_type": profile.test_type,
-        "is_active": profile.is_active,
+        "is_active": True,
         "created_at": profile.created_at.isoformat(),
         "updated_at": profile.updated_at.isoformat()
     }
 
 @router.get("/{profile_id}", response_model=OnboardingProfileRead)
-async def get_profile(
+def get_profile(
     profile_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -73,10 +71,10 @@ async def get_profile(
     ).first()
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
-    return profile
+    return OnboardingProfileRead.from_profile(profile, current_user.active_profile_id)
 
 @router.patch("/{profile_id}", response_model=OnboardingProfileRead)
-async def update_profile(
+def update_profile(
     profile_id: int,
     profile_data: OnboardingProfileUpdate,
     current_user: User = Depends(get_current_user),
@@ -99,17 +97,18 @@ async def update_profile(
         profile.test_type = profile_data.test_type
     if profile_data.is_active is not None:
         if profile_data.is_active:
-            for p in db.exec(select(OnboardingProfile).where(OnboardingProfile.user_id == current_user.id)).all():
-                p.is_active = False
-                db.add(p)
-        profile.is_active = profile_data.is_active
+            current_user.active_profile_id = profile.id
+        elif current_user.active_profile_id == profile.id:
+            current_user.active_profile_id = None
+        db.add(current_user)
     
     profile.updated_at = datetime.utcnow()
     db.add(profile)
-    return profile
+    StatsCache.bump(current_user.id, db)
+    return OnboardingProfileRead.from_profile(profile, current_user.active_profile_id)
 
 @router.post("/{profile_id}/activate", response_model=OnboardingProfileRead)
-async def activate_profile(
+def activate_profile(
     profile_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -123,23 +122,18 @@ async def activate_profile(
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
     
-    for p in db.exec(select(OnboardingProfile).where(OnboardingProfile.user_id == current_user.id)).all():
-        p.is_active = False
-        db.add(p)
-    
-    profile.is_active = True
-    profile.updated_at = datetime.utcnow()
-    
+    # Switching is a single UPDATE of the user row (pointer, state and test type together)
+    current_user.active_profile_id = profile.id
     current_user.state = profile.state
     current_user.test_type = profile.test_type
     current_user.updated_at = datetime.utcnow()
-    
-    db.add(profile)
+    # Invalidates cached statistics in the same statement (see StatsCache.bump)
+    current_user.stats_version = User.stats_version + 1
     db.add(current_user)
-    return profile
+    return OnboardingProfileRead.from_profile(profile, profile.id)
 
 @router.delete("/{profile_id}", status_code=204)
-async def delete_profile(
+def delete_profile(
     profile_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -153,7 +147,12 @@ async def delete_profile(
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
     
+    if current_user.active_profile_id == profile.id:
+        # ON DELETE SET NULL does the same, but SQLite only enforces it with foreign_keys=ON
+        current_user.active_profile_id = None
+        db.add(current_user)
     db.delete(profile)
+    StatsCache.bump(current_user.id, db)
     return None
 
 onboarding_profiles = router
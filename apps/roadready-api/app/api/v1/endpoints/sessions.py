@@ -17,7 +17,7 @@ router = APIRouter()
     summary="List active sessions",
     description="Get all active sessions for the current user"
 )
-async def list_sessions(
+def list_sessions(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -47,7 +47,7 @@ async def list_sessions(
     summary="Revoke session",
     description="Revoke a specific session"
 )
-async def revoke_specific_session(
+def revoke_specific_session(
     session_id: str,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
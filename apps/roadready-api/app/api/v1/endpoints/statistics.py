@@ -1,38 +1,219 @@
-from fastapi import APIRouter, Depends
-from sqlmodel import Session
-from typing import Dict, List
-from app.core.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlmodel import Session, select
+from typing import Dict, List, Optional
+from datetime import datetime
+from app.core.cache import etag_matches
+from app.core.database import get_db, get_read_db
 from app.core.security import get_current_user
+from app.models.onboarding_profile import OnboardingProfile
+from app.models.readiness import ReadinessScore
 from app.models.user import User
-from app.schemas.test_statistics import TestStatistics, WeakArea
+from app.schemas.test_statistics import TestStatistics, WeakArea, QuestionDifficulty, CategoryMissRate, QuestionRecommendation, ReadinessRead, PercentileRead
 from app.services.statistics_service import StatisticsService
+from app.services.question_analytics_service import QuestionAnalyticsService
+from app.services.rating_service import RatingService
+from app.services.readiness_service import ReadinessService
+from app.services.percentile_service import PercentileService
+from app.services.stats_cache import StatsCache
 
 router = APIRouter()
 
+def _require_profile(user: User, profile_id: Optional[int], db: Session) -> None:
+    """404 unless ``profile_id`` is unset or one of the user's profiles (checked before any 304)"""
+    if profile_id is None:
+        return
+    owned = db.exec(select(OnboardingProfile.id).where(
+        OnboardingProfile.user_id == user.id,
+        OnboardingProfile.id == profile_id
+    )).first()
+    if owned is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+
 @router.get(
     "/",
     response_model=TestStatistics,
     summary="Get test statistics",
-    description="Get comprehensive test statistics for the current user"
+    description="Get comprehensive test statistics for the current user or one onboarding profile, with ETag",
+    responses={304: {"description": "Client copy is current"}, 404: {"description": "Profile not found"}},
 )
-async def get_statistics(
+def get_statistics(
+    request: Request,
+    profile_id: Optional[int] = Query(None, description="Only this onboarding profile's tests"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db),
+    primary: Session = Depends(get_db)
 ):
     """Get comprehensive test statistics including scores, trends, and category performance"""
-    return StatisticsService.calculate_user_statistics(current_user.id, db)
+    _require_profile(current_user, profile_id, primary)
+    def compute(session: Session):
+        stats = StatisticsService.calculate_user_statistics(current_user.id, session, profile_id)
+        if stats is None:
+            raise HTTPException(status_code=404, detail="Profile not found")
+        return stats
+    return StatsCache.respond(request, current_user, compute, db, primary)
 
 @router.get(
     "/weak-areas",
+    response_model=Dict[str, List[WeakArea]],
     summary="Get weak areas",
-    description="Identify categories where user needs improvement"
+    description="Identify categories where user needs improvement, with ETag",
+    responses={304: {"description": "Client copy is current"}, 404: {"description": "Profile not found"}},
 )
-async def get_weak_areas(
+def get_weak_areas(
+    request: Request,
     threshold: float = 70.0,
+    profile_id: Optional[int] = Query(None, description="Only this onboarding profile's tests"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-) -> Dict[str, List[WeakArea]]:
+    db: Session = Depends(get_read_db),
+    primary: Session = Depends(get_db)
+):
     """Get list of categories where user is performing below threshold"""
-    return StatisticsService.get_weak_areas(current_user.id, db, threshold)
+    _require_profile(current_user, profile_id, primary)
+    return StatsCache.respond(
+        request, current_user,
+        lambda session: StatisticsService.get_weak_areas(current_user.id, session, threshold, profile_id),
+        db, primary
+    )
+
+@router.get(
+    "/readiness",
+    response_model=ReadinessRead,
+    summary="Get readiness score",
+    description="Recency-weighted readiness score and pass probability for one onboarding profile, with ETag",
+    responses={304: {"description": "Client copy is current"}, 404: {"description": "Profile not found"}},
+)
+def get_readiness(
+    request: Request,
+    response: Response,
+    profile_id: Optional[int] = Query(None, description="Onboarding profile (defaults to the active one)"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+    primary: Session = Depends(get_db)
+):
+    """Stored score maintained on every new test record: a single indexed lookup"""
+    if profile_id is not None:
+        profile = db.exec(select(OnboardingProfile.state, OnboardingProfile.test_type).where(
+            OnboardingProfile.user_id == current_user.id,
+            OnboardingProfile.id == profile_id
+        )).first()
+    else:
+        # Loaded with the user by get_current_user into the primary session: no query (the
+        # replica session starts with an empty identity map)
+        active = primary.get(OnboardingProfile, current_user.active_profile_id) if current_user.active_profile_id else None
+        profile = (active.state, active.test_type) if active else None
+    if profile is None and profile_id is not None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    state_code, test_type = profile if profile else (current_user.state, current_user.test_type)
+    if not state_code or not test_type:
+        raise HTTPException(status_code=404, detail="No state and test type selected")
+    
+    row = ReadinessService.get(current_user.id, state_code, test_type, db)
+    # The pass probability decays between tests: served as of the start of the UTC day,
+    # so it is stable under one ETag
+    as_of = datetime.combine(datetime.utcnow().date(), datetime.min.time())
+    version = f"{row.updated_at.timestamp():.6f}" if row else "0"
+    etag = f'"{state_code}-{test_type}-{version}-{as_of.date().isoformat()}"'
+    headers = {"ETag": etag, "Cache-Control": "private, max-age=0, must-revalidate"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    
+    if row is None:
+        row = ReadinessScore(user_id=current_user.id, state_code=state_code, test_type=test_type)
+    readiness = ReadinessRead.model_validate(row)
+    readiness.pass_probability = round(ReadinessService.pass_probability(row, as_of), 4)
+    return readiness
+
+@router.get(
+    "/percentile",
+    response_model=PercentileRead,
+    summary="Get score percentile",
+    description="Where a score ranks among all users' tests for a state, test type and optionally category",
+    responses={404: {"description": "No benchmark data yet"}},
+)
+def get_percentile(
+    score: int = Query(..., ge=0, le=100, description="Score to rank"),
+    state_code: Optional[str] = Query(None, description="State code (defaults to the user's state)"),
+    test_type: Optional[str] = Query(None, description="Test type (defaults to the user's test type)"),
+    category: Optional[str] = Query(None, description="Category (defaults to all categories)"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """Answered from the periodically refreshed score distributions: a single indexed lookup"""
+    state_code = state_code.upper() if state_code else current_user.state
+    test_type = test_type or current_user.test_type
+    if not state_code or not test_type:
+        raise HTTPException(status_code=404, detail="No state and test type selected")
+    
+    row = PercentileService.get(db, state_code, test_type, category)
+    if row is None or not row.total_tests:
+        raise HTTPException(status_code=404, detail="No benchmark data yet")
+    return PercentileRead(
+        state_code=row.state_code,
+        test_type=row.test_type,
+        category=category,
+        score=score,
+        percentile=PercentileService.percentile_rank(row.counts, score),
+        total_tests=row.total_tests,
+        p10=row.p10,
+        p25=row.p25,
+        p50=row.p50,
+        p75=row.p75,
+        p90=row.p90,
+        updated_at=row.updated_at
+    )
+
+@router.get(
+    "/recommendations",
+    response_model=List[QuestionRecommendation],
+    summary="Get recommended questions",
+    description="Questions most likely to improve the user's pass probability, based on per-question ratings"
+)
+def get_recommendations(
+    n: int = Query(10, ge=1, le=100, description="Number of questions"),
+    state_code: Optional[str] = Query(None, description="State code (defaults to the user's state)"),
+    test_type: Optional[str] = Query(None, description="Test type (defaults to the user's test type)"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """Rank questions by difficulty relative to the user's per-category mastery"""
+    return RatingService.recommend(
+        current_user, db, n, state_code.upper() if state_code else None, test_type
+    )
+
+@router.get(
+    "/questions/hardest",
+    response_model=List[QuestionDifficulty],
+    summary="Get hardest questions",
+    description="Questions with the highest miss rate across all users for a state"
+)
+def get_hardest_questions(
+    state_code: str = Query(..., description="State code"),
+    test_type: Optional[str] = Query(None, description="Filter by test type"),
+    category: Optional[str] = Query(None, description="Filter by category"),
+    min_attempts: int = Query(5, ge=1, description="Minimum attempts for a question to be ranked"),
+    limit: int = Query(20, ge=1, le=100, description="Number of questions"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """Rank questions by miss rate using the normalized question_attempts table"""
+    return QuestionAnalyticsService.hardest_questions(
+        db, state_code.upper(), test_type, category, min_attempts, limit
+    )
+
+@router.get(
+    "/questions/categories",
+    response_model=List[CategoryMissRate],
+    summary="Get category miss rates",
+    description="Per-category miss rate across all users for a state"
+)
+def get_category_miss_rates(
+    state_code: str = Query(..., description="State code"),
+    test_type: Optional[str] = Query(None, description="Filter by test type"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """Per-category miss rates using the normalized question_attempts table"""
+    return QuestionAnalyticsService.category_miss_rates(db, state_code.upper(), test_type)
 
 statistics = router
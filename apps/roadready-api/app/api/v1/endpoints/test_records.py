@@ -1,43 +1,75 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlmodel import Session, select, func
 from typing import List, Optional
 from datetime import datetime, date
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.core.security import get_current_user
 from app.models.user import User
 from app.models.test_record import TestRecord
+from app.models.onboarding_profile import OnboardingProfile
 from app.schemas.test_record import TestRecordCreate, TestRecordRead
 from app.schemas.test_statistics import TestRecordPaginated
+from app.services.activity_service import ActivityService
+from app.services.export_service import ExportService
+from app.services.question_analytics_service import QuestionAnalyticsService
+from app.services.rating_service import RatingService
+from app.services.readiness_service import ReadinessService
+from app.services.review_service import ReviewService
+from app.services.stats_cache import StatsCache
 
 router = APIRouter()
 
 @router.post("/", response_model=TestRecordRead, status_code=201)
-async def create_test_record(
+def create_test_record(
     test_data: TestRecordCreate,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
+    # Link the test to an onboarding profile: the one given, else the active profile if it
+    # is for this state/test type
+    if test_data.onboarding_profile_id is not None:
+        profile_id = db.exec(select(OnboardingProfile.id).where(
+            OnboardingProfile.user_id == current_user.id,
+            OnboardingProfile.id == test_data.onboarding_profile_id
+        )).first()
+        if profile_id is None:
+            raise HTTPException(status_code=404, detail="Profile not found")
+    else:
+        # Loaded with the user by get_current_user: no query
+        active = db.get(OnboardingProfile, current_user.active_profile_id) if current_user.active_profile_id else None
+        matches = active is not None and (active.state, active.test_type) == (test_data.state_code, test_data.test_type)
+        profile_id = active.id if matches else None
+    
     test_record = TestRecord(
         user_id=current_user.id,
-        **test_data.model_dump()
+        **test_data.model_dump(exclude={"onboarding_profile_id"}),
+        onboarding_profile_id=profile_id
     )
     db.add(test_record)
     db.flush()
+    ActivityService.record_test(current_user, test_record, db)
+    ReadinessService.record_test(test_record, db)
+    attempts = QuestionAnalyticsService.record_attempts(test_record, db)
+    RatingService.apply_attempts(current_user.id, attempts, db)
+    ReviewService.schedule_attempts(current_user.id, attempts, db)
+    StatsCache.bump(current_user.id, db)
     return test_record
 
 @router.get("/", response_model=TestRecordPaginated)
-async def get_user_test_records(
+def get_user_test_records(
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(10, ge=1, le=100, description="Items per page"),
     state_code: Optional[str] = Query(None, description="Filter by state code"),
     test_type: Optional[str] = Query(None, description="Filter by test type"),
     category: Optional[str] = Query(None, description="Filter by category"),
+    profile_id: Optional[int] = Query(None, description="Filter by onboarding profile"),
     min_score: Optional[int] = Query(None, ge=0, le=100, description="Minimum score"),
     max_score: Optional[int] = Query(None, ge=0, le=100, description="Maximum score"),
     start_date: Optional[date] = Query(None, description="Start date filter"),
     end_date: Optional[date] = Query(None, description="End date filter"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get paginated test records with optional filters"""
     
@@ -51,6 +83,8 @@ async def get_user_test_records(
         statement = statement.where(TestRecord.test_type == test_type)
     if category:
         statement = statement.where(TestRecord.category == category)
+    if profile_id is not None:
+        statement = statement.where(TestRecord.onboarding_profile_id == profile_id)
     if min_score is not None:
         statement = statement.where(TestRecord.score >= min_score)
     if max_score is not None:
@@ -74,18 +108,42 @@ async def get_user_test_records(
     total_pages = (total + page_size - 1) // page_size
     
     return TestRecordPaginated(
-        items=[record.model_dump() for record in results],
+        items=results,
         total=total,
         page=page,
         page_size=page_size,
         total_pages=total_pages
     )
 
+@router.get("/export")
+def export_test_records(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="ndjson or csv"),
+    gzip: bool = Query(False, description="Gzip-compress the download"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """Stream the user's complete test history in constant memory"""
+    chunks = ExportService.iter_test_records(current_user.id, db.get_bind())
+    if format == "csv":
+        stream, media_type = ExportService.csv(chunks), "text/csv"
+    else:
+        stream, media_type = ExportService.ndjson(chunks), "application/x-ndjson"
+    
+    filename = f"test_records.{format}"
+    if gzip:
+        stream, media_type, filename = ExportService.gzip(stream), "application/gzip", f"{filename}.gz"
+    
+    return StreamingResponse(
+        stream,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
 @router.get("/{test_id}", response_model=TestRecordRead)
-async def get_test_record(
+def get_test_record(
     test_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     test_record = db.get(TestRecord, test_id)
     if not test_record or test_record.user_id != current_user.id:
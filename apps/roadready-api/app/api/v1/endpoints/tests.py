@@ -1,10 +1,85 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlmodel import Session
+from typing import Optional
+import random
+from app.core.cache import etag_matches
+from app.core.database import get_db
+from app.core.security import get_current_user
+from app.models.user import User
+from app.schemas.review import ReviewQueue
+from app.services.review_service import ReviewService
+from app.services.question_bank import get_question_bank
 
 router = APIRouter()
 
-@router.get("/")
-async def get_tests():
-    return {"tests": []}
+@router.get(
+    "/",
+    summary="Generate a test",
+    description="Random test drawn from the in-memory question bank (no database access)"
+)
+def get_tests(
+    response: Response,
+    state: str = Query(..., min_length=2, max_length=2, description="State code"),
+    test_type: str = Query("car", alias="type", description="Test type"),
+    category: Optional[str] = Query(None, description="Restrict to one category"),
+    n: int = Query(20, ge=1, le=100, description="Number of questions"),
+    seed: Optional[int] = Query(None, description="Seed for a reproducible test"),
+):
+    """Sample ``n`` questions; ``version`` identifies the bank so clients can refresh cached copies"""
+    bank = get_question_bank()
+    state, test_type = state.upper(), test_type.lower()
+    questions = bank.sample(state, test_type, category, n, random.Random(seed) if seed is not None else None)
+    
+    version = bank.etag(state, test_type)
+    if version:
+        response.headers["X-Question-Bank-Version"] = version
+    return {
+        "state": state,
+        "test_type": test_type,
+        "category": category,
+        "version": version,
+        "questions": [question.to_client() for question in questions]
+    }
+
+@router.get(
+    "/bank",
+    summary="Download question bank",
+    description="Full question bank for a state and test type, with ETag for client-side caching",
+    responses={304: {"description": "Client copy is current"}, 404: {"description": "No questions"}},
+)
+def get_question_bank_slice(
+    request: Request,
+    state: str = Query(..., min_length=2, max_length=2, description="State code"),
+    test_type: str = Query("car", alias="type", description="Test type"),
+):
+    """Serve the pre-serialized bank slice; ``If-None-Match`` with the current ETag returns 304"""
+    bank = get_question_bank()
+    state, test_type = state.upper(), test_type.lower()
+    etag = bank.etag(state, test_type)
+    if etag is None:
+        raise HTTPException(status_code=404, detail="No questions for this state and test type")
+    
+    headers = {"ETag": etag, "Cache-Control": "private, max-age=0, must-revalidate"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=bank.payload(state, test_type), media_type="application/json", headers=headers)
+
+@router.get(
+    "/review-queue",
+    response_model=ReviewQueue,
+    summary="Get review queue",
+    description="Questions due for spaced-repetition review, oldest due first"
+)
+def get_review_queue(
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of questions"),
+    state_code: Optional[str] = Query(None, description="Filter by state code"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Return due questions scheduled by SM-2 from the user's submitted tests"""
+    return ReviewService.review_queue(
+        current_user.id, db, limit, state_code.upper() if state_code else None
+    )
 
 
 tests = router
@@ -19,7 +19,7 @@ router = APIRouter()
         400: {"description": "Email already registered"},
     },
 )
-async def create_user(user: UserCreate, db: Session = Depends(get_db)):
+def create_user(user: UserCreate, db: Session = Depends(get_db)):
     existing = db.exec(select(User).where(User.email == user.email)).first()
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
@@ -30,8 +30,7 @@ async def create_user(user: UserCreate, db: Session = Depends(get_db)):
     user_data = user.model_dump(exclude={"password"})
     db_user = User(**user_data, hashed_password=get_password_hash(user.password))
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    db.flush()
     return db_user
 
 @router.get(
@@ -44,7 +43,7 @@ async def create_user(user: UserCreate, db: Session = Depends(get_db)):
         404: {"description": "User not found"},
     },
 )
-async def get_user(
+def get_user(
     user_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -64,7 +63,7 @@ async def get_user(
         404: {"description": "User not found"},
     },
 )
-async def update_user(
+def update_user(
     user_id: int,
     user_update: UserCreate,
     db: Session = Depends(get_db),
@@ -84,8 +83,6 @@ async def update_user(
     user.updated_at = datetime.utcnow()
     
     db.add(user)
-    db.commit()
-    db.refresh(user)
     return user
 
 users = router
@@ -1,4 +1,5 @@
 """API Router for RoadReady API v1."""
+from fastapi import APIRouter
 from app.api.v1.endpoints.health import health as health_endpoint
 from app.api.v1.endpoints.auth import auth as auth_endpoint
 from app.api.v1.endpoints.email_verification import email_verification as email_verification_endpoint
@@ -10,6 +11,8 @@ from app.api.v1.endpoints.statistics import statistics as statistics_endpoint
 from app.api.v1.endpoints.sessions import sessions as sessions_endpoint
 from app.api.v1.endpoints.gamification import gamification as gamification_endpoint
 from app.api.v1.endpoints.marketplace import marketplace as marketplace_endpoint
+from app.api.v1.endpoints.admin import admin as admin_endpoint
+from app.api.v1.endpoints.bootstrap import bootstrap as bootstrap_endpoint
 
 api_router = APIRouter()
 
@@ -43,3 +46,9 @@ api_router.include_router(gamification_endpoint, prefix="/gamification", tags=["
 
 # Marketplace items/features
 api_router.include_router(marketplace_endpoint, prefix="/marketplace", tags=["marketplace"])
+
+# App startup data (composite of the endpoints above)
+api_router.include_router(bootstrap_endpoint, prefix="/bootstrap", tags=["bootstrap"])
+
+# Operational endpoints (X-Admin-Token)
+api_router.include_router(admin_endpoint, prefix="/admin", tags=["admin"])
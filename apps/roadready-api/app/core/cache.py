@@ -0,0 +1,122 @@
+from collections import OrderedDict
+from typing import Optional
+import logging
+import threading
+import time
+from app.core.config import settings
+
+try:
+    import redis
+except ImportError:  # optional: only needed for a cache shared between workers
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Whether an ``If-None-Match`` header matches ``etag``: a comma-separated list of
+    tags or ``*``, compared weakly (``W/"x"`` matches ``"x"``) as RFC 9110 requires.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    etag = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+class LRUCache:
+    """
+    Thread-safe in-process LRU of bytes values with an optional per-entry TTL.
+
+    ``get``/``set(key, value, ex=seconds)`` match redis-py, so an instance can also stand in
+    for the shared backend (e.g. in tests).
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ex: Optional[int] = None) -> None:
+        expires_at = time.monotonic() + ex if ex else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class TieredCache:
+    """
+    In-process LRU in front of an optional shared backend (anything with redis-py style
+    ``get``/``set``). Shared backend errors are logged and treated as misses.
+    """
+
+    def __init__(self, local: LRUCache, shared=None, ttl_seconds: Optional[int] = None):
+        self.local = local
+        self.shared = shared
+        self.ttl_seconds = ttl_seconds
+
+    def get(self, key: str) -> Optional[bytes]:
+        value = self.local.get(key)
+        if value is not None or self.shared is None:
+            return value
+        try:
+            value = self.shared.get(key)
+        except Exception as e:
+            logger.warning(f"CACHE_BACKEND_ERROR | op=get | error={e}")
+            return None
+        if value is not None:
+            self.local.set(key, value, ex=self.ttl_seconds)
+        return value
+
+    def set(self, key: str, value: bytes) -> None:
+        self.local.set(key, value, ex=self.ttl_seconds)
+        if self.shared is None:
+            return
+        try:
+            self.shared.set(key, value, ex=self.ttl_seconds)
+        except Exception as e:
+            logger.warning(f"CACHE_BACKEND_ERROR | op=set | error={e}")
+
+    def clear(self) -> None:
+        """Drop this process's entries (the shared backend expires on its own)"""
+        self.local.clear()
+
+
+def _shared_backend():
+    if not settings.STATS_CACHE_URL:
+        return None
+    if redis is None:
+        logger.warning("STATS_CACHE_URL is set but redis is not installed: using the in-process cache only")
+        return None
+    return redis.Redis.from_url(settings.STATS_CACHE_URL)
+
+
+# Serialized per-user statistics responses, keyed by the user's stats version
+stats_cache = TieredCache(
+    LRUCache(settings.STATS_CACHE_MAX_ENTRIES),
+    shared=_shared_backend(),
+    ttl_seconds=settings.STATS_CACHE_TTL_SECONDS,
+)
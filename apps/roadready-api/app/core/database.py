@@ -1,42 +1,425 @@
 from sqlmodel import create_engine, Session, SQLModel
+from sqlalchemy import event, Delete, Insert, Update
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError, SQLAlchemyError
+from sqlalchemy.pool import NullPool, QueuePool, SingletonThreadPool, StaticPool
+from starlette.concurrency import run_in_threadpool
+from datetime import datetime, timedelta
+from itertools import chain
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import asyncio
+import logging
+import threading
+import time
+from fastapi import Depends
 from app.core.config import settings
+from app.models.session import Session as SessionModel
 
+logger = logging.getLogger(__name__)
 
-def _create_engine():
-    url = settings.DATABASE_URL
+
+def pool_sizing(
+    max_connections: int,
+    reserved: int,
+    workers: int,
+    pool_size: int = 0,
+    max_overflow: int = -1
+) -> Tuple[int, int]:
+    """
+    Per-process (pool_size, max_overflow) so that all workers together stay within the
+    server's connection limit. Explicit values (pool_size > 0, max_overflow >= 0) win.
+    """
+    budget = max(1, (max_connections - reserved) // max(1, workers))
+    size = pool_size if pool_size > 0 else max(1, min(10, budget // 2))
+    overflow = max_overflow if max_overflow >= 0 else max(0, budget - size)
+    return size, overflow
+
+
+# Postgres' default, assumed when the server can't be asked
+FALLBACK_MAX_CONNECTIONS = 100
+
+# max_connections each Postgres engine's pool was sized from
+_max_connections: Dict[Engine, int] = {}
+
+
+def server_max_connections(probe: Engine) -> int:
+    """The server's ``max_connections``, or FALLBACK_MAX_CONNECTIONS if it can't be read"""
+    try:
+        with probe.connect() as conn:
+            return int(conn.exec_driver_sql("SHOW max_connections").scalar())
+    except (SQLAlchemyError, TypeError, ValueError) as e:
+        logger.warning(f"DB_POOL | max_connections unknown, assuming {FALLBACK_MAX_CONNECTIONS} | error={e!r}")
+        return FALLBACK_MAX_CONNECTIONS
+
+
+def max_connections_for(url: str) -> int:
+    """DB_MAX_CONNECTIONS if set, otherwise asked once over a throwaway connection"""
+    if settings.DB_MAX_CONNECTIONS > 0:
+        return settings.DB_MAX_CONNECTIONS
+    probe = create_engine(url, poolclass=NullPool, connect_args={"connect_timeout": 10})
+    try:
+        return server_max_connections(probe)
+    finally:
+        probe.dispose()
+
+
+_SQLITE_WRITE_PREFIXES = ("INSERT", "UPDATE", "DELETE", "REPLACE", "CREATE", "DROP", "ALTER")
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _configure_sqlite(engine: Engine) -> Engine:
+    """
+    Per-connection pragmas and, for database files, a process-wide writer lock.
+
+    SQLite allows one writer at a time. The lock is taken before a transaction's first
+    write statement and released when it commits or rolls back, so threads queue here
+    rather than racing for the file lock; busy_timeout covers writers in other processes.
+    Waiting must not block the event loop, so endpoints that write are plain ``def``
+    (run in the threadpool) and async code runs its writes with ``run_in_threadpool``.
+    """
+    in_memory = engine.url.database in (None, "", ":memory:")
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")
+        if settings.SQLITE_PERFORMANCE_MODE:
+            if not in_memory:
+                # Readers no longer block the writer (and vice versa); persists in the file
+                cursor.execute("PRAGMA journal_mode=WAL")
+            # With WAL, NORMAL only syncs at checkpoints: durable against crashes of the
+            # app, may lose the last commits on power loss
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute(f"PRAGMA cache_size=-{settings.SQLITE_CACHE_SIZE_KB}")
+            cursor.execute(f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}")
+        cursor.close()
+
+    if in_memory:
+        return engine
+
+    if not settings.SQLITE_WRITER_LOCK:
+        return engine
+
+    lock = threading.Lock()
+    timeout = settings.SQLITE_BUSY_TIMEOUT_MS / 1000
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _acquire_writer_lock(conn, cursor, statement, parameters, context, executemany):
+        if "writer_lock" in conn.info or not statement.lstrip()[:7].upper().startswith(_SQLITE_WRITE_PREFIXES):
+            return
+        started = time.monotonic()
+        if _on_event_loop():
+            # Blocking here would also stall the holder's commit, which the loop schedules
+            logger.warning("SQLITE_WRITER_LOCK | write on the event loop: run it in the threadpool")
+            acquired = lock.acquire(blocking=False)
+        else:
+            acquired = lock.acquire(timeout=timeout)
+        if acquired:
+            conn.info["writer_lock"] = lock
+        else:
+            # Let SQLite's busy_timeout arbitrate instead
+            logger.warning(f"SQLITE_WRITER_LOCK | not acquired | waited={time.monotonic() - started:.3f}s")
+
+    def _release(info) -> None:
+        held = info.pop("writer_lock", None)
+        if held is not None:
+            held.release()
+
+    @event.listens_for(engine, "commit")
+    @event.listens_for(engine, "rollback")
+    def _release_on_transaction_end(conn):
+        _release(conn.info)
+
+    @event.listens_for(engine, "checkin")
+    @event.listens_for(engine, "invalidate")
+    def _release_on_checkin(dbapi_connection, connection_record, *args):
+        # Safety net for connections returned or discarded mid-transaction
+        if connection_record is not None:
+            _release(connection_record.info)
+
+    return engine
+
+
+def _create_engine(url: str = settings.DATABASE_URL):
     if url.startswith("sqlite"):
+        # Connections move between threadpool threads, but the pool hands each to one
+        # thread at a time
+        return _configure_sqlite(create_engine(
+            url,
+            echo=False,
+            connect_args={"check_same_thread": False, "timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000},
+        ))
+    if settings.DB_PGBOUNCER:
+        # PgBouncer owns the pooling; in transaction mode server connections change between
+        # transactions, so no prepared statements and no per-connection startup options
+        # (set statement_timeout on the database role instead)
         return create_engine(
             url,
             echo=False,
-            connect_args={"check_same_thread": False},
+            poolclass=NullPool,
+            connect_args={
+                "connect_timeout": 10,
+                "prepare_threshold": None,
+            },
         )
-    return create_engine(
+    max_connections = max_connections_for(url)
+    pool_size, max_overflow = pool_sizing(
+        max_connections,
+        settings.DB_RESERVED_CONNECTIONS,
+        settings.WEB_CONCURRENCY,
+        settings.DB_POOL_SIZE,
+        settings.DB_MAX_OVERFLOW,
+    )
+    logger.info(
+        f"DB_POOL | pool_size={pool_size} | max_overflow={max_overflow} | workers={settings.WEB_CONCURRENCY}"
+        f" | max_connections={max_connections}"
+    )
+    sized = create_engine(
         url,
         echo=False,
-        pool_size=10,
-        max_overflow=20,
-        pool_timeout=30,
-        pool_recycle=3600,
-        pool_pre_ping=True,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
         connect_args={
             "connect_timeout": 10,
-            "options": "-c statement_timeout=30000",
+            "options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}",
         },
     )
+    _max_connections[sized] = max_connections
+    return sized
 
 
 engine = _create_engine()
 
+
+@event.listens_for(engine, "handle_error")
+def _log_disconnect(context):
+    # SQLAlchemy invalidates the whole pool on a disconnect error, so without pre-ping the
+    # failing request is the only one that sees a stale connection
+    if context.is_disconnect:
+        logger.warning(f"DB_DISCONNECT | pool invalidated | error={context.original_exception!r}")
+
+
+def pool_stats() -> dict:
+    """Snapshot of the engine's connection pool for monitoring"""
+    pool = engine.pool
+    stats = {"pool_class": type(pool).__name__, "status": pool.status(), "max_connections": _max_connections.get(engine)}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            pool_size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+            max_overflow=pool._max_overflow,
+            timeout=pool.timeout(),
+        )
+    return stats
+
+
+def insert_for(db: Session, table):
+    """Return a dialect-specific INSERT for ``table`` that supports ON CONFLICT upserts."""
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(table)
+
+class ReplicaSet:
+    """
+    Round-robin over read replicas, skipping any that recently failed. A replica is marked
+    down when a real query on it fails to connect or loses its connection - nothing probes.
+    """
+
+    def __init__(self, engines: List[Engine], cooldown_seconds: int):
+        self.engines = engines
+        self.cooldown_seconds = cooldown_seconds
+        self._down_until = {}
+        self._next = 0
+        self._lock = threading.Lock()
+        for replica in engines:
+            event.listen(replica, "handle_error", self._on_error)
+
+    def candidates(self) -> List[Engine]:
+        """Healthy replicas in round-robin order starting after the last one handed out"""
+        now = time.monotonic()
+        with self._lock:
+            start = self._next
+            self._next = (self._next + 1) % max(1, len(self.engines))
+            ordered = self.engines[start:] + self.engines[:start]
+            return [e for e in ordered if self._down_until.get(e, 0) <= now]
+
+    def is_healthy(self, replica: Engine) -> bool:
+        with self._lock:
+            return self._down_until.get(replica, 0) <= time.monotonic()
+
+    def mark_down(self, replica: Engine, error: Exception) -> None:
+        with self._lock:
+            self._down_until[replica] = time.monotonic() + self.cooldown_seconds
+        logger.warning(f"DB_REPLICA_DOWN | replica={replica.url.host} | cooldown={self.cooldown_seconds}s | error={error!r}")
+
+    def _on_error(self, context) -> None:
+        # Connect failures arrive without a connection; pre-ping failures are retried by the pool
+        if context.is_pre_ping or not (context.is_disconnect or context.connection is None):
+            return
+        if context.engine is not None:
+            self.mark_down(context.engine, context.original_exception)
+
+
+replicas = ReplicaSet(
+    [_create_engine(url.strip()) for url in settings.DATABASE_READ_URLS.split(",") if url.strip()],
+    settings.DB_REPLICA_COOLDOWN_SECONDS,
+)
+
+
+class ReadSession(Session):
+    """
+    Session for read-only endpoints. The bind is chosen on first use - after auth has run -
+    so users who just wrote read from the primary; everyone else gets a healthy replica.
+    """
+
+    def __init__(self, primary: Session, replica_set: ReplicaSet):
+        super().__init__(bind=primary.get_bind())
+        self.primary = primary
+        self.replica_set = replica_set
+        self._read_bind: Optional[Engine] = None
+
+    def get_bind(self, mapper=None, **kwargs):
+        clause = kwargs.get("clause")
+        if self._flushing or isinstance(clause, (Insert, Update, Delete)):
+            return self.primary.get_bind()
+        if self._read_bind is None:
+            self._read_bind = self._choose_bind()
+        return self._read_bind
+
+    def _choose_bind(self) -> Engine:
+        if self.primary.info.get("read_primary"):
+            return self.primary.get_bind()
+        candidates = self.replica_set.candidates()
+        return candidates[0] if candidates else self.primary.get_bind()
+
+    def _connection_for_bind(self, engine, execution_options=None, **kw):
+        """
+        Connect for the first query. A replica that can't be reached (already marked down
+        by the engine's error hook) is replaced by the next healthy one, then the primary.
+        """
+        tried = set()
+        while True:
+            try:
+                return super()._connection_for_bind(engine, execution_options, **kw)
+            except OperationalError:
+                if engine is not self._read_bind or engine is self.primary.get_bind():
+                    raise
+                tried.add(engine)
+                candidates = [e for e in self.replica_set.candidates() if e not in tried]
+                engine = self._read_bind = candidates[0] if candidates else self.primary.get_bind()
+
+
+@event.listens_for(Session, "after_flush")
+def _track_writes(session, flush_context):
+    # Touching the auth session row on every request is not a user write
+    if any(not isinstance(obj, SessionModel) for obj in chain(session.new, session.dirty, session.deleted)):
+        session.info["wrote"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_writes(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+
+def replica_stats() -> List[dict]:
+    """Health and pool status of each read replica"""
+    return [
+        {
+            "host": replica.url.host,
+            "healthy": replicas.is_healthy(replica),
+            "status": replica.pool.status(),
+        }
+        for replica in replicas.engines
+    ]
+
+
 def get_db():
     with Session(engine) as session:
         try:
             yield session
+            auth_session = session.info.get("auth_session")
+            if auth_session is not None and session.info.get("wrote"):
+                auth_session.last_write_at = datetime.utcnow()
             session.commit()
         except Exception:
             session.rollback()
             raise
 
 
+def get_read_db(db: Session = Depends(get_db)):
+    """
+    Session for read-only endpoints: a replica when DATABASE_READ_URLS is set, otherwise
+    (and for read-after-write) the request's primary session.
+    """
+    if not replicas.engines:
+        yield db
+        return
+    with ReadSession(db, replicas) as session:
+        yield session
+
+
+def pin_reads_to_primary(db: Session, last_write_at: Optional[datetime]) -> None:
+    """Route this request's reads to the primary if the user wrote very recently"""
+    if last_write_at and last_write_at > datetime.utcnow() - timedelta(seconds=settings.DB_READ_AFTER_WRITE_SECONDS):
+        db.info["read_primary"] = True
+
+
+# Connections run_in_sessions may hold on top of the requests' own, across all requests
+_parallel_connections = threading.BoundedSemaphore(settings.DB_PARALLEL_QUERY_CONNECTIONS)
+
+
+async def run_in_sessions(db: Session, loaders: Dict[str, Callable[[Session], Any]]) -> Dict[str, Any]:
+    """
+    Run independent read-only ``loaders`` concurrently on the threadpool and return their
+    results by name. The first runs in ``db``; each other one gets its own session only
+    while one of the DB_PARALLEL_QUERY_CONNECTIONS slots is free, so concurrent requests
+    can't drain the pool - otherwise it runs after the first in ``db``. Everything runs in
+    ``db`` when the pool can't hand out separate connections (in-memory SQLite shares
+    one connection, or pins one per thread).
+    """
+    bind = db.get_bind()
+    if len(loaders) < 2 or isinstance(bind.pool, (StaticPool, SingletonThreadPool)):
+        return {name: loader(db) for name, loader in loaders.items()}
+
+    def run_separately(loader):
+        try:
+            with Session(bind) as session:
+                return loader(session)
+        finally:
+            _parallel_connections.release()
+
+    names = list(loaders)
+    inline = [names[0]]
+    separate = {}
+    for name in names[1:]:
+        if _parallel_connections.acquire(blocking=False):
+            separate[name] = run_in_threadpool(run_separately, loaders[name])
+        else:
+            inline.append(name)
+
+    def run_inline():
+        return {name: loaders[name](db) for name in inline}
+
+    own, *others = await asyncio.gather(run_in_threadpool(run_inline), *separate.values())
+    results = {**own, **dict(zip(separate, others))}
+    return {name: results[name] for name in names}
+
+
 def _import_orm_models() -> None:
     """Import table models so they register on SQLModel.metadata before create_all."""
     import app.models.user  # noqa: F401
@@ -46,6 +429,15 @@ def _import_orm_models() -> None:
     import app.models.onboarding_profile  # noqa: F401
     import app.models.test_record  # noqa: F401
     import app.models.marketplace  # noqa: F401
+    import app.models.daily_activity  # noqa: F401
+    import app.models.question_attempt  # noqa: F401
+    import app.models.rating  # noqa: F401
+    import app.models.review_item  # noqa: F401
+    import app.models.question  # noqa: F401
+    import app.models.readiness  # noqa: F401
+    import app.models.analytics  # noqa: F401
+    import app.models.score_distribution  # noqa: F401
+    import app.models.email_outbox  # noqa: F401
 
 
 def init_db():
@@ -0,0 +1,236 @@
+from email.header import Header
+from email.utils import formatdate, make_msgid, parseaddr
+from typing import Dict, List, NamedTuple, Optional
+import asyncio
+import binascii
+import logging
+import secrets
+import smtplib
+import threading
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Quoted-printable bodies encode "=" as "=3D", so they can never contain the boundary
+_BOUNDARY = f"=={secrets.token_hex(12)}=="
+# Message-IDs use the sender's domain (make_msgid would otherwise look up this host's FQDN per call)
+_MSGID_DOMAIN = parseaddr(settings.EMAIL_FROM)[1].rpartition("@")[2] or "localhost"
+_PART = 'Content-Type: text/{subtype}; charset="utf-8"\r\nContent-Transfer-Encoding: quoted-printable\r\n\r\n'
+
+
+class OutgoingEmail(NamedTuple):
+    to: str
+    subject: str
+    data: bytes  # the whole message (headers and body) with CRLF line endings
+
+
+def _header(value: str) -> str:
+    # No header injection through user-controlled values
+    value = " ".join(value.splitlines())
+    return value if value.isascii() else Header(value, "utf-8").encode()
+
+
+def _quoted_printable(text: str) -> bytes:
+    return binascii.b2a_qp(text.encode(), istext=True).replace(b"\n", b"\r\n")
+
+
+def build_message(
+    to: str, subject: str, body: str, html: Optional[str] = None, headers: Optional[Dict[str, str]] = None
+) -> OutgoingEmail:
+    """
+    Serialize a plain text (and optional HTML alternative) email straight into a fixed
+    MIME layout. Building it with ``email.message.EmailMessage`` costs about a millisecond
+    per message, which caps bulk sends far below what the SMTP connection can take.
+    ``headers`` adds extra headers (e.g. List-Unsubscribe).
+    """
+    extra = "".join(f"{name}: {_header(value)}\r\n" for name, value in (headers or {}).items())
+    headers = (
+        f"From: {_header(settings.EMAIL_FROM)}\r\nTo: {_header(to)}\r\nSubject: {_header(subject)}\r\n"
+        f"Date: {formatdate(usegmt=True)}\r\nMessage-ID: {make_msgid(domain=_MSGID_DOMAIN)}\r\n"
+        f"{extra}MIME-Version: 1.0\r\n"
+    )
+    if html is None:
+        data = (headers + _PART.format(subtype="plain")).encode() + _quoted_printable(body)
+    else:
+        data = b"".join((
+            f'{headers}Content-Type: multipart/alternative; boundary="{_BOUNDARY}"\r\n\r\n'
+            f"--{_BOUNDARY}\r\n{_PART.format(subtype='plain')}".encode(),
+            _quoted_printable(body),
+            f"\r\n--{_BOUNDARY}\r\n{_PART.format(subtype='html')}".encode(),
+            _quoted_printable(html),
+            f"\r\n--{_BOUNDARY}--\r\n".encode(),
+        ))
+    return OutgoingEmail(to, subject, data)
+
+
+class SMTPTransport:
+    """
+    Sends a batch of messages over one SMTP connection. Returns one error (or None) per
+    message so a rejected recipient doesn't fail the rest of the batch; a connection
+    failure fails every message that wasn't sent yet.
+
+    Used as a context manager, the connection stays open for every ``send`` inside the
+    block (bulk sends); otherwise each ``send`` opens and closes its own.
+    """
+
+    def __init__(self, host: str, port: int, username: str = "", password: str = "", starttls: bool = False, timeout: float = 10):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+        self.sender = parseaddr(settings.EMAIL_FROM)[1]
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._keep_open = False
+
+    def __enter__(self) -> "SMTPTransport":
+        self._keep_open = True
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._keep_open = False
+        self.close()
+
+    def _connect(self) -> smtplib.SMTP:
+        if self._smtp is None:
+            smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            try:
+                if self.starttls:
+                    smtp.starttls()
+                if self.username:
+                    smtp.login(self.username, self.password)
+            except Exception:
+                smtp.close()
+                raise
+            self._smtp = smtp
+        return self._smtp
+
+    def close(self) -> None:
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except (OSError, smtplib.SMTPException):
+            self._smtp.close()
+        self._smtp = None
+
+    def send(self, messages: List[OutgoingEmail]) -> List[Optional[str]]:
+        errors: List[Optional[str]] = []
+        try:
+            smtp = self._connect()
+            for message in messages:
+                try:
+                    smtp.sendmail(self.sender, [message.to], message.data)
+                    errors.append(None)
+                except smtplib.SMTPRecipientsRefused as e:
+                    errors.append(f"recipient refused: {e.recipients}")
+                except smtplib.SMTPResponseException as e:
+                    errors.append(f"{e.smtp_code} {e.smtp_error!r}")
+        except (OSError, smtplib.SMTPException) as e:
+            errors.extend([f"connection: {e}"] * (len(messages) - len(errors)))
+            # Reconnect on the next send
+            if self._smtp is not None:
+                self._smtp.close()
+                self._smtp = None
+        if not self._keep_open:
+            self.close()
+        return errors
+
+
+class LogTransport:
+    """Logs messages instead of sending them (development, or no SMTP_HOST configured)"""
+
+    def __enter__(self) -> "LogTransport":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+    def send(self, messages: List[OutgoingEmail]) -> List[Optional[str]]:
+        for message in messages:
+            logger.info(f"EMAIL_LOGGED | to={message.to} | subject={message.subject}")
+        return [None] * len(messages)
+
+
+def default_transport():
+    if not settings.SMTP_HOST:
+        return LogTransport()
+    return SMTPTransport(
+        settings.SMTP_HOST, settings.SMTP_PORT, settings.SMTP_USERNAME, settings.SMTP_PASSWORD, settings.SMTP_STARTTLS
+    )
+
+
+class SMTPSink:
+    """
+    Minimal local SMTP server that accepts every message and keeps it in ``messages``:
+    a stand-in for the real provider in tests, benchmarks and local development.
+    ``reject`` is a set of recipients to refuse with 550.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.host = host
+        self.port = port
+        self.messages: List[dict] = []
+        self.connections = 0
+        self.reject: set = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server = None
+        self._thread: Optional[threading.Thread] = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        writer.write(b"220 sink ready\r\n")
+        sender, recipients = None, []
+        while line := await reader.readline():
+            command = line.decode("latin-1").strip()
+            verb = command[:4].upper()
+            if verb in ("EHLO", "HELO"):
+                writer.write(b"250 sink\r\n")
+            elif verb == "MAIL":
+                sender, recipients = command[10:].strip("<> "), []
+                writer.write(b"250 OK\r\n")
+            elif verb == "RCPT":
+                recipient = command[8:].strip("<> ")
+                if recipient in self.reject:
+                    writer.write(b"550 No such user\r\n")
+                else:
+                    recipients.append(recipient)
+                    writer.write(b"250 OK\r\n")
+            elif verb == "DATA":
+                writer.write(b"354 End data with <CR><LF>.<CR><LF>\r\n")
+                await writer.drain()
+                data = []
+                while (chunk := await reader.readline()) not in (b".\r\n", b""):
+                    data.append(chunk[1:] if chunk.startswith(b"..") else chunk)
+                self.messages.append({"from": sender, "to": recipients, "data": b"".join(data)})
+                writer.write(b"250 OK\r\n")
+            elif verb == "QUIT":
+                writer.write(b"221 Bye\r\n")
+                await writer.drain()
+                break
+            else:  # RSET, NOOP
+                writer.write(b"250 OK\r\n")
+            await writer.drain()
+        writer.close()
+
+    def start(self) -> "SMTPSink":
+        """Serve on a background thread; ``port`` is set to the bound port"""
+        ready = threading.Event()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            self._server = self._loop.run_until_complete(asyncio.start_server(self._handle, self.host, self.port))
+            self.port = self._server.sockets[0].getsockname()[1]
+            ready.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def stop(self) -> None:
+        self._loop.call_soon_threadsafe(self._server.close)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
@@ -0,0 +1,284 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+import logging
+import math
+import re
+import threading
+import time
+import orjson
+from jose import jwt, JWTError
+from fastapi.responses import ORJSONResponse
+from app.core.config import settings
+
+try:
+    import redis
+except ImportError:  # optional: only needed for counters shared between workers
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600}
+MAX_BODY_BYTES = 16384
+BUCKETS = ("ip", "ip_account", "account")
+
+
+def parse_limits(spec: str) -> dict:
+    """
+    ``"ip=30/minute,account=10/minute"`` -> ``{"ip": (30, 60), "account": (10, 60)}``. Buckets:
+    ``ip``, ``account``, and ``ip_account`` (the account from one client IP).
+    """
+    limits = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        bucket, _, limit = part.partition("=")
+        count, _, period = limit.partition("/")
+        if bucket.strip() not in BUCKETS or period.strip() not in PERIODS:
+            raise ValueError(f"Invalid rate limit: {part!r}")
+        limits[bucket.strip()] = (int(count), PERIODS[period.strip()])
+    return limits
+
+
+class LocalCounters:
+    """
+    Thread-safe in-process counters with expiry, bounded by evicting the least recently
+    used key. ``hit`` is the shared backend's interface too, so an instance can stand in
+    for it (e.g. in tests).
+    """
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._counts: "OrderedDict[str, list]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key: str, now: float) -> int:
+        entry = self._counts.get(key)
+        if entry is None or entry[1] <= now:
+            return 0
+        return entry[0]
+
+    def hit(self, current_key: str, previous_key: str, limit: int, overlap: float, ex: int) -> Tuple[int, int, bool]:
+        """
+        Atomically: count a request in ``current_key`` unless ``previous * overlap + current``
+        is already at ``limit``. Returns (previous, current, counted).
+        """
+        now = time.monotonic()
+        with self._lock:
+            previous, current = self._get(previous_key, now), self._get(current_key, now)
+            if previous * overlap + current >= limit:
+                return previous, current, False
+            entry = self._counts.get(current_key)
+            if entry is None or entry[1] <= now:
+                entry = self._counts[current_key] = [0, now + ex]
+            entry[0] += 1
+            self._counts.move_to_end(current_key)
+            while len(self._counts) > self.max_keys:
+                self._counts.popitem(last=False)
+            return previous, entry[0], True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
+
+class RedisCounters:
+    """``LocalCounters`` interface on a redis client; the check and increment run as one Lua script"""
+
+    HIT_SCRIPT = """
+        local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+        local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+        if previous * tonumber(ARGV[2]) + current >= tonumber(ARGV[1]) then
+            return {previous, current, 0}
+        end
+        current = redis.call('INCR', KEYS[1])
+        redis.call('EXPIRE', KEYS[1], ARGV[3])
+        return {previous, current, 1}
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self._hit = client.register_script(self.HIT_SCRIPT)
+
+    def hit(self, current_key: str, previous_key: str, limit: int, overlap: float, ex: int) -> Tuple[int, int, bool]:
+        previous, current, counted = self._hit(keys=[current_key, previous_key], args=[limit, repr(overlap), ex])
+        return int(previous), int(current), bool(counted)
+
+
+class RateLimiter:
+    """
+    Sliding-window limits over fixed-window counters: the previous window's count is
+    weighted by how much of it still overlaps the sliding window, so a burst can't double
+    up across a window boundary, at two counters per key. Counters live in ``shared`` when
+    set (errors fall back to ``local``), otherwise in ``local``.
+    """
+
+    def __init__(self, local: LocalCounters, shared=None, clock: Callable[[], float] = time.time):
+        self.local = local
+        self.shared = shared
+        self.clock = clock
+
+    def hit(self, key: str, limit: int, period: int, now: Optional[float] = None) -> int:
+        """Count a request against ``key``: 0 if allowed, otherwise seconds until it would be"""
+        now = self.clock() if now is None else now
+        window, elapsed = divmod(now, period)
+        current_key, previous_key = f"{key}:{int(window)}", f"{key}:{int(window) - 1}"
+        if self.shared is not None:
+            try:
+                return self._hit(self.shared, current_key, previous_key, limit, period, elapsed)
+            except Exception as e:
+                logger.warning(f"RATE_LIMIT_BACKEND_ERROR | error={e}")
+        return self._hit(self.local, current_key, previous_key, limit, period, elapsed)
+
+    @staticmethod
+    def _hit(counters, current_key: str, previous_key: str, limit: int, period: int, elapsed: float) -> int:
+        overlap = 1 - elapsed / period
+        previous, current, counted = counters.hit(current_key, previous_key, limit, overlap, 2 * period)
+        if counted:
+            return 0
+        if current >= limit:
+            return max(1, math.ceil(period - elapsed))
+        # Wait until enough of the previous window has slid out
+        needed = (previous * overlap + current - limit + 1) / previous
+        return max(1, math.ceil(needed * period))
+
+    def clear(self) -> None:
+        """Reset this process's counters (the shared backend expires on its own)"""
+        self.local.clear()
+
+
+def _shared_backend():
+    if not settings.RATE_LIMIT_URL:
+        return None
+    if redis is None:
+        logger.warning("RATE_LIMIT_URL is set but redis is not installed: using per-process rate limits")
+        return None
+    return RedisCounters(redis.Redis.from_url(settings.RATE_LIMIT_URL))
+
+
+rate_limiter = RateLimiter(LocalCounters(settings.RATE_LIMIT_MAX_KEYS), shared=_shared_backend())
+
+
+def email_account(body: bytes, headers: dict) -> Optional[str]:
+    """Normalized ``email`` of a JSON body"""
+    try:
+        email = orjson.loads(body).get("email")
+    except (orjson.JSONDecodeError, AttributeError):
+        return None
+    return email.strip().lower() if isinstance(email, str) else None
+
+
+def token_account(body: bytes, headers: dict) -> Optional[str]:
+    """User id of a valid bearer token (signature check only, no session lookup)"""
+    scheme, _, token = headers.get(b"authorization", b"").decode("latin-1").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]).get("sub")
+    except JWTError:
+        return None
+
+
+@dataclass
+class RateLimitRule:
+    name: str
+    method: str
+    path: "re.Pattern"
+    limits: dict
+    account: Callable[[bytes, dict], Optional[str]]
+    reads_body: bool = False
+
+
+def default_rules() -> List[RateLimitRule]:
+    prefix = re.escape(settings.API_V1_STR)
+    rules = [
+        RateLimitRule("login", "POST", re.compile(f"{prefix}/auth/login/?"), parse_limits(settings.RATE_LIMIT_LOGIN), email_account, True),
+        RateLimitRule("signup", "POST", re.compile(f"{prefix}/auth/signup/?"), parse_limits(settings.RATE_LIMIT_SIGNUP), email_account, True),
+        RateLimitRule("password_reset", "POST", re.compile(f"{prefix}/auth/request-password-reset/?"), parse_limits(settings.RATE_LIMIT_PASSWORD_RESET), email_account, True),
+        RateLimitRule("inquire", "POST", re.compile(f"{prefix}/marketplace/listings/[^/]+/inquire/?"), parse_limits(settings.RATE_LIMIT_INQUIRE), token_account),
+    ]
+    return [rule for rule in rules if rule.limits]
+
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware that answers 429 for requests over their route's per-IP or per-account
+    limit before routing, so rejected requests cost no DB, bcrypt or dependency work.
+    Bodies are read (and replayed to the app) only for rules keyed on a body field.
+    """
+
+    def __init__(self, app, rules: Optional[List[RateLimitRule]] = None, limiter: Optional[RateLimiter] = None):
+        self.app = app
+        self.rules = default_rules() if rules is None else rules
+        self.limiter = limiter or rate_limiter
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.RATE_LIMIT_ENABLED:
+            return await self.app(scope, receive, send)
+        rule = next(
+            (r for r in self.rules if r.method == scope["method"] and r.path.fullmatch(scope["path"])), None
+        )
+        if rule is None:
+            return await self.app(scope, receive, send)
+
+        headers = dict(scope["headers"])
+        ip = self._client_ip(scope, headers)
+        body = b""
+        account_limited = "account" in rule.limits or "ip_account" in rule.limits
+        if rule.reads_body and account_limited:
+            body, receive = await self._buffer_body(receive)
+            if body is None:
+                # Larger than any legitimate body for these routes; skipping the account
+                # limit instead would let padding bypass it
+                response = ORJSONResponse(status_code=413, content={"detail": "Request body too large"})
+                return await response(scope, receive, send)
+
+        retry_after = 0
+        if "ip" in rule.limits:
+            limit, period = rule.limits["ip"]
+            retry_after = self.limiter.hit(f"rl:{rule.name}:ip:{ip}", limit, period)
+        account = rule.account(body, headers) if not retry_after and account_limited else None
+        if account is not None:
+            # The (IP, account) bucket goes first, so one client over its own limit stops
+            # counting against the account's overall limit
+            if "ip_account" in rule.limits:
+                limit, period = rule.limits["ip_account"]
+                retry_after = self.limiter.hit(f"rl:{rule.name}:ip_account:{ip}:{account}", limit, period)
+            if not retry_after and "account" in rule.limits:
+                limit, period = rule.limits["account"]
+                retry_after = self.limiter.hit(f"rl:{rule.name}:account:{account}", limit, period)
+        if not retry_after:
+            return await self.app(scope, receive, send)
+
+        logger.warning(f"RATE_LIMITED | rule={rule.name} | ip={ip} | retry_after={retry_after}")
+        response = ORJSONResponse(
+            status_code=429,
+            content={"detail": "Too many requests, please try again later"},
+            headers={"Retry-After": str(retry_after)},
+        )
+        await response(scope, receive, send)
+
+    @staticmethod
+    def _client_ip(scope, headers: dict) -> str:
+        if settings.RATE_LIMIT_TRUST_FORWARDED and b"x-forwarded-for" in headers:
+            return headers[b"x-forwarded-for"].decode("latin-1").split(",")[0].strip()
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    @staticmethod
+    async def _buffer_body(receive) -> Tuple[Optional[bytes], Callable]:
+        """
+        Read the body and return it with a receive that replays it; None (and stop reading)
+        once it exceeds MAX_BODY_BYTES
+        """
+        messages, size = [], 0
+        while True:
+            message = await receive()
+            messages.append(message)
+            size += len(message.get("body", b""))
+            if message["type"] != "http.request" or not message.get("more_body") or size > MAX_BODY_BYTES:
+                break
+        body = b"".join(m.get("body", b"") for m in messages) if size <= MAX_BODY_BYTES else None
+
+        async def replay():
+            return messages.pop(0) if messages else await receive()
+
+        return body, replay
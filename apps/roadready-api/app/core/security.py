@@ -5,12 +5,14 @@ import bcrypt
 import hashlib
 import secrets
 import logging
-from fastapi import Depends, HTTPException, status, Request
+from fastapi import Depends, Header, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordBearer
 from sqlmodel import Session, select
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.database import get_db, pin_reads_to_primary
 from app.models.user import User
+from app.models.session import Session as SessionModel
+from app.models.onboarding_profile import OnboardingProfile
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 logger = logging.getLogger(__name__)
@@ -31,8 +33,8 @@ def hash_token(token: str) -> str:
     return hashlib.sha256(token.encode()).hexdigest()
 
 
-async def create_tokens(user_id: int, db: Session, request: Request = None) -> Tuple[str, str]:
-    """Create access and refresh tokens with session tracking."""
+def create_tokens(user_id: int, db: Session, request: Request = None) -> Tuple[str, str]:
+    """Create access and refresh tokens with session tracking. Does not commit."""
     from app.models.session import Session as SessionModel
     
     session_id = SessionModel.generate_session_id()
@@ -75,16 +77,39 @@ async def create_tokens(user_id: int, db: Session, request: Request = None) -> T
     )
     
     db.add(session)
-    db.commit()
-    db.refresh(session)
     
     logger.info(f"SESSION_CREATED | user_id={user_id} | session_id={session_id[:8]}...")
     
     return access_token, refresh_token
 
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
-    """Validate JWT token and return current user."""
+def create_unsubscribe_token(user_id: int) -> str:
+    """Signed, non-expiring token for a user's digest unsubscribe link."""
+    return jwt.encode({"sub": str(user_id), "type": "unsubscribe"}, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+def verify_unsubscribe_token(token: str) -> Optional[int]:
+    """User id from an unsubscribe token, or None if it is invalid."""
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError:
+        return None
+    if payload.get("type") != "unsubscribe" or not str(payload.get("sub", "")).isdigit():
+        return None
+    return int(payload["sub"])
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    """Guard operational endpoints with the ADMIN_TOKEN header; they don't exist without one."""
+    if not settings.ADMIN_TOKEN or not secrets.compare_digest(x_admin_token or "", settings.ADMIN_TOKEN):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
+    """
+    Validate JWT token and return current user. A plain ``def`` so FastAPI runs it in the
+    threadpool: touching the session row is a write, which may wait for SQLite's writer lock.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Invalid or expired token",
@@ -140,8 +165,18 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
     
     session.last_activity = datetime.utcnow()
     db.add(session)
-    
-    user = db.get(User, int(user_id))
+    db.info["auth_session"] = session
+    pin_reads_to_primary(db, session.last_write_at)
+    
+    # The active profile comes with the user; keeping a reference in db.info (the identity
+    # map holds objects weakly) lets later db.get calls for it skip the query
+    row = db.exec(
+        select(User, OnboardingProfile)
+        .outerjoin(OnboardingProfile, OnboardingProfile.id == User.active_profile_id)
+        .where(User.id == int(user_id))
+    ).first()
+    user, active_profile = row if row else (None, None)
+    db.info["active_profile"] = active_profile
     if not user or not user.is_active:
         logger.warning(f"Inactive user found for token | user_id={user_id}")
         raise credentials_exception
@@ -1,6 +1,7 @@
 import re
 from typing import Optional
 from datetime import date, datetime
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 from fastapi import HTTPException
 
 # US State codes
@@ -61,6 +62,14 @@ def validate_test_type(test_type: str) -> str:
         raise HTTPException(status_code=400, detail=f"Invalid test type. Must be one of: {', '.join(sorted(TEST_TYPES))}")
     return test_type_lower
 
+def validate_timezone(tz_name: str) -> str:
+    """Validate IANA timezone name (e.g. America/Los_Angeles)"""
+    try:
+        ZoneInfo(tz_name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid timezone. Use an IANA name like America/Los_Angeles")
+    return tz_name
+
 def validate_date_of_birth(dob: date) -> date:
     """Validate date of birth (must be at least 15 years old)"""
     today = datetime.now().date()
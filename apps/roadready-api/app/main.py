@@ -1,9 +1,12 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from app.core.config import settings
+from app.core.rate_limit import RateLimitMiddleware
 from app.api.v1.router import api_router
 import time
 import asyncio
+import logging
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -11,7 +14,8 @@ app = FastAPI(
     description="High-performance API for RoadReady DMV Test Application",
     docs_url="/docs",
     redoc_url="/redoc",
-    openapi_url="/openapi.json"
+    openapi_url="/openapi.json",
+    default_response_class=ORJSONResponse
 )
 
 # CORS Configuration - Now configurable via env var!
@@ -19,6 +23,9 @@ app = FastAPI(
 cors_origins = settings.CORS_ORIGINS
 print(f"🌐 CORS configured with origins: {cors_origins}")
 
+# Innermost of the middlewares, so 429s still get CORS headers, but before routing
+app.add_middleware(RateLimitMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=cors_origins,
@@ -41,6 +48,36 @@ async def add_process_time_header(request: Request, call_next):
         from fastapi.responses import JSONResponse
         return JSONResponse(status_code=504, content={"error": "Request timeout"})
 
+app.include_router(api_router, prefix=settings.API_V1_STR)
+
+@app.on_event("startup")
+async def load_question_bank_on_startup():
+    """Load the question catalog into memory so test generation needs no DB access."""
+    from sqlmodel import Session
+    from app.core.database import engine
+    from app.services.question_bank import load_question_bank
+    try:
+        with Session(engine) as session:
+            load_question_bank(session)
+    except Exception as e:
+        logging.getLogger(__name__).warning(f"Question bank not loaded: {e}")
+
+@app.on_event("startup")
+async def start_email_worker():
+    """Deliver queued emails in the background so requests never wait on the provider."""
+    if not settings.EMAIL_WORKER_ENABLED:
+        return
+    from app.core.database import engine
+    from app.services.email_outbox import EmailOutboxWorker
+    app.state.email_worker_stop = asyncio.Event()
+    app.state.email_worker = asyncio.create_task(EmailOutboxWorker(engine).run(app.state.email_worker_stop))
+
+@app.on_event("shutdown")
+async def stop_email_worker():
+    if getattr(app.state, "email_worker", None) is not None:
+        app.state.email_worker_stop.set()
+        await app.state.email_worker
+
 @app.get("/")
 async def root():
     """Root endpoint"""
@@ -0,0 +1,44 @@
+from sqlmodel import SQLModel, Field, Column, JSON
+from sqlalchemy import UniqueConstraint
+from datetime import datetime
+from typing import List, Optional
+
+class UserStatistics(SQLModel, table=True):
+    """Per-user report metrics written by the nightly batch analytics run."""
+    __tablename__ = "user_statistics"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="user.id", unique=True)
+
+    total_tests: int = Field(default=0)
+    average_score: float = Field(default=0.0)
+    best_score: int = Field(default=0)
+    worst_score: int = Field(default=0)
+    pass_rate: float = Field(default=0.0)  # percent
+    total_time_spent: int = Field(default=0)  # in seconds
+    improvement_rate: Optional[float] = Field(default=None)  # percent, second half vs first half of tests
+    current_streak: int = Field(default=0)
+    longest_streak: int = Field(default=0)
+    last_test_at: Optional[datetime] = Field(default=None)
+    computed_at: datetime = Field(default_factory=datetime.utcnow)
+
+class CohortStatistics(SQLModel, table=True):
+    """Per state/test type report metrics written by the nightly batch analytics run."""
+    __tablename__ = "cohort_statistics"
+    __table_args__ = (
+        UniqueConstraint("state_code", "test_type", name="uq_cohort_statistics_state_type"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    state_code: str = Field(max_length=2)
+    test_type: str = Field(max_length=50)
+
+    users: int = Field(default=0)
+    total_tests: int = Field(default=0)
+    average_score: float = Field(default=0.0)
+    pass_rate: float = Field(default=0.0)  # percent
+    # Test counts per score bucket 0-9, 10-19, ..., 90-99, 100
+    score_histogram: List[int] = Field(default_factory=list, sa_column=Column(JSON, nullable=False))
+    # Average score of users' 1st, 2nd, ... test in this cohort (last entry: that attempt and later)
+    attempt_curve: List[Optional[float]] = Field(default_factory=list, sa_column=Column(JSON, nullable=False))
+    computed_at: datetime = Field(default_factory=datetime.utcnow)
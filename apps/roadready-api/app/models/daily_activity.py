@@ -0,0 +1,20 @@
+from sqlmodel import SQLModel, Field
+from sqlalchemy import UniqueConstraint
+from datetime import date
+from typing import Optional
+
+class DailyActivity(SQLModel, table=True):
+    """Per-user rollup of test activity for one day in the user's local timezone."""
+    __tablename__ = "daily_activity"
+    __table_args__ = (
+        UniqueConstraint("user_id", "activity_date", name="uq_daily_activity_user_date"),
+    )
+    
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="user.id")
+    activity_date: date  # local date in the user's timezone
+    
+    # Aggregates
+    test_count: int = Field(default=0)
+    total_score: int = Field(default=0)
+    time_spent: int = Field(default=0)  # in seconds
@@ -0,0 +1,30 @@
+from sqlmodel import SQLModel, Field, Column, JSON
+from sqlalchemy import Index
+from datetime import datetime
+from typing import Optional
+
+class EmailOutbox(SQLModel, table=True):
+    """
+    Email waiting to be delivered, written in the same transaction as the change that
+    triggers it so it's sent if and only if that change commits.
+
+    Delivered by the background worker in app/services/email_outbox.py; failed attempts
+    are retried with exponential backoff until EMAIL_MAX_ATTEMPTS.
+    """
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        Index("ix_email_outbox_status_next_attempt", "status", "next_attempt_at"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    kind: str = Field(max_length=50)  # welcome, verification, password_reset
+    to_email: str = Field(max_length=255)
+    payload: dict = Field(default_factory=dict, sa_column=Column(JSON, nullable=False))  # template variables
+
+    status: str = Field(default="pending", max_length=20)  # pending, sent, failed
+    attempts: int = Field(default=0)
+    next_attempt_at: datetime = Field(default_factory=datetime.utcnow)
+    last_error: Optional[str] = Field(default=None, max_length=500)
+
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    sent_at: Optional[datetime] = Field(default=None)
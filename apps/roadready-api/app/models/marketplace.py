@@ -2,13 +2,14 @@ from sqlmodel import SQLModel, Field, Column
 from datetime import datetime
 from typing import Optional, List
 from decimal import Decimal
-from sqlalchemy import Text, JSON
+from sqlalchemy import JSON
+from app.models.types import CompressedText
 
 class PartnerProduct(SQLModel, table=True):
     __tablename__ = "partner_product"
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str = Field(max_length=255)
-    description: Optional[str] = Field(default=None, sa_column=Column(Text))
+    description: Optional[str] = Field(default=None, sa_column=Column(CompressedText()))
     price: Decimal = Field(max_digits=10, decimal_places=2)
     category: str = Field(max_length=50, index=True)
     image_url: Optional[str] = Field(default=None, max_length=500)
@@ -19,13 +20,14 @@ class PartnerProduct(SQLModel, table=True):
     affiliate_link: Optional[str] = Field(default=None, max_length=500)
     is_active: bool = Field(default=True)
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow, sa_column_kwargs={"onupdate": datetime.utcnow})
 
 class UserListing(SQLModel, table=True):
     __tablename__ = "user_listing"
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="user.id", index=True)
     title: str = Field(max_length=255)
-    description: Optional[str] = Field(default=None, sa_column=Column(Text))
+    description: Optional[str] = Field(default=None, sa_column=Column(CompressedText()))
     price: Decimal = Field(max_digits=10, decimal_places=2)
     category: str = Field(max_length=50, index=True)
     condition: str = Field(max_length=20)
@@ -36,6 +38,7 @@ class UserListing(SQLModel, table=True):
     facebook_link: Optional[str] = Field(default=None, max_length=500)
     ebay_link: Optional[str] = Field(default=None, max_length=500)
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow, sa_column_kwargs={"onupdate": datetime.utcnow})
     expires_at: Optional[datetime] = None
 
 class ListingInquiry(SQLModel, table=True):
@@ -44,10 +47,11 @@ class ListingInquiry(SQLModel, table=True):
     listing_id: int = Field(foreign_key="user_listing.id", index=True)
     buyer_user_id: int = Field(foreign_key="user.id", index=True)
     seller_user_id: int = Field(foreign_key="user.id", index=True)
-    message: str = Field(sa_column=Column(Text))
+    message: str = Field(sa_column=Column(CompressedText(), nullable=False))
     contact_info: Optional[str] = Field(default=None, max_length=255)
     status: str = Field(default="pending", max_length=20)
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow, sa_column_kwargs={"onupdate": datetime.utcnow})
 
 class PartnerLead(SQLModel, table=True):
     __tablename__ = "partner_lead"
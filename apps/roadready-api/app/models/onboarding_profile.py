@@ -10,6 +10,5 @@ class OnboardingProfile(SQLModel, table=True):
     profile_name: str = Field(max_length=100)
     state: str = Field(max_length=2)
     test_type: str = Field(max_length=50)
-    is_active: bool = Field(default=False)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
@@ -0,0 +1,33 @@
+from sqlmodel import SQLModel, Field, Column
+from sqlalchemy import Text, JSON, UniqueConstraint, Index
+from datetime import datetime
+from typing import Optional, List
+
+class Question(SQLModel, table=True):
+    """Question bank entry. ``version`` is bumped whenever the content changes."""
+    __tablename__ = "questions"
+    __table_args__ = (
+        UniqueConstraint("state_code", "question_id", name="uq_questions_state_question"),
+        Index("ix_questions_state_type_category", "state_code", "test_type", "category"),
+    )
+    
+    id: Optional[int] = Field(default=None, primary_key=True)
+    question_id: str = Field(max_length=64)  # stable client-facing id, e.g. "rs_001"
+    
+    # Catalog keys
+    state_code: str = Field(max_length=2)
+    test_type: str = Field(max_length=50)
+    category: str = Field(max_length=50)
+    
+    # Content
+    prompt: str = Field(sa_column=Column(Text, nullable=False))
+    options: List = Field(sa_column=Column(JSON, nullable=False))
+    correct_answer: int
+    explanation: Optional[str] = Field(default=None, sa_column=Column(Text))
+    image_url: Optional[str] = Field(default=None, max_length=500)
+    
+    # Versioning
+    version: int = Field(default=1)
+    is_active: bool = Field(default=True)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
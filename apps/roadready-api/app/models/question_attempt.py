@@ -0,0 +1,29 @@
+from sqlmodel import SQLModel, Field
+from sqlalchemy import Index
+from datetime import datetime
+from typing import Optional
+
+class QuestionAttempt(SQLModel, table=True):
+    """One answered question, normalized out of a TestRecord's JSON payload."""
+    __tablename__ = "question_attempts"
+    __table_args__ = (
+        Index("ix_question_attempts_state_question", "state_code", "question_id"),
+        Index("ix_question_attempts_state_category", "state_code", "category"),
+        Index("ix_question_attempts_user_question", "user_id", "question_id"),
+    )
+    
+    id: Optional[int] = Field(default=None, primary_key=True)
+    test_record_id: int = Field(foreign_key="test_records.id", index=True)
+    user_id: int = Field(foreign_key="user.id")
+    
+    # Question Details
+    question_id: str = Field(max_length=64)
+    state_code: str = Field(max_length=2)
+    test_type: str = Field(max_length=50)
+    category: str = Field(max_length=50)
+    
+    # Result
+    is_correct: bool
+    user_answer: Optional[int] = Field(default=None)
+    
+    attempted_at: datetime = Field(default_factory=datetime.utcnow)
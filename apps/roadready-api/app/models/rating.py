@@ -0,0 +1,35 @@
+from sqlmodel import SQLModel, Field
+from sqlalchemy import UniqueConstraint, Index
+from datetime import datetime
+from typing import Optional
+
+class QuestionRating(SQLModel, table=True):
+    """Item difficulty on a logit scale, updated Elo-style after every attempt."""
+    __tablename__ = "question_ratings"
+    __table_args__ = (
+        UniqueConstraint("state_code", "test_type", "question_id", name="uq_question_ratings_state_type_question"),
+        Index("ix_question_ratings_state_test_type", "state_code", "test_type"),
+    )
+    
+    id: Optional[int] = Field(default=None, primary_key=True)
+    question_id: str = Field(max_length=64)
+    state_code: str = Field(max_length=2)
+    test_type: str = Field(max_length=50)
+    category: str = Field(max_length=50)
+    difficulty: float = Field(default=0.0)
+    attempts: int = Field(default=0)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+class UserSkillRating(SQLModel, table=True):
+    """Per-user mastery of a category on the same logit scale as question difficulty."""
+    __tablename__ = "user_skill_ratings"
+    __table_args__ = (
+        UniqueConstraint("user_id", "category", name="uq_user_skill_ratings_user_category"),
+    )
+    
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="user.id")
+    category: str = Field(max_length=50)
+    ability: float = Field(default=0.0)
+    attempts: int = Field(default=0)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
@@ -0,0 +1,34 @@
+from sqlmodel import SQLModel, Field
+from sqlalchemy import UniqueConstraint
+from datetime import datetime
+from typing import Optional
+
+class ReadinessScore(SQLModel, table=True):
+    """
+    Recency-weighted test performance per user and state/test type (one onboarding profile).
+
+    The decayed sums are as of ``last_test_at``; each new test decays them once and adds
+    itself, so the score never needs the history. The stored pass probability is as of the
+    last test too; readers age it to the current day.
+    """
+    __tablename__ = "readiness_scores"
+    __table_args__ = (
+        UniqueConstraint("user_id", "state_code", "test_type", name="uq_readiness_scores_user_state_type"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="user.id")
+    state_code: str = Field(max_length=2)
+    test_type: str = Field(max_length=50)
+
+    # Decayed aggregates
+    total_tests: int = Field(default=0)
+    weight: float = Field(default=0.0)  # sum of test weights
+    weighted_score: float = Field(default=0.0)  # sum of weight * score
+    weighted_passes: float = Field(default=0.0)  # sum of weight for passed tests
+    last_test_at: Optional[datetime] = Field(default=None)
+
+    # Derived, stored for the read endpoint
+    readiness_score: int = Field(default=0)  # 0-100
+    pass_probability: float = Field(default=0.5)  # 0.0-1.0, the prior's mean with no tests
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
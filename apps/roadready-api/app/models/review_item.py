@@ -0,0 +1,27 @@
+from sqlmodel import SQLModel, Field
+from sqlalchemy import UniqueConstraint, Index
+from datetime import datetime
+from typing import Optional
+
+class ReviewItem(SQLModel, table=True):
+    """SM-2 spaced-repetition state for one question and one user."""
+    __tablename__ = "review_items"
+    __table_args__ = (
+        UniqueConstraint("user_id", "state_code", "question_id", name="uq_review_items_user_question"),
+        Index("ix_review_items_user_due", "user_id", "due_at"),
+    )
+    
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="user.id")
+    question_id: str = Field(max_length=64)
+    state_code: str = Field(max_length=2)
+    category: str = Field(max_length=50)
+    
+    # SM-2 state
+    easiness: float = Field(default=2.5)
+    interval_days: int = Field(default=0)
+    repetitions: int = Field(default=0)
+    lapses: int = Field(default=0)
+    
+    due_at: datetime = Field(default_factory=datetime.utcnow)
+    last_reviewed_at: Optional[datetime] = Field(default=None)
@@ -0,0 +1,33 @@
+from sqlmodel import SQLModel, Field, Column, JSON
+from sqlalchemy import UniqueConstraint
+from datetime import datetime
+from typing import List, Optional
+
+class ScoreDistribution(SQLModel, table=True):
+    """
+    Distribution of test scores across all users for one state/test type/category,
+    refreshed periodically from new test records.
+
+    Scores are integers 0-100, so the sketch is an exact histogram: merging new tests is
+    adding counts, and any percentile can be answered from this one row.
+    """
+    __tablename__ = "score_distributions"
+    __table_args__ = (
+        UniqueConstraint("state_code", "test_type", "category", name="uq_score_distributions_state_type_category"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    state_code: str = Field(max_length=2)
+    test_type: str = Field(max_length=50)
+    category: str = Field(max_length=50)  # "*" for all categories
+
+    total_tests: int = Field(default=0)
+    counts: List[int] = Field(default_factory=list, sa_column=Column(JSON, nullable=False))  # counts[score]
+    p10: int = Field(default=0)
+    p25: int = Field(default=0)
+    p50: int = Field(default=0)
+    p75: int = Field(default=0)
+    p90: int = Field(default=0)
+
+    last_record_id: int = Field(default=0)  # newest test record included
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
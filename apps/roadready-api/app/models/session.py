@@ -13,6 +13,7 @@ class Session(SQLModel, table=True):
     refresh_token_hash: Optional[str] = Field(default=None, max_length=128)
     expires_at: datetime
     last_activity: datetime = Field(default_factory=datetime.utcnow)
+    last_write_at: Optional[datetime] = Field(default=None)  # pins reads to the primary (read-after-write)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     ip_address: Optional[str] = Field(default=None, max_length=45)
     user_agent: Optional[str] = Field(default=None, max_length=500)
@@ -1,12 +1,22 @@
-from sqlmodel import SQLModel, Field
+from sqlmodel import SQLModel, Field, Column
+from sqlalchemy import ForeignKey, Index, Integer
 from datetime import datetime
 from typing import Optional
+from app.models.types import AnswerIndices, CompressedText, PackedBools
 
 class TestRecord(SQLModel, table=True):
     __tablename__ = "test_records"
+    __table_args__ = (
+        # Per-profile statistics and history without scanning the user's other profiles
+        Index("ix_test_records_user_profile_created", "user_id", "onboarding_profile_id", "created_at"),
+    )
     
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="user.id", index=True)
+    onboarding_profile_id: Optional[int] = Field(
+        default=None,
+        sa_column=Column(Integer, ForeignKey("onboarding_profiles.id", ondelete="SET NULL"), nullable=True)
+    )
     
     # Test Details
     state_code: str = Field(max_length=2)
@@ -19,10 +29,10 @@ class TestRecord(SQLModel, table=True):
     correct_answers: int
     time_spent: int  # in seconds
     
-    # Test Data (JSON stored as text)
-    questions: str  # JSON string
-    user_answers: str  # JSON string
-    is_correct: str  # JSON string
+    # Test Data (JSON strings, stored in a compact binary form - see app/models/types.py)
+    questions: str = Field(sa_column=Column(CompressedText, nullable=False))
+    user_answers: str = Field(sa_column=Column(AnswerIndices, nullable=False))
+    is_correct: str = Field(sa_column=Column(PackedBools, nullable=False))
     
     # Metadata
     completed_at: datetime = Field(default_factory=datetime.utcnow)
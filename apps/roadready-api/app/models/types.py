@@ -0,0 +1,211 @@
+"""
+Column types that store text columns in a compact binary form.
+
+The ORM attribute stays the string the API sends and returns, so schemas and services
+are unaware of the storage format. Every stored value starts with a one-byte header so
+rows written in the plain format (``RAW``) and compact rows can coexist.
+"""
+from abc import ABC, abstractmethod
+from sqlalchemy.types import TypeDecorator, LargeBinary
+from typing import List, Optional
+import json
+import zlib
+from app.core.config import settings
+
+try:
+    import zstandard
+except ImportError:  # optional: only needed when COMPRESSED_TEXT_CODEC=zstd
+    zstandard = None
+
+RAW = 0x00
+PACKED = 0x01
+
+
+def _raw(value: str) -> bytes:
+    return bytes([RAW]) + value.encode("utf-8")
+
+
+def _decode_raw(value: bytes) -> str:
+    # Tolerate header-less JSON written before the column type changed
+    if value[:1] == b"[" or value[:1] == b"{":
+        return value.decode("utf-8")
+    return value[1:].decode("utf-8")
+
+
+def _load_list(value: str) -> Optional[list]:
+    try:
+        parsed = json.loads(value)
+    except (TypeError, ValueError):
+        return None
+    return parsed if isinstance(parsed, list) else None
+
+
+def _dumps(value: list) -> str:
+    return json.dumps(value)
+
+
+def _write_varint(n: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = n & 0x7F
+        n >>= 7
+        if n:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _read_varint(data: bytes, offset: int):
+    n = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        n |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return n, offset
+        shift += 7
+
+
+def pack_bools(values: List[bool]) -> bytes:
+    """Length-prefixed bitset, least significant bit first"""
+    bits = bytearray((len(values) + 7) // 8)
+    for index, value in enumerate(values):
+        if value:
+            bits[index >> 3] |= 1 << (index & 7)
+    return _write_varint(len(values)) + bytes(bits)
+
+
+def unpack_bools(data: bytes) -> List[bool]:
+    length, offset = _read_varint(data, 0)
+    return [bool(data[offset + (i >> 3)] & (1 << (i & 7))) for i in range(length)]
+
+
+class _CompactJSON(TypeDecorator, ABC):
+    impl = LargeBinary
+    cache_ok = True
+
+    @abstractmethod
+    def encode(self, value: str) -> Optional[bytes]:
+        """Compact encoding of ``value`` (starting with the PACKED header), or None to store it raw"""
+
+    @abstractmethod
+    def decode(self, data: bytes) -> str:
+        """JSON string of a PACKED value (header stripped)"""
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return self.encode(value) or _raw(value)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        value = bytes(value)
+        if value and value[0] == PACKED:
+            return self.decode(value[1:])
+        return _decode_raw(value)
+
+
+class PackedBools(_CompactJSON):
+    """JSON list of booleans stored as a bitset (16 answers: ~2 bytes instead of ~90)"""
+    cache_ok = True
+
+    def encode(self, value: str) -> Optional[bytes]:
+        values = _load_list(value)
+        if values is None or not all(isinstance(v, bool) for v in values):
+            return None
+        return bytes([PACKED]) + pack_bools(values)
+
+    def decode(self, data: bytes) -> str:
+        return _dumps(unpack_bools(data))
+
+
+class AnswerIndices(_CompactJSON):
+    """JSON list of answer indices (or null for unanswered) stored one byte per answer"""
+    cache_ok = True
+
+    def encode(self, value: str) -> Optional[bytes]:
+        values = _load_list(value)
+        if values is None:
+            return None
+        packed = bytearray([PACKED])
+        for answer in values:
+            if answer is None:
+                packed.append(0)
+            elif isinstance(answer, int) and not isinstance(answer, bool) and 0 <= answer < 255:
+                packed.append(answer + 1)
+            else:
+                return None
+        return bytes(packed)
+
+    def decode(self, data: bytes) -> str:
+        return _dumps([byte - 1 if byte else None for byte in data])
+
+
+ZLIB = 0x01
+ZSTD = 0x02
+CODECS = ("zlib", "zstd")
+
+
+def check_codec(codec: str) -> None:
+    """
+    Fail unless ``codec`` can be written and read on this host. Every host sharing the
+    database must be able to read what any of them writes, so the on-disk codec comes from
+    COMPRESSED_TEXT_CODEC and never from whether ``zstandard`` happens to be installed.
+    """
+    if codec not in CODECS:
+        raise ValueError(f"COMPRESSED_TEXT_CODEC must be one of {', '.join(CODECS)}, not {codec!r}")
+    if codec == "zstd" and zstandard is None:
+        raise RuntimeError("COMPRESSED_TEXT_CODEC=zstd requires the zstandard package (pip install zstandard)")
+
+
+check_codec(settings.COMPRESSED_TEXT_CODEC)
+
+
+class CompressedText(TypeDecorator):
+    """
+    Text compressed with COMPRESSED_TEXT_CODEC (zlib, or zstd) once it reaches ``threshold``
+    bytes. Shorter values, and values that don't shrink, are stored raw. Both codecs are
+    read back regardless of the setting (zstd values need ``zstandard``).
+
+    Usage: ``description: Optional[str] = Field(default=None, sa_column=Column(CompressedText()))``.
+    Stored values are opaque bytes, so the column can't be searched or sorted in SQL.
+    """
+    impl = LargeBinary
+    cache_ok = True
+
+    def __init__(self, threshold: int = 256, level: int = 3):
+        super().__init__()
+        self.threshold = threshold
+        self.level = level
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        raw = value.encode("utf-8")
+        if len(raw) >= self.threshold:
+            if settings.COMPRESSED_TEXT_CODEC == "zstd":
+                compressed = bytes([ZSTD]) + zstandard.ZstdCompressor(level=self.level).compress(raw)
+            else:
+                compressed = bytes([ZLIB]) + zlib.compress(raw, self.level)
+            if len(compressed) < len(raw) + 1:
+                return compressed
+        return bytes([RAW]) + raw
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        value = bytes(value)
+        if not value:
+            return ""
+        if value[0] == ZLIB:
+            return zlib.decompress(value[1:]).decode("utf-8")
+        if value[0] == ZSTD:
+            if zstandard is None:
+                raise RuntimeError("zstandard is required to read zstd-compressed values")
+            return zstandard.ZstdDecompressor().decompress(value[1:]).decode("utf-8")
+        if value[0] == RAW:
+            return value[1:].decode("utf-8")
+        # Text written before the column type changed
+        return value.decode("utf-8")
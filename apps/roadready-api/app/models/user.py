@@ -1,4 +1,5 @@
-from sqlmodel import SQLModel, Field
+from sqlmodel import SQLModel, Field, Column
+from sqlalchemy import ForeignKey, Integer
 from datetime import datetime, date
 from typing import Optional
 
@@ -23,6 +24,17 @@ class User(SQLModel, table=True):
     state: Optional[str] = Field(default=None, max_length=2)
     test_type: Optional[str] = Field(default=None, max_length=50)
     license_number: Optional[str] = Field(default=None, max_length=50)
+    timezone: Optional[str] = Field(default=None, max_length=64)  # IANA name, e.g. "America/Los_Angeles"
+    # The active onboarding profile: a single pointer, so switching is one UPDATE and there
+    # can never be two active profiles
+    active_profile_id: Optional[int] = Field(
+        default=None,
+        sa_column=Column(
+            Integer,
+            ForeignKey("onboarding_profiles.id", ondelete="SET NULL", use_alter=True, name="fk_user_active_profile"),
+            nullable=True
+        )
+    )
     
     # Account Status
     is_active: bool = Field(default=True)
@@ -36,6 +48,13 @@ class User(SQLModel, table=True):
     total_xp: int = Field(default=0)
     last_activity_date: Optional[date] = Field(default=None)
     
+    # Bumped by every write that changes the user's statistics (response cache key)
+    stats_version: int = Field(default=0)
+    
+    # Weekly digest: unsubscribed (List-Unsubscribe), and the user's local date of the last one sent
+    digest_opt_out: bool = Field(default=False)
+    last_digest_on: Optional[date] = Field(default=None)
+    
     # Timestamps
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
@@ -37,6 +37,7 @@ class UserProfileUpdate(SQLModel):
     state: Optional[str] = Field(default=None, description="US state code", max_length=2)
     test_type: Optional[str] = Field(default=None, description="Type of DMV test")
     license_number: Optional[str] = Field(default=None, description="Driver's license number", max_length=50)
+    timezone: Optional[str] = Field(default=None, description="IANA timezone name", max_length=64)
     
     model_config = {
         "json_schema_extra": {
@@ -47,7 +48,8 @@ class UserProfileUpdate(SQLModel):
                 "date_of_birth": "1990-01-01",
                 "state": "CA",
                 "test_type": "car",
-                "license_number": "D1234567"
+                "license_number": "D1234567",
+                "timezone": "America/Los_Angeles"
             }]
         }
     }
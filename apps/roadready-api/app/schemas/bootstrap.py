@@ -0,0 +1,13 @@
+from sqlmodel import SQLModel, Field
+from typing import Any, Dict, Optional
+from app.schemas.onboarding_profile import OnboardingProfileRead
+from app.schemas.test_statistics import TestStatistics
+from app.schemas.user import UserRead
+
+class BootstrapRead(SQLModel):
+    """Everything the app renders on launch; only the requested sections are present"""
+    me: Optional[UserRead] = Field(default=None, description="Same as GET /auth/me")
+    active_profile: Optional[OnboardingProfileRead] = Field(default=None, description="Active onboarding profile, or null")
+    statistics: Optional[TestStatistics] = Field(default=None, description="Same as GET /statistics/")
+    gamification: Optional[Dict[str, Any]] = Field(default=None, description="Same as GET /gamification/stats")
+    achievements: Optional[Dict[str, Any]] = Field(default=None, description="Same as GET /gamification/achievements")
@@ -0,0 +1,50 @@
+from sqlmodel import SQLModel
+from typing import List, Optional
+from datetime import datetime
+
+# Prices are Decimal in the database but the clients treat them as numbers
+class PartnerProductRead(SQLModel):
+    id: int
+    name: str
+    description: Optional[str] = None
+    price: float
+    category: str
+    image_url: Optional[str] = None
+    supplier_name: str
+    supplier_website: Optional[str] = None
+    supplier_phone: Optional[str] = None
+    supplier_email: Optional[str] = None
+    affiliate_link: Optional[str] = None
+    is_active: bool
+    created_at: datetime
+
+class UserListingRead(SQLModel):
+    id: int
+    user_id: int
+    title: str
+    description: Optional[str] = None
+    price: float
+    category: str
+    condition: str
+    images: Optional[List] = None
+    location_city: Optional[str] = None
+    location_state: Optional[str] = None
+    status: str
+    facebook_link: Optional[str] = None
+    ebay_link: Optional[str] = None
+    created_at: datetime
+    expires_at: Optional[datetime] = None
+
+class ListingWithSeller(UserListingRead):
+    seller_name: str = ""
+    seller_contact: str = ""
+
+class ListingInquiryRead(SQLModel):
+    id: int
+    listing_id: int
+    buyer_user_id: int
+    seller_user_id: int
+    message: str
+    contact_info: Optional[str] = None
+    status: str
+    created_at: datetime
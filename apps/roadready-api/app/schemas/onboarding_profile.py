@@ -1,5 +1,7 @@
 from pydantic import BaseModel
 from datetime import datetime
+from typing import Optional
+from app.models.onboarding_profile import OnboardingProfile
 
 class OnboardingProfileCreate(BaseModel):
     profile_name: str
@@ -21,3 +23,7 @@ class OnboardingProfileRead(BaseModel):
     is_active: bool
     created_at: datetime
     updated_at: datetime
+    
+    @classmethod
+    def from_profile(cls, profile: OnboardingProfile, active_profile_id: Optional[int]) -> "OnboardingProfileRead":
+        return cls(**profile.model_dump(), is_active=profile.id == active_profile_id)
@@ -0,0 +1,18 @@
+from sqlmodel import SQLModel
+from datetime import datetime
+from typing import List, Optional
+
+class ReviewItemRead(SQLModel):
+    question_id: str
+    state_code: str
+    category: str
+    easiness: float
+    interval_days: int
+    repetitions: int
+    lapses: int
+    due_at: datetime
+    last_reviewed_at: Optional[datetime] = None
+
+class ReviewQueue(SQLModel):
+    items: List[ReviewItemRead]
+    next_due_at: Optional[datetime] = None  # earliest future review when nothing is due
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from datetime import datetime
 from typing import Optional
 
@@ -13,8 +13,11 @@ class TestRecordCreate(BaseModel):
     questions: str
     user_answers: str
     is_correct: str
+    onboarding_profile_id: Optional[int] = None  # defaults to the active profile for this state/test type
 
 class TestRecordRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    
     id: int
     user_id: int
     state_code: str
@@ -27,5 +30,6 @@ class TestRecordRead(BaseModel):
     questions: str
     user_answers: str
     is_correct: str
+    onboarding_profile_id: Optional[int] = None
     completed_at: datetime
     created_at: datetime
@@ -1,6 +1,7 @@
 from sqlmodel import SQLModel
 from typing import List, Optional
 from datetime import datetime
+from app.schemas.test_record import TestRecordRead
 
 class CategoryPerformance(SQLModel):
     category: str
@@ -14,6 +15,46 @@ class WeakArea(SQLModel):
     average_score: float
     total_attempts: int
 
+class QuestionDifficulty(SQLModel):
+    question_id: str
+    category: str
+    attempts: int
+    miss_rate: float  # 0.0 - 1.0
+
+class CategoryMissRate(SQLModel):
+    category: str
+    attempts: int
+    miss_rate: float  # 0.0 - 1.0
+
+class QuestionRecommendation(SQLModel):
+    question_id: str
+    category: str
+    difficulty: float  # logit scale, 0 = average
+    probability_correct: float  # estimated for the current user
+    score: float  # expected benefit used for ranking
+
+class ReadinessRead(SQLModel):
+    state_code: str
+    test_type: str
+    readiness_score: int  # 0-100, recency-weighted
+    pass_probability: float  # 0.0 - 1.0
+    total_tests: int
+    last_test_at: Optional[datetime] = None
+
+class PercentileRead(SQLModel):
+    state_code: str
+    test_type: str
+    category: Optional[str] = None  # None: all categories
+    score: int
+    percentile: float  # percent of tests scoring below (ties count half)
+    total_tests: int
+    p10: int
+    p25: int
+    p50: int
+    p75: int
+    p90: int
+    updated_at: datetime
+
 class ProfileStats(SQLModel):
     profile_name: str
     state: str
@@ -41,7 +82,7 @@ class TestStatistics(SQLModel):
     longest_streak: int
 
 class TestRecordPaginated(SQLModel):
-    items: List[dict]
+    items: List[TestRecordRead]
     total: int
     page: int
     page_size: int
@@ -2,6 +2,7 @@ from sqlmodel import SQLModel, Field
 from datetime import datetime, date
 from typing import Optional
 from pydantic import field_validator
+from app.schemas.onboarding_profile import OnboardingProfileRead
 
 class UserCreate(SQLModel):
     email: str = Field(description="User's email address")
@@ -34,12 +35,23 @@ class UserRead(SQLModel):
     state: Optional[str] = Field(description="US state code")
     test_type: Optional[str] = Field(description="Type of DMV test (car, motorcycle, cdl)")
     license_number: Optional[str] = Field(description="Driver's license number")
+    timezone: Optional[str] = Field(default=None, description="IANA timezone used for daily activity")
     
     # Status & Timestamps
     is_active: bool = Field(description="Account active status")
     email_verified: bool = Field(description="Email verification status")
     created_at: datetime = Field(description="Account creation timestamp")
     updated_at: datetime = Field(description="Last update timestamp")
+    
+    # Included by GET/PATCH /auth/me so screens don't need /onboarding-profiles/active
+    active_profile: Optional[OnboardingProfileRead] = Field(default=None, description="Active onboarding profile")
+    
+    @classmethod
+    def from_user(cls, user, active_profile=None) -> "UserRead":
+        read = cls.model_validate(user)
+        if active_profile is not None:
+            read.active_profile = OnboardingProfileRead.from_profile(active_profile, user.active_profile_id)
+        return read
 
 class Token(SQLModel):
     access_token: str
@@ -0,0 +1,236 @@
+from sqlmodel import Session, select, func, delete
+from sqlalchemy import case
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime, date, timedelta, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+import logging
+from app.core.database import insert_for
+from app.models.daily_activity import DailyActivity
+from app.models.test_record import TestRecord
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+
+class ActivityService:
+    """Maintains the per-user ``daily_activity`` rollup used for counters and streaks"""
+
+    @staticmethod
+    def local_date(moment: datetime, tz_name: Optional[str]) -> date:
+        """Convert a naive UTC timestamp to a date in the given IANA timezone (UTC if unset/invalid)"""
+        if not tz_name:
+            return moment.date()
+        try:
+            tz = ZoneInfo(tz_name)
+        except (ZoneInfoNotFoundError, ValueError):
+            return moment.date()
+        return moment.replace(tzinfo=timezone.utc).astimezone(tz).date()
+
+    @staticmethod
+    def today_for(user: User) -> date:
+        """Current local date for a user"""
+        return ActivityService.local_date(datetime.utcnow(), user.timezone)
+
+    @staticmethod
+    def _upsert(db: Session, rows: Dict[Tuple[int, date], List[int]]) -> None:
+        """Increment rollup rows keyed by (user_id, activity_date) with [count, score, time] deltas"""
+        table = DailyActivity.__table__
+        for (user_id, activity_date), (count, score, time_spent) in rows.items():
+            stmt = insert_for(db, table).values(
+                user_id=user_id,
+                activity_date=activity_date,
+                test_count=count,
+                total_score=score,
+                time_spent=time_spent,
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c.user_id, table.c.activity_date],
+                set_={
+                    "test_count": table.c.test_count + stmt.excluded.test_count,
+                    "total_score": table.c.total_score + stmt.excluded.total_score,
+                    "time_spent": table.c.time_spent + stmt.excluded.time_spent,
+                },
+            )
+            db.execute(stmt)
+
+    @staticmethod
+    def record_test(user: User, test_record: TestRecord, db: Session) -> None:
+        """Add a newly inserted test record to the user's rollup (single upsert statement)"""
+        activity_date = ActivityService.local_date(test_record.created_at, user.timezone)
+        ActivityService._upsert(db, {
+            (user.id, activity_date): [1, test_record.score, test_record.time_spent]
+        })
+
+    @staticmethod
+    def get_activity(user_id: int, start: date, end: date, db: Session) -> List[DailyActivity]:
+        """Rollup rows for a user in an inclusive local-date range (e.g. for calendar heatmaps)"""
+        statement = select(DailyActivity).where(
+            DailyActivity.user_id == user_id,
+            DailyActivity.activity_date >= start,
+            DailyActivity.activity_date <= end
+        ).order_by(DailyActivity.activity_date)
+        return db.exec(statement).all()
+
+    @staticmethod
+    def summarize(user: User, db: Session) -> dict:
+        """Weekly/monthly counters and streaks computed from the rollup"""
+        today = ActivityService.today_for(user)
+        week_start = today - timedelta(days=6)
+        month_start = today - timedelta(days=29)
+
+        tests_this_week, tests_this_month = db.exec(
+            select(
+                func.coalesce(func.sum(case((DailyActivity.activity_date >= week_start, DailyActivity.test_count), else_=0)), 0),
+                func.coalesce(func.sum(DailyActivity.test_count), 0),
+            ).where(
+                DailyActivity.user_id == user.id,
+                DailyActivity.activity_date >= month_start,
+                DailyActivity.activity_date <= today
+            )
+        ).one()
+
+        dates = db.exec(
+            select(DailyActivity.activity_date)
+            .where(DailyActivity.user_id == user.id, DailyActivity.test_count > 0)
+            .order_by(DailyActivity.activity_date.desc())
+        ).all()
+
+        return {
+            "tests_this_week": int(tests_this_week),
+            "tests_this_month": int(tests_this_month),
+            "current_streak": ActivityService.current_streak(dates, today),
+            "longest_streak": ActivityService.longest_streak(dates),
+        }
+
+    @staticmethod
+    def summarize_tests(user: User, moments: List[datetime]) -> dict:
+        """Same counters and streaks as ``summarize``, from a subset of the user's tests (e.g. one profile)"""
+        today = ActivityService.today_for(user)
+        week_start = today - timedelta(days=6)
+        month_start = today - timedelta(days=29)
+        dates = [ActivityService.local_date(moment, user.timezone) for moment in moments]
+        active_days = sorted(set(dates), reverse=True)
+        return {
+            "tests_this_week": sum(1 for day in dates if week_start <= day <= today),
+            "tests_this_month": sum(1 for day in dates if month_start <= day <= today),
+            "current_streak": ActivityService.current_streak(active_days, today),
+            "longest_streak": ActivityService.longest_streak(active_days),
+        }
+
+    @staticmethod
+    def current_streak(dates: List[date], today: date) -> int:
+        """Consecutive active days ending today or yesterday; ``dates`` sorted newest first"""
+        if not dates:
+            return 0
+        if dates[0] != today and dates[0] != today - timedelta(days=1):
+            return 0
+
+        streak = 1
+        for i in range(len(dates) - 1):
+            if (dates[i] - dates[i + 1]).days == 1:
+                streak += 1
+            else:
+                break
+        return streak
+
+    @staticmethod
+    def longest_streak(dates: List[date]) -> int:
+        """Longest run of consecutive active days; ``dates`` sorted newest first"""
+        if not dates:
+            return 0
+
+        longest = 1
+        current = 1
+        for i in range(len(dates) - 1):
+            if (dates[i] - dates[i + 1]).days == 1:
+                current += 1
+                longest = max(longest, current)
+            else:
+                current = 1
+        return longest
+
+    @staticmethod
+    def backfill(db: Session, chunk_size: int = 1000, reset: bool = True) -> int:
+        """
+        Rebuild the rollup from historical test records.
+
+        With ``reset`` the rollup is rebuilt ``chunk_size`` users at a time: a user's rows are
+        replaced in the same transaction that reads their records, so readers always see
+        either the old or the rebuilt rollup, never a missing one. Without it, records that
+        existed when the job started are added on top of the existing rows in keyset-paginated
+        chunks of ``chunk_size`` records. Returns the number of test records processed.
+        """
+        if reset:
+            return ActivityService._rebuild_users(db, chunk_size)
+
+        max_id = db.exec(select(func.max(TestRecord.id))).one()
+        db.commit()
+        if max_id is None:
+            return 0
+
+        processed = 0
+        last_id = 0
+        while last_id < max_id:
+            rows = db.exec(
+                select(TestRecord.id, TestRecord.user_id, TestRecord.created_at,
+                       TestRecord.score, TestRecord.time_spent, User.timezone)
+                .join(User, User.id == TestRecord.user_id)
+                .where(TestRecord.id > last_id, TestRecord.id <= max_id)
+                .order_by(TestRecord.id)
+                .limit(chunk_size)
+            ).all()
+            if not rows:
+                break
+
+            ActivityService._upsert(db, ActivityService._aggregate(
+                (user_id, created_at, score, time_spent, tz_name)
+                for _, user_id, created_at, score, time_spent, tz_name in rows
+            ))
+            db.commit()
+
+            last_id = rows[-1][0]
+            processed += len(rows)
+            logger.info(f"DAILY_ACTIVITY_BACKFILL | processed={processed} | last_id={last_id}")
+
+        return processed
+
+    @staticmethod
+    def _rebuild_users(db: Session, chunk_size: int) -> int:
+        processed = 0
+        last_user_id = 0
+        while True:
+            users = db.exec(
+                select(User.id, User.timezone).where(User.id > last_user_id).order_by(User.id).limit(chunk_size)
+            ).all()
+            if not users:
+                break
+            timezones = dict(users)
+
+            rows = db.exec(
+                select(TestRecord.user_id, TestRecord.created_at, TestRecord.score, TestRecord.time_spent)
+                .where(TestRecord.user_id.in_(timezones))
+            ).all()
+            db.execute(delete(DailyActivity).where(DailyActivity.user_id.in_(timezones)))
+            ActivityService._upsert(db, ActivityService._aggregate(
+                (user_id, created_at, score, time_spent, timezones[user_id])
+                for user_id, created_at, score, time_spent in rows
+            ))
+            db.commit()
+
+            last_user_id = users[-1][0]
+            processed += len(rows)
+            logger.info(f"DAILY_ACTIVITY_BACKFILL | processed={processed} | last_user_id={last_user_id}")
+
+        return processed
+
+    @staticmethod
+    def _aggregate(rows) -> Dict[Tuple[int, date], List[int]]:
+        """(user_id, created_at, score, time_spent, timezone) rows -> ``_upsert`` deltas"""
+        aggregates: Dict[Tuple[int, date], List[int]] = {}
+        for user_id, created_at, score, time_spent, tz_name in rows:
+            key = (user_id, ActivityService.local_date(created_at, tz_name))
+            totals = aggregates.setdefault(key, [0, 0, 0])
+            totals[0] += 1
+            totals[1] += score
+            totals[2] += time_spent
+        return aggregates
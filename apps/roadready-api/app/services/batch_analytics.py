@@ -0,0 +1,322 @@
+from sqlmodel import Session, select
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime
+import logging
+from app.core.database import insert_for
+from app.models.analytics import UserStatistics, CohortStatistics
+from app.models.daily_activity import DailyActivity
+from app.models.test_record import TestRecord
+from app.models.user import User
+from app.services.activity_service import ActivityService
+
+try:
+    import numpy as np
+except ImportError:  # optional: only needed by the nightly batch job
+    np = None
+
+logger = logging.getLogger(__name__)
+
+PASSING_SCORE = 70
+# Score buckets 0-9, 10-19, ..., 90-99 and a separate bucket for 100
+HISTOGRAM_BUCKETS = 11
+# Attempt curve length; later attempts are folded into the last entry
+MAX_ATTEMPTS = 20
+
+
+class _CohortTotals:
+    """Per state/test type accumulators merged across user chunks"""
+
+    def __init__(self):
+        self.users = 0
+        self.tests = 0
+        self.passes = 0
+        self.score_sum = 0
+        self.histogram = np.zeros(HISTOGRAM_BUCKETS, dtype=np.int64)
+        self.attempt_sums = np.zeros(MAX_ATTEMPTS, dtype=np.int64)
+        self.attempt_counts = np.zeros(MAX_ATTEMPTS, dtype=np.int64)
+
+
+def _group_starts(*keys) -> "np.ndarray":
+    """Start index of each run of equal consecutive keys (arrays must be sorted by the keys)"""
+    size = len(keys[0])
+    changed = np.zeros(size, dtype=bool)
+    if size:
+        changed[0] = True
+        for key in keys:
+            changed[1:] |= key[1:] != key[:-1]
+    return np.flatnonzero(changed)
+
+
+class BatchAnalyticsService:
+    """
+    Nightly per-user and per-cohort report metrics computed with NumPy.
+
+    Users are processed in keyset-paginated chunks; each chunk's test records are loaded as
+    scalar columns only and reduced with array operations instead of per-user queries and
+    Python loops, so memory is bounded by the chunk size rather than the table size.
+    """
+
+    @staticmethod
+    def run(db: Session, chunk_size: int = 5000) -> Dict[str, int]:
+        """
+        Recompute ``user_statistics`` for every user and ``cohort_statistics`` for every
+        state/test type. Each user chunk is committed separately; cohorts are written at the
+        end. Returns the number of users, test records and cohorts processed.
+        """
+        if np is None:
+            raise RuntimeError("numpy is required for batch analytics: pip install numpy")
+
+        computed_at = datetime.utcnow()
+        cohorts: Dict[Tuple[str, str], _CohortTotals] = {}
+        users = tests = 0
+        last_id = 0
+        while True:
+            chunk = db.exec(
+                select(User.id, User.timezone)
+                .where(User.id > last_id)
+                .order_by(User.id)
+                .limit(chunk_size)
+            ).all()
+            if not chunk:
+                break
+
+            first_id, last_id = chunk[0][0], chunk[-1][0]
+            rows = BatchAnalyticsService._user_rows(db, chunk, first_id, last_id, cohorts, computed_at)
+            BatchAnalyticsService._upsert_users(db, rows)
+            db.commit()
+
+            users += len(chunk)
+            tests += sum(row["total_tests"] for row in rows)
+            logger.info(f"BATCH_ANALYTICS | users={users} | tests={tests} | last_id={last_id}")
+
+        BatchAnalyticsService._upsert_cohorts(db, cohorts, computed_at)
+        db.commit()
+        logger.info(f"BATCH_ANALYTICS_DONE | users={users} | tests={tests} | cohorts={len(cohorts)}")
+        return {"users": users, "tests": tests, "cohorts": len(cohorts)}
+
+    @staticmethod
+    def _user_rows(
+        db: Session,
+        chunk: List[Tuple[int, Optional[str]]],
+        first_id: int,
+        last_id: int,
+        cohorts: Dict[Tuple[str, str], _CohortTotals],
+        computed_at: datetime
+    ) -> List[dict]:
+        """Metrics for one chunk of users; also adds the chunk's tests to ``cohorts``"""
+        records = db.exec(
+            select(TestRecord.user_id, TestRecord.score, TestRecord.time_spent, TestRecord.created_at,
+                   TestRecord.state_code, TestRecord.test_type)
+            .where(TestRecord.user_id >= first_id, TestRecord.user_id <= last_id)
+            .order_by(TestRecord.user_id, TestRecord.created_at, TestRecord.id)
+        ).all()
+
+        user_ids = np.array([user_id for user_id, _ in chunk], dtype=np.int64)
+        stats = BatchAnalyticsService._test_metrics(user_ids, records)
+        streaks = BatchAnalyticsService._streaks(db, chunk, first_id, last_id)
+        if records:
+            BatchAnalyticsService._add_cohorts(records, cohorts)
+
+        last_test_at = stats["last_test_at"].tolist()
+        improvement = stats["improvement_rate"]
+        return [
+            {
+                "user_id": int(user_id),
+                "total_tests": int(stats["total_tests"][i]),
+                "average_score": float(stats["average_score"][i]),
+                "best_score": int(stats["best_score"][i]),
+                "worst_score": int(stats["worst_score"][i]),
+                "pass_rate": float(stats["pass_rate"][i]),
+                "total_time_spent": int(stats["total_time_spent"][i]),
+                # NaN marks users without enough tests (or an unchanged average)
+                "improvement_rate": None if np.isnan(improvement[i]) else float(improvement[i]),
+                "current_streak": int(streaks[0][i]),
+                "longest_streak": int(streaks[1][i]),
+                "last_test_at": last_test_at[i],
+                "computed_at": computed_at,
+            }
+            for i, user_id in enumerate(user_ids)
+        ]
+
+    @staticmethod
+    def _test_metrics(user_ids: "np.ndarray", records: list) -> Dict[str, "np.ndarray"]:
+        """
+        Aggregates aligned with ``user_ids`` (users without tests get zeros), using the same
+        rules as ``StatisticsService.calculate_user_statistics``.
+        """
+        size = len(user_ids)
+        stats = {
+            "total_tests": np.zeros(size, dtype=np.int64),
+            "average_score": np.zeros(size),
+            "best_score": np.zeros(size, dtype=np.int64),
+            "worst_score": np.zeros(size, dtype=np.int64),
+            "pass_rate": np.zeros(size),
+            "total_time_spent": np.zeros(size, dtype=np.int64),
+            "improvement_rate": np.full(size, np.nan),
+            "last_test_at": np.full(size, np.datetime64("NaT"), dtype="datetime64[us]"),
+        }
+        if not records:
+            return stats
+
+        record_users, scores, times, created = (
+            np.array(column, dtype=dtype) for column, dtype in zip(
+                list(zip(*records))[:4], (np.int64, np.int64, np.int64, "datetime64[us]")
+            )
+        )
+        starts = _group_starts(record_users)
+        counts = np.diff(np.append(starts, len(scores)))
+        slots = np.searchsorted(user_ids, record_users[starts])
+
+        score_sums = np.add.reduceat(scores, starts)
+        stats["total_tests"][slots] = counts
+        stats["average_score"][slots] = np.round(score_sums / counts, 2)
+        stats["best_score"][slots] = np.maximum.reduceat(scores, starts)
+        stats["worst_score"][slots] = np.minimum.reduceat(scores, starts)
+        passes = np.add.reduceat((scores >= PASSING_SCORE).astype(np.int64), starts)
+        stats["pass_rate"][slots] = np.round(passes / counts * 100, 2)
+        stats["total_time_spent"][slots] = np.add.reduceat(times, starts)
+        # Records are ordered by created_at within each user
+        stats["last_test_at"][slots] = created[starts + counts - 1]
+
+        # Improvement rate: second half vs first half of each user's tests (at least 4)
+        group = np.repeat(np.arange(len(starts)), counts)
+        position = np.arange(len(scores)) - starts[group]
+        mid = counts // 2
+        first_sums = np.bincount(group, weights=np.where(position < mid[group], scores, 0), minlength=len(starts))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            first_avg = first_sums / mid
+            second_avg = (score_sums - first_sums) / (counts - mid)
+            rate = (second_avg - first_avg) / first_avg * 100
+        valid = (counts >= 4) & (first_avg > 0) & (rate != 0)
+        stats["improvement_rate"][slots] = np.where(valid, np.round(rate, 2), np.nan)
+        return stats
+
+    @staticmethod
+    def _streaks(
+        db: Session, chunk: List[Tuple[int, Optional[str]]], first_id: int, last_id: int
+    ) -> Tuple["np.ndarray", "np.ndarray"]:
+        """Current and longest streak per user in ``chunk`` from the daily activity rollup"""
+        size = len(chunk)
+        current = np.zeros(size, dtype=np.int64)
+        longest = np.zeros(size, dtype=np.int64)
+        days = db.exec(
+            select(DailyActivity.user_id, DailyActivity.activity_date)
+            .where(DailyActivity.user_id >= first_id, DailyActivity.user_id <= last_id,
+                   DailyActivity.test_count > 0)
+            .order_by(DailyActivity.user_id, DailyActivity.activity_date)
+        ).all()
+        if not days:
+            return current, longest
+
+        user_ids = np.array([user_id for user_id, _ in chunk], dtype=np.int64)
+        day_users = np.array([user_id for user_id, _ in days], dtype=np.int64)
+        day_numbers = np.array([activity_date for _, activity_date in days], dtype="datetime64[D]").astype(np.int64)
+
+        # A run of consecutive days starts where the user changes or a day is skipped
+        day_starts = _group_starts(day_users)
+        breaks = np.zeros(len(days), dtype=bool)
+        breaks[day_starts] = True
+        breaks[1:] |= np.diff(day_numbers) != 1
+        run_index = np.cumsum(breaks) - 1
+        run_lengths = np.bincount(run_index)
+        run_users = day_users[breaks]
+
+        user_run_starts = _group_starts(run_users)
+        slots = np.searchsorted(user_ids, run_users[user_run_starts])
+        longest[slots] = np.maximum.reduceat(run_lengths, user_run_starts)
+
+        # The latest run is current if it ends today or yesterday in the user's timezone
+        now = datetime.utcnow()
+        timezones = [tz_name or "" for _, tz_name in chunk]
+        names, tz_index = np.unique(np.array(timezones, dtype=object), return_inverse=True)
+        today_by_tz = np.array(
+            [ActivityService.local_date(now, name or None) for name in names], dtype="datetime64[D]"
+        ).astype(np.int64)
+        user_ends = np.append(user_run_starts[1:], len(run_users)) - 1
+        last_day = day_numbers[np.append(day_starts[1:], len(days)) - 1]
+        ongoing = last_day >= today_by_tz[tz_index[slots]] - 1
+        current[slots] = np.where(ongoing, run_lengths[user_ends], 0)
+        return current, longest
+
+    @staticmethod
+    def _add_cohorts(records: list, cohorts: Dict[Tuple[str, str], _CohortTotals]) -> None:
+        """Add a chunk's test records (ordered by user and time) to the cohort accumulators"""
+        record_users = np.array([record[0] for record in records], dtype=np.int64)
+        scores = np.array([record[1] for record in records], dtype=np.int64)
+        keys, codes = np.unique(
+            np.array([f"{record[4]}|{record[5]}" for record in records], dtype=object), return_inverse=True
+        )
+        cohort_count = len(keys)
+
+        # Attempt number of each test within its user and cohort; a stable sort keeps time order
+        order = np.lexsort((codes, record_users))
+        sorted_users, sorted_codes, sorted_scores = record_users[order], codes[order], scores[order]
+        starts = _group_starts(sorted_users, sorted_codes)
+        counts = np.diff(np.append(starts, len(order)))
+        attempt = np.minimum(np.arange(len(order)) - np.repeat(starts, counts), MAX_ATTEMPTS - 1)
+
+        users = np.bincount(sorted_codes[starts], minlength=cohort_count)
+        tests = np.bincount(codes, minlength=cohort_count)
+        passes = np.bincount(codes, weights=(scores >= PASSING_SCORE).astype(np.float64), minlength=cohort_count)
+        score_sums = np.bincount(codes, weights=scores, minlength=cohort_count)
+        buckets = np.minimum(scores // 10, HISTOGRAM_BUCKETS - 1)
+        histogram = np.bincount(
+            codes * HISTOGRAM_BUCKETS + buckets, minlength=cohort_count * HISTOGRAM_BUCKETS
+        ).reshape(cohort_count, HISTOGRAM_BUCKETS)
+        curve_index = sorted_codes * MAX_ATTEMPTS + attempt
+        attempt_sums = np.bincount(
+            curve_index, weights=sorted_scores, minlength=cohort_count * MAX_ATTEMPTS
+        ).reshape(cohort_count, MAX_ATTEMPTS)
+        attempt_counts = np.bincount(
+            curve_index, minlength=cohort_count * MAX_ATTEMPTS
+        ).reshape(cohort_count, MAX_ATTEMPTS)
+
+        for i, key in enumerate(keys):
+            totals = cohorts.setdefault(tuple(key.split("|", 1)), _CohortTotals())
+            totals.users += int(users[i])
+            totals.tests += int(tests[i])
+            totals.passes += int(passes[i])
+            totals.score_sum += int(score_sums[i])
+            totals.histogram += histogram[i]
+            totals.attempt_sums += attempt_sums[i].astype(np.int64)
+            totals.attempt_counts += attempt_counts[i]
+
+    @staticmethod
+    def _upsert_users(db: Session, rows: List[dict]) -> None:
+        """Replace the chunk's ``user_statistics`` rows in one executemany upsert"""
+        if not rows:
+            return
+        table = UserStatistics.__table__
+        stmt = insert_for(db, table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.user_id],
+            set_={name: stmt.excluded[name] for name in rows[0] if name != "user_id"},
+        )
+        db.execute(stmt, rows)
+
+    @staticmethod
+    def _upsert_cohorts(db: Session, cohorts: Dict[Tuple[str, str], _CohortTotals], computed_at: datetime) -> None:
+        if not cohorts:
+            return
+        rows = []
+        for (state_code, test_type), totals in cohorts.items():
+            counts = totals.attempt_counts
+            curve = np.round(totals.attempt_sums / np.maximum(counts, 1), 2)
+            rows.append({
+                "state_code": state_code,
+                "test_type": test_type,
+                "users": totals.users,
+                "total_tests": totals.tests,
+                "average_score": round(totals.score_sum / totals.tests, 2),
+                "pass_rate": round(totals.passes / totals.tests * 100, 2),
+                "score_histogram": totals.histogram.tolist(),
+                "attempt_curve": [value if count else None for value, count in zip(curve.tolist(), counts.tolist())],
+                "computed_at": computed_at,
+            })
+        table = CohortStatistics.__table__
+        stmt = insert_for(db, table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.state_code, table.c.test_type],
+            set_={name: stmt.excluded[name] for name in rows[0] if name not in ("state_code", "test_type")},
+        )
+        db.execute(stmt, rows)
@@ -0,0 +1,145 @@
+from sqlalchemy import bindparam
+from sqlmodel import Session, select
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional, Tuple
+import logging
+import time
+from app.core.config import settings
+from app.core.security import create_unsubscribe_token
+from app.models.analytics import UserStatistics
+from app.models.daily_activity import DailyActivity
+from app.models.user import User
+from app.services.activity_service import ActivityService
+from app.services.email_service import EmailService
+
+logger = logging.getLogger(__name__)
+
+
+class DigestService:
+    """
+    Weekly progress digests for every active, verified user who hasn't unsubscribed.
+
+    Users are read in keyset-paginated batches together with their nightly statistics and
+    one query for the week's activity; each batch is rendered from the compiled templates
+    and sent over the transport's single reused connection. Digests are sent directly
+    rather than through the outbox: they aren't tied to a transaction, and a missed digest
+    is not retried.
+
+    Each user's week ends on their own local date. ``last_digest_on`` is committed after
+    every batch, so a rerun (or a run resumed after a crash) skips users who already got
+    this week's digest.
+    """
+
+    # A user gets at most one digest within this many days of their local date
+    RESEND_AFTER_DAYS = 6
+
+    @staticmethod
+    def streak_message(current_streak: int, last_activity_date: Optional[date], today: date) -> str:
+        if current_streak and last_activity_date == today:
+            return f"You're on a {current_streak}-day streak. Nice work!"
+        if current_streak and last_activity_date == today - timedelta(days=1):
+            return f"Take a test today to keep your {current_streak}-day streak going!"
+        return "Take a test today to start a new streak."
+
+    @staticmethod
+    def unsubscribe_headers(user_id: int, base_url: str) -> Dict[str, str]:
+        """List-Unsubscribe headers for one-click unsubscribe (RFC 8058)"""
+        url = f"{base_url}/api/v1/auth/unsubscribe-digest?token={create_unsubscribe_token(user_id)}"
+        return {"List-Unsubscribe": f"<{url}>", "List-Unsubscribe-Post": "List-Unsubscribe=One-Click"}
+
+    @staticmethod
+    def _week_activity(db: Session, since: Dict[int, date]) -> Dict[int, Tuple[int, int]]:
+        """(tests, total score) per user since that user's ``since`` date, in one query"""
+        totals: Dict[int, Tuple[int, int]] = {}
+        for user_id, activity_date, tests, total_score in db.exec(
+            select(DailyActivity.user_id, DailyActivity.activity_date, DailyActivity.test_count, DailyActivity.total_score)
+            .where(DailyActivity.user_id.in_(list(since)), DailyActivity.activity_date >= min(since.values()))
+        ).all():
+            if activity_date >= since[user_id]:
+                previous_tests, previous_score = totals.get(user_id, (0, 0))
+                totals[user_id] = (previous_tests + tests, previous_score + total_score)
+        return totals
+
+    @staticmethod
+    def send_weekly(
+        db: Session, transport, batch_size: int = 500, today: Optional[date] = None,
+        base_url: Optional[str] = None,
+    ) -> dict:
+        """
+        Send the weekly digest to all users who are due one; returns counts and throughput.
+        ``today`` overrides every user's local date.
+        """
+        base_url = (base_url or settings.PUBLIC_BASE_URL).rstrip("/")
+        now = datetime.utcnow()
+        started = time.perf_counter()
+        sent = failed = skipped = 0
+        last_id = 0
+
+        with transport:
+            while True:
+                users = db.exec(
+                    select(
+                        User.id, User.email, User.first_name, User.timezone, User.current_streak,
+                        User.last_activity_date, User.last_digest_on, UserStatistics.total_tests, UserStatistics.pass_rate
+                    )
+                    .outerjoin(UserStatistics, UserStatistics.user_id == User.id)
+                    .where(
+                        User.id > last_id, User.is_active == True, User.email_verified == True,
+                        User.digest_opt_out == False,
+                    )
+                    .order_by(User.id)
+                    .limit(batch_size)
+                ).all()
+                if not users:
+                    break
+                last_id = users[-1].id
+
+                local_today = {user.id: today or ActivityService.local_date(now, user.timezone) for user in users}
+                due = [
+                    user for user in users
+                    if user.last_digest_on is None
+                    or (local_today[user.id] - user.last_digest_on).days >= DigestService.RESEND_AFTER_DAYS
+                ]
+                skipped += len(users) - len(due)
+                if not due:
+                    continue
+                week = DigestService._week_activity(db, {user.id: local_today[user.id] - timedelta(days=6) for user in due})
+
+                messages = []
+                for user in due:
+                    tests, total_score = week.get(user.id, (0, 0))
+                    messages.append(EmailService.render("weekly_digest", user.email, {
+                        "name": user.first_name or "there",
+                        "tests_this_week": tests,
+                        "average_this_week": round(total_score / tests) if tests else "-",
+                        "total_tests": user.total_tests or 0,
+                        "pass_rate": round(user.pass_rate or 0),
+                        "streak_message": DigestService.streak_message(
+                            user.current_streak, user.last_activity_date, local_today[user.id]
+                        ),
+                    }, headers=DigestService.unsubscribe_headers(user.id, base_url)))
+                errors = transport.send(messages)
+
+                delivered = [
+                    {"_id": user.id, "_sent_on": local_today[user.id]}
+                    for user, error in zip(due, errors) if error is None
+                ]
+                if delivered:
+                    users_table = User.__table__
+                    db.execute(
+                        users_table.update()
+                        .where(users_table.c.id == bindparam("_id"))
+                        .values(last_digest_on=bindparam("_sent_on")),
+                        delivered,
+                    )
+                    db.commit()
+                sent += len(delivered)
+                failed += len(errors) - len(delivered)
+                logger.info(f"WEEKLY_DIGEST | sent={sent} | failed={failed} | skipped={skipped} | last_id={last_id}")
+
+        seconds = time.perf_counter() - started
+        per_second = round((sent + failed) / seconds, 1) if seconds else 0.0
+        logger.info(
+            f"WEEKLY_DIGEST_DONE | sent={sent} | failed={failed} | skipped={skipped} | seconds={seconds:.2f} | per_second={per_second}"
+        )
+        return {"sent": sent, "failed": failed, "skipped": skipped, "seconds": round(seconds, 3), "per_second": per_second}
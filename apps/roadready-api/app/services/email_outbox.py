@@ -0,0 +1,118 @@
+from sqlmodel import Session, select, update
+from sqlalchemy.engine import Engine
+from datetime import datetime, timedelta
+from typing import List, Optional
+import asyncio
+import logging
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.core.mailer import default_transport
+from app.models.email_outbox import EmailOutbox
+from app.services.email_service import EmailService
+
+logger = logging.getLogger(__name__)
+
+MAX_RETRY_SECONDS = 3600
+# Claimed rows are skipped by other workers for this long while the batch is being sent
+CLAIM_LEASE_SECONDS = 300
+
+
+class EmailOutboxWorker:
+    """
+    Delivers queued emails in batches: claim due rows (pushing their next attempt past the
+    lease, so concurrent workers skip them), send the batch over one connection, then
+    mark each row sent or schedule its retry with exponential backoff.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        transport=None,
+        batch_size: int = settings.EMAIL_WORKER_BATCH_SIZE,
+        max_attempts: int = settings.EMAIL_MAX_ATTEMPTS,
+        retry_base_seconds: int = settings.EMAIL_RETRY_BASE_SECONDS,
+    ):
+        self.engine = engine
+        self.transport = transport or default_transport()
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+
+    def backoff(self, attempts: int) -> timedelta:
+        return timedelta(seconds=min(self.retry_base_seconds * 2 ** (attempts - 1), MAX_RETRY_SECONDS))
+
+    def claim(self, now: datetime) -> List[EmailOutbox]:
+        with Session(self.engine, expire_on_commit=False) as db:
+            # SKIP LOCKED keeps concurrent workers (Postgres) off each other's batch
+            rows = db.exec(
+                select(EmailOutbox)
+                .where(EmailOutbox.status == "pending", EmailOutbox.next_attempt_at <= now)
+                .order_by(EmailOutbox.next_attempt_at)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            ).all()
+            if rows:
+                db.execute(
+                    update(EmailOutbox)
+                    .where(EmailOutbox.id.in_([row.id for row in rows]))
+                    .values(next_attempt_at=now + timedelta(seconds=CLAIM_LEASE_SECONDS))
+                )
+            db.commit()
+            return rows
+
+    def run_once(self, now: Optional[datetime] = None) -> int:
+        """Send one batch of due emails; returns the number of emails attempted"""
+        now = now or datetime.utcnow()
+        rows = self.claim(now)
+        if not rows:
+            return 0
+
+        # A row that can't be rendered (unknown kind, bad payload) fails on its own; the rest
+        # of the batch is still sent
+        errors: List[Optional[str]] = [None] * len(rows)
+        messages = {}
+        for index, row in enumerate(rows):
+            try:
+                messages[index] = EmailService.render(row.kind, row.to_email, row.payload)
+            except Exception as e:
+                errors[index] = f"render failed: {e!r}"
+        if messages:
+            for index, error in zip(messages, self.transport.send(list(messages.values()))):
+                errors[index] = error
+
+        sent = [row.id for row, error in zip(rows, errors) if error is None]
+        with Session(self.engine) as db:
+            if sent:
+                db.execute(
+                    update(EmailOutbox).where(EmailOutbox.id.in_(sent)).values(status="sent", sent_at=datetime.utcnow())
+                )
+            for row, error in zip(rows, errors):
+                if error is None:
+                    continue
+                attempts = row.attempts + 1
+                failed = attempts >= self.max_attempts
+                db.execute(update(EmailOutbox).where(EmailOutbox.id == row.id).values(
+                    attempts=attempts,
+                    status="failed" if failed else "pending",
+                    next_attempt_at=now + self.backoff(attempts),
+                    last_error=error[:500],
+                ))
+                logger.warning(f"EMAIL_SEND_FAILED | id={row.id} | kind={row.kind} | attempts={attempts} | final={failed} | error={error}")
+            db.commit()
+
+        logger.info(f"EMAIL_OUTBOX | sent={len(sent)} | failed={len(rows) - len(sent)}")
+        return len(rows)
+
+    async def run(self, stop: asyncio.Event, poll_seconds: float = settings.EMAIL_WORKER_POLL_SECONDS) -> None:
+        """Drain the outbox until ``stop`` is set, polling when it's empty"""
+        while not stop.is_set():
+            try:
+                attempted = await run_in_threadpool(self.run_once)
+            except Exception as e:
+                logger.error(f"EMAIL_OUTBOX_ERROR | error={e!r}")
+                attempted = 0
+            if attempted < self.batch_size:
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout=poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
@@ -1,54 +1,74 @@
+from sqlmodel import Session
 from typing import Optional
 import logging
+from app.core.mailer import OutgoingEmail, build_message
+from app.models.email_outbox import EmailOutbox
+from app.services.email_templates import get_template
 
 logger = logging.getLogger(__name__)
 
 
 class EmailService:
-    """Email service for sending verification and notification emails"""
-    
+    """
+    Email content and queuing. Emails are added to the outbox in the caller's transaction
+    (committed by the request) and delivered by the background worker in
+    app/services/email_outbox.py, so no request waits on the email provider.
+    """
+
+    @staticmethod
+    def queue(db: Session, kind: str, to: str, **payload) -> EmailOutbox:
+        """Add an email to the outbox; it is sent once the caller's transaction commits"""
+        email = EmailOutbox(kind=kind, to_email=to, payload=payload)
+        db.add(email)
+        return email
+
     @staticmethod
-    async def send_verification_email(email: str, token: str, base_url: str = "http://localhost:8888") -> dict:
-        """Send email verification link"""
+    def render(kind: str, to: str, payload: dict, headers: Optional[dict] = None) -> OutgoingEmail:
+        """Build the message from the compiled ``kind`` templates (app/templates/email)"""
+        template = get_template(kind)
+        return build_message(
+            to, template.subject(payload), template.text(payload), template.html(payload) if template.html else None,
+            headers=headers,
+        )
+
+    @staticmethod
+    def send_verification_email(db: Session, email: str, token: str, base_url: str = "http://localhost:8888") -> dict:
+        """Queue the email verification link"""
         verification_link = f"{base_url}/api/v1/auth/verify-email?token={token}"
-        
+
         logger.info(f"EMAIL_VERIFICATION | to={email} | link={verification_link}")
-        
-        # TODO: Integrate with actual email service (SendGrid, AWS SES, Mailgun)
-        # Example: await sendgrid_client.send(...)
-        
+        EmailService.queue(db, "verification", email, link=verification_link)
+
         return {
-            "status": "sent",
+            "status": "queued",
             "link": verification_link,
             "email": email
         }
-    
+
     @staticmethod
-    async def send_password_reset_email(email: str, token: str, base_url: str = "http://localhost:8888") -> dict:
-        """Send password reset link"""
+    def send_password_reset_email(db: Session, email: str, token: str, base_url: str = "http://localhost:8888") -> dict:
+        """Queue the password reset link"""
         reset_link = f"{base_url}/api/v1/auth/reset-password?token={token}"
-        
+
         logger.info(f"PASSWORD_RESET | to={email} | link={reset_link}")
-        
-        # TODO: Integrate with actual email service
-        
+        EmailService.queue(db, "password_reset", email, link=reset_link)
+
         return {
-            "status": "sent",
+            "status": "queued",
             "link": reset_link,
             "email": email
         }
-    
+
     @staticmethod
-    async def send_welcome_email(email: str, first_name: Optional[str] = None) -> dict:
-        """Send welcome email to new users"""
+    def send_welcome_email(db: Session, email: str, first_name: Optional[str] = None) -> dict:
+        """Queue the welcome email for a new user"""
         greet = f"Welcome {'to RoadReady' if not first_name else first_name + ' to RoadReady'}!"
-        
+
         logger.info(f"WELCOME_EMAIL | to={email} | user={first_name}")
-        
-        # TODO: Integrate with actual email service
-        
+        EmailService.queue(db, "welcome", email, greeting=greet)
+
         return {
-            "status": "sent",
+            "status": "queued",
             "message": greet,
             "email": email
         }
@@ -0,0 +1,59 @@
+from functools import lru_cache
+from pathlib import Path
+from string import Formatter
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+import html
+
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent / "templates" / "email"
+
+
+def compile_template(source: str, escape: bool = False) -> Callable[[Dict], str]:
+    """
+    Compile a ``{name}`` placeholder template into a function of a dict of values.
+
+    The template is parsed once into a list of literal text with a slot per field, so
+    rendering only fills the slots and joins. ``escape`` HTML-escapes every value.
+    Missing values raise KeyError.
+    """
+    parts: List[str] = []
+    fields: List[Tuple[int, str]] = []  # (slot in parts, value name)
+    for literal, field, spec, conversion in Formatter().parse(source):
+        if literal:
+            parts.append(literal)
+        if field is None:
+            continue
+        if not field.isidentifier() or spec or conversion:
+            raise ValueError(f"Unsupported placeholder {{{field}}}: only plain {{name}} fields")
+        fields.append((len(parts), field))
+        parts.append("")
+
+    def render(values: Dict) -> str:
+        out = parts.copy()
+        for slot, name in fields:
+            out[slot] = html.escape(str(values[name])) if escape else str(values[name])
+        return "".join(out)
+
+    return render
+
+
+class EmailTemplate(NamedTuple):
+    subject: Callable[[Dict], str]
+    text: Callable[[Dict], str]
+    html: Optional[Callable[[Dict], str]]
+
+
+@lru_cache(maxsize=None)
+def get_template(kind: str) -> EmailTemplate:
+    """
+    Load and compile ``<kind>.txt`` (first line ``Subject: ...``, blank line, body) and the
+    optional ``<kind>.html`` body from TEMPLATE_DIR, once per process.
+    """
+    subject, _, text = (TEMPLATE_DIR / f"{kind}.txt").read_text().partition("\n\n")
+    if not subject.startswith("Subject: "):
+        raise ValueError(f"{kind}.txt must start with a 'Subject: ' line")
+    html_path = TEMPLATE_DIR / f"{kind}.html"
+    return EmailTemplate(
+        subject=compile_template(subject[len("Subject: "):]),
+        text=compile_template(text),
+        html=compile_template(html_path.read_text(), escape=True) if html_path.exists() else None,
+    )
@@ -0,0 +1,73 @@
+from sqlmodel import Session, select
+from sqlalchemy.engine import Connection, Engine
+from typing import Iterator, Union
+import csv
+import io
+import logging
+import zlib
+import orjson
+from app.models.test_record import TestRecord
+from app.schemas.test_record import TestRecordRead
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FIELDS = list(TestRecordRead.model_fields)
+EXPORT_CHUNK_SIZE = 500
+
+
+class ExportService:
+    """Streams a user's full test history (data portability / offline analysis)"""
+
+    @staticmethod
+    def iter_test_records(user_id: int, bind: Union[Engine, Connection], chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[list]:
+        """
+        Yield the user's test records oldest first as lists of row mappings.
+
+        Opens its own session because the stream outlives the request's session.
+        ``yield_per`` uses a server-side cursor on Postgres, so memory stays at one chunk
+        regardless of history size.
+        """
+        columns = [TestRecord.__table__.c[name] for name in EXPORT_FIELDS]
+        statement = (
+            select(*columns)
+            .where(TestRecord.user_id == user_id)
+            .order_by(TestRecord.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        exported = 0
+        with Session(bind) as session:
+            for chunk in session.execute(statement).mappings().partitions():
+                exported += len(chunk)
+                yield chunk
+        logger.info(f"TEST_RECORDS_EXPORT | user_id={user_id} | records={exported}")
+
+    @staticmethod
+    def ndjson(chunks: Iterator[list]) -> Iterator[bytes]:
+        for chunk in chunks:
+            yield b"".join(orjson.dumps(dict(row)) + b"\n" for row in chunk)
+
+    @staticmethod
+    def csv(chunks: Iterator[list]) -> Iterator[bytes]:
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+        writer.writeheader()
+        for chunk in chunks:
+            writer.writerows(
+                {key: value.isoformat() if hasattr(value, "isoformat") else value for key, value in row.items()}
+                for row in chunk
+            )
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode("utf-8")
+
+    @staticmethod
+    def gzip(stream: Iterator[bytes], level: int = 6) -> Iterator[bytes]:
+        """Compress a byte stream into a single gzip member incrementally"""
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+        for data in stream:
+            compressed = compressor.compress(data)
+            if compressed:
+                yield compressed
+        yield compressor.flush()
@@ -45,7 +45,7 @@ class AchievementConfig(SQLModel, table=True):
 
 
 class GamificationService:
-    """Gamification service with DB-backed achievement configuration."""
+    """Gamification service with DB-backed achievement configuration. Changes are committed by the caller."""
     
     @staticmethod
     def get_streak_milestone_config() -> Dict[int, str]:
@@ -62,6 +62,51 @@ class GamificationService:
         """Return XP for perfect score achievement."""
         return ACHIEVEMENTS['perfect_score']['xp']
     
+    @staticmethod
+    def earned_types(user: User, achievement_types: List[str], db: Session) -> set:
+        """Which of ``achievement_types`` the user already has, in one query."""
+        if not achievement_types:
+            return set()
+        return set(db.exec(select(Achievement.achievement_type).where(
+            Achievement.user_id == user.id,
+            Achievement.achievement_type.in_(achievement_types)
+        )).all())
+    
+    @staticmethod
+    def stats(user: User) -> dict:
+        """Streak, XP and level from the user row."""
+        return {
+            'current_streak': user.current_streak,
+            'longest_streak': user.longest_streak,
+            'total_xp': user.total_xp,
+            'level': user.total_xp // 500 + 1
+        }
+    
+    @staticmethod
+    def achievements(user_id: int, db: Session) -> dict:
+        """All achievements with the user's earned flags and dates, in one query."""
+        earned = db.exec(select(Achievement.achievement_type, Achievement.earned_at).where(
+            Achievement.user_id == user_id
+        )).all()
+        earned_at = {}
+        for achievement_type, at in earned:
+            earned_at.setdefault(achievement_type, at)
+        return {
+            'achievements': [
+                {
+                    'type': key,
+                    'name': value['name'],
+                    'icon': value['icon'],
+                    'xp': value['xp'],
+                    'earned': key in earned_at,
+                    'earned_at': earned_at.get(key)
+                }
+                for key, value in ACHIEVEMENTS.items()
+            ],
+            'total_earned': len(earned),
+            'total_available': len(ACHIEVEMENTS)
+        }
+    
     @staticmethod
     def update_streak(user: User, db: Session) -> dict:
         """Update user streak and check for milestone achievements."""
@@ -71,8 +116,6 @@ class GamificationService:
             user.current_streak = 1
             user.last_activity_date = today
             db.add(user)
-            db.commit()
-            db.refresh(user)
             
             return {
                 'streak_updated': True,
@@ -96,7 +139,6 @@ class GamificationService:
             user.longest_streak = user.current_streak
         
         db.add(user)
-        db.commit()
         
         return {
             'streak_updated': True,
@@ -110,31 +152,26 @@ class GamificationService:
         """Check and award streak-based achievements."""
         achievements = []
         streak_milestones = [(3, 'streak_3'), (7, 'streak_7'), (30, 'streak_30')]
+        reached = [achievement_type for milestone, achievement_type in streak_milestones if user.current_streak == milestone]
+        earned = GamificationService.earned_types(user, reached, db)
         
-        for milestone, achievement_type in streak_milestones:
-            if user.current_streak == milestone:
-                existing = db.exec(select(Achievement).where(
-                    Achievement.user_id == user.id,
-                    Achievement.achievement_type == achievement_type
-                )).first()
-                
-                if not existing:
-                    achievement_xp = ACHIEVEMENTS[achievement_type]['xp']
-                    achievement = Achievement(
-                        user_id=user.id,
-                        achievement_type=achievement_type,
-                        xp_earned=achievement_xp
-                    )
-                    db.add(achievement)
-                    user.total_xp += achievement_xp
-                    db.add(user)
-                    db.commit()
-                    achievements.append({
-                        'type': achievement_type,
-                        'name': ACHIEVEMENTS[achievement_type]['name'],
-                        'icon': ACHIEVEMENTS[achievement_type]['icon'],
-                        'xp': achievement_xp
-                    })
+        for achievement_type in reached:
+            if achievement_type not in earned:
+                achievement_xp = ACHIEVEMENTS[achievement_type]['xp']
+                achievement = Achievement(
+                    user_id=user.id,
+                    achievement_type=achievement_type,
+                    xp_earned=achievement_xp
+                )
+                db.add(achievement)
+                user.total_xp += achievement_xp
+                db.add(user)
+                achievements.append({
+                    'type': achievement_type,
+                    'name': ACHIEVEMENTS[achievement_type]['name'],
+                    'icon': ACHIEVEMENTS[achievement_type]['icon'],
+                    'xp': achievement_xp
+                })
         
         return achievements
     
@@ -155,14 +192,14 @@ class GamificationService:
         elif score >= 70:
             xp_earned += 10
         
+        # Candidate achievements for this test, checked against earned ones in one query
+        test_milestones = [(1, 'first_test'), (5, 'tests_5'), (25, 'tests_25'), (100, 'tests_100')]
+        reached = [achievement_type for milestone, achievement_type in test_milestones if test_count == milestone]
+        earned = GamificationService.earned_types(user, reached + (['perfect_score'] if score == 100 else []), db)
+        
         # Perfect score achievement
         if score == 100:
-            existing = db.exec(select(Achievement).where(
-                Achievement.user_id == user.id,
-                Achievement.achievement_type == 'perfect_score'
-            )).first()
-            
-            if not existing:
+            if 'perfect_score' not in earned:
                 achievement_xp = ACHIEVEMENTS['perfect_score']['xp']
                 achievement = Achievement(
                     user_id=user.id,
@@ -179,33 +216,25 @@ class GamificationService:
                 })
         
         # Test count achievements
-        test_milestones = [(1, 'first_test'), (5, 'tests_5'), (25, 'tests_25'), (100, 'tests_100')]
-        for milestone, achievement_type in test_milestones:
-            if test_count == milestone:
-                existing = db.exec(select(Achievement).where(
-                    Achievement.user_id == user.id,
-                    Achievement.achievement_type == achievement_type
-                )).first()
-                
-                if not existing:
-                    achievement_xp = ACHIEVEMENTS[achievement_type]['xp']
-                    achievement = Achievement(
-                        user_id=user.id,
-                        achievement_type=achievement_type,
-                        xp_earned=achievement_xp
-                    )
-                    db.add(achievement)
-                    xp_earned += achievement_xp
-                    achievements.append({
-                        'type': achievement_type,
-                        'name': ACHIEVEMENTS[achievement_type]['name'],
-                        'icon': ACHIEVEMENTS[achievement_type]['icon'],
-                        'xp': achievement_xp
-                    })
+        for achievement_type in reached:
+            if achievement_type not in earned:
+                achievement_xp = ACHIEVEMENTS[achievement_type]['xp']
+                achievement = Achievement(
+                    user_id=user.id,
+                    achievement_type=achievement_type,
+                    xp_earned=achievement_xp
+                )
+                db.add(achievement)
+                xp_earned += achievement_xp
+                achievements.append({
+                    'type': achievement_type,
+                    'name': ACHIEVEMENTS[achievement_type]['name'],
+                    'icon': ACHIEVEMENTS[achievement_type]['icon'],
+                    'xp': achievement_xp
+                })
         
         user.total_xp += xp_earned
         db.add(user)
-        db.commit()
         
         return {
             'xp_earned': xp_earned,
@@ -0,0 +1,222 @@
+from sqlmodel import Session, select, func
+from sqlalchemy import Boolean, Date, DateTime, Float, Integer, JSON, Numeric, tuple_
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence
+from datetime import datetime, timedelta
+import json
+import logging
+import os
+import uuid
+from app.models.marketplace import PartnerProduct, UserListing, ListingInquiry, PartnerLead
+from app.models.onboarding_profile import OnboardingProfile
+from app.models.test_record import TestRecord
+from app.models.user import User, Achievement
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional: only needed by the offline export command
+    pa = pq = None
+
+logger = logging.getLogger(__name__)
+
+WATERMARK_FILE = "_watermarks.json"
+NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+# Rows younger than this are left for the next run: ids and timestamps are assigned before
+# commit, so a row can become visible after rows with a later id or timestamp were exported
+SAFETY_LAG = timedelta(minutes=10)
+
+
+class ExportTable(NamedTuple):
+    """
+    How one table is exported.
+
+    Append-only tables are exported by ``id``; tables whose rows change are exported by
+    ``(updated_at, id)`` so updated rows are exported again (keep the latest per id).
+    ``exclude`` lists columns that never leave the database (credentials and PII).
+    """
+    name: str
+    model: type
+    date_column: str = "created_at"
+    state_column: Optional[str] = None
+    updated_column: Optional[str] = None
+    exclude: Sequence[str] = ()
+
+
+EXPORT_TABLES = [
+    ExportTable("test_records", TestRecord, state_column="state_code"),
+    ExportTable(
+        "user", User, state_column="state", updated_column="updated_at",
+        # Analysts join on id; credentials and personal data stay in the database
+        exclude=(
+            "hashed_password", "verification_token", "verification_token_expires", "oauth_provider_id",
+            "email", "first_name", "last_name", "phone_number", "date_of_birth", "license_number", "avatar_url",
+        ),
+    ),
+    ExportTable("achievement", Achievement, date_column="earned_at"),
+    ExportTable("onboarding_profiles", OnboardingProfile, state_column="state", updated_column="updated_at"),
+    ExportTable("partner_product", PartnerProduct, updated_column="updated_at"),
+    ExportTable("user_listing", UserListing, state_column="location_state", updated_column="updated_at"),
+    ExportTable("listing_inquiry", ListingInquiry, updated_column="updated_at", exclude=("message", "contact_info")),
+    ExportTable("partner_lead", PartnerLead),
+]
+
+
+def _arrow_type(column):
+    column_type = column.type
+    if isinstance(column_type, Boolean):
+        return pa.bool_()
+    if isinstance(column_type, Integer):
+        return pa.int64()
+    if isinstance(column_type, Float):
+        return pa.float64()
+    if isinstance(column_type, Numeric):
+        return pa.decimal128(column_type.precision or 18, column_type.scale or 2)
+    if isinstance(column_type, DateTime):
+        return pa.timestamp("us")
+    if isinstance(column_type, Date):
+        return pa.date32()
+    # Text, JSON and the compact/compressed column types are exported as strings
+    return pa.string()
+
+
+def _arrow_value(column, value):
+    if value is not None and isinstance(column.type, JSON):
+        return json.dumps(value)
+    return value
+
+
+class AnalyticsExportService:
+    """Incremental, bounded-memory export of application tables to partitioned Parquet"""
+
+    @staticmethod
+    def load_watermarks(output_dir: Path) -> Dict[str, dict]:
+        path = output_dir / WATERMARK_FILE
+        return json.loads(path.read_text()) if path.exists() else {}
+
+    @staticmethod
+    def save_watermarks(output_dir: Path, watermarks: Dict[str, dict]) -> None:
+        """Write atomically so an interrupted run never leaves a corrupt watermark file"""
+        path = output_dir / WATERMARK_FILE
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(watermarks, indent=2, sort_keys=True))
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _write_chunk(spec: ExportTable, columns: list, rows: list, output_dir: Path, run_id: str, chunk: int) -> None:
+        """
+        Write one chunk as one file per partition: ``date=YYYY-MM-DD`` of the date column,
+        then (Hive style, so the column is restored from the path) ``<state column>=XX``.
+        """
+        names = [column.name for column in columns]
+        date_index = names.index(spec.date_column)
+        state_index = names.index(spec.state_column) if spec.state_column else None
+        file_columns = [(i, column) for i, column in enumerate(columns) if i != state_index]
+        schema = pa.schema([pa.field(column.name, _arrow_type(column)) for _, column in file_columns])
+
+        partitions: Dict[tuple, List[list]] = {}
+        for row in rows:
+            moment = row[date_index]
+            key = (
+                moment.date().isoformat() if isinstance(moment, datetime) else str(moment),
+                (row[state_index] or NULL_PARTITION) if state_index is not None else None,
+            )
+            partitions.setdefault(key, []).append(row)
+
+        for (day, state), partition_rows in partitions.items():
+            directory = output_dir / spec.name / f"date={day}"
+            if state is not None:
+                directory = directory / f"{spec.state_column}={state}"
+            directory.mkdir(parents=True, exist_ok=True)
+            arrays = [
+                pa.array([_arrow_value(column, row[i]) for row in partition_rows], type=_arrow_type(column))
+                for i, column in file_columns
+            ]
+            pq.write_table(
+                pa.Table.from_arrays(arrays, schema=schema),
+                directory / f"part-{run_id}-{chunk:05d}.parquet",
+                compression="zstd",
+            )
+
+    @staticmethod
+    def export_table(
+        spec: ExportTable,
+        db: Session,
+        output_dir: Path,
+        watermarks: Dict[str, dict],
+        chunk_size: int = 10000,
+        now: Optional[datetime] = None
+    ) -> int:
+        """
+        Export rows added (or updated) since the table's watermark in keyset-paginated
+        chunks, advancing the watermark after every chunk. The export stops short of rows
+        newer than ``SAFETY_LAG``, so a row whose transaction was still open when a higher
+        id (or later timestamp) became visible is not skipped; the next run picks up the
+        rest.
+        """
+        table = spec.model.__table__
+        columns = [column for column in table.columns if column.name not in spec.exclude]
+        mark = watermarks.get(spec.name, {})
+        run_id = uuid.uuid4().hex[:8]
+        cutoff = (now or datetime.utcnow()) - SAFETY_LAG
+
+        if spec.updated_column:
+            updated = table.c[spec.updated_column]
+            key = tuple_(updated, table.c.id)
+            statement = select(*columns).where(updated <= cutoff).order_by(updated, table.c.id)
+        else:
+            # Stop below the first recent id so the watermark never passes a row still in flight
+            first_recent = db.exec(select(func.min(table.c.id)).where(table.c[spec.date_column] > cutoff)).one()
+            statement = select(*columns).order_by(table.c.id)
+            if first_recent is not None:
+                statement = statement.where(table.c.id < first_recent)
+
+        exported = 0
+        chunk = 0
+        while True:
+            page = statement
+            if spec.updated_column and mark:
+                page = page.where(key > tuple_(datetime.fromisoformat(mark["updated_at"]), mark["id"]))
+            elif mark:
+                page = page.where(table.c.id > mark["id"])
+            rows = db.exec(page.limit(chunk_size)).all()
+            # End the read transaction per chunk rather than holding one snapshot for the whole table
+            db.commit()
+            if not rows:
+                break
+
+            AnalyticsExportService._write_chunk(spec, columns, rows, output_dir, run_id, chunk)
+            last = rows[-1]._mapping
+            mark = {"id": last["id"]}
+            if spec.updated_column:
+                mark["updated_at"] = last[spec.updated_column].isoformat()
+            watermarks[spec.name] = mark
+            AnalyticsExportService.save_watermarks(output_dir, watermarks)
+
+            exported += len(rows)
+            chunk += 1
+            logger.info(f"PARQUET_EXPORT | table={spec.name} | exported={exported} | watermark={mark}")
+        return exported
+
+    @staticmethod
+    def export(
+        db: Session,
+        output_dir: Path,
+        tables: Optional[Sequence[str]] = None,
+        chunk_size: int = 10000,
+        full: bool = False,
+        now: Optional[datetime] = None
+    ) -> Dict[str, int]:
+        """Export the selected tables (all by default); ``full`` ignores existing watermarks"""
+        if pa is None:
+            raise RuntimeError("pyarrow is required for Parquet export: pip install pyarrow")
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        watermarks = {} if full else AnalyticsExportService.load_watermarks(output_dir)
+
+        counts = {}
+        for spec in EXPORT_TABLES:
+            if tables and spec.name not in tables:
+                continue
+            counts[spec.name] = AnalyticsExportService.export_table(spec, db, output_dir, watermarks, chunk_size, now)
+        return counts
@@ -0,0 +1,148 @@
+from sqlmodel import Session, select, func, delete
+from sqlalchemy import tuple_
+from typing import Dict, Iterator, List, Optional, Tuple
+from datetime import datetime, timedelta
+import logging
+import math
+from app.models.score_distribution import ScoreDistribution
+from app.models.test_record import TestRecord
+
+logger = logging.getLogger(__name__)
+
+ALL_CATEGORIES = "*"
+MAX_SCORE = 100
+QUANTILES = {"p10": 0.10, "p25": 0.25, "p50": 0.50, "p75": 0.75, "p90": 0.90}
+# Records younger than this wait for the next refresh: ids are assigned before commit, so a
+# record can become visible after a higher id was already folded in
+SAFETY_LAG = timedelta(minutes=10)
+
+Key = Tuple[str, str, str]
+
+
+class PercentileService:
+    """Score distributions per state/test type/category for "how do I compare" benchmarks"""
+
+    @staticmethod
+    def quantile(counts: List[int], q: float) -> int:
+        """Smallest score with at least ``q`` of the tests at or below it (nearest rank)"""
+        total = sum(counts)
+        if not total:
+            return 0
+        rank = max(1, math.ceil(q * total))
+        cumulative = 0
+        for score, count in enumerate(counts):
+            cumulative += count
+            if cumulative >= rank:
+                return score
+        return len(counts) - 1
+
+    @staticmethod
+    def percentile_rank(counts: List[int], score: int) -> float:
+        """Percent of tests scoring below ``score``, counting ties as half (0-100)"""
+        total = sum(counts)
+        if not total:
+            return 0.0
+        score = min(max(score, 0), len(counts) - 1)
+        below = sum(counts[:score])
+        return round((below + counts[score] / 2) / total * 100, 1)
+
+    @staticmethod
+    def get(db: Session, state_code: str, test_type: str, category: Optional[str] = None) -> Optional[ScoreDistribution]:
+        """Single lookup on the (state_code, test_type, category) unique index"""
+        return db.exec(select(ScoreDistribution).where(
+            ScoreDistribution.state_code == state_code,
+            ScoreDistribution.test_type == test_type,
+            ScoreDistribution.category == (category or ALL_CATEGORIES)
+        )).first()
+
+    @staticmethod
+    def _merge(db: Session, added: Dict[Key, List[int]], last_record_id: int, rows: Optional[Dict[Key, ScoreDistribution]] = None) -> None:
+        """
+        Add histogram counts to the stored rows for these keys (or to ``rows``, e.g. empty
+        for a rebuild) and recompute quantiles
+        """
+        if rows is None:
+            rows = {
+                (row.state_code, row.test_type, row.category): row
+                for row in db.exec(select(ScoreDistribution).where(
+                    tuple_(ScoreDistribution.state_code, ScoreDistribution.test_type, ScoreDistribution.category).in_(list(added))
+                )).all()
+            }
+        now = datetime.utcnow()
+        for key, counts in added.items():
+            row = rows.get(key)
+            if row is None:
+                row = ScoreDistribution(state_code=key[0], test_type=key[1], category=key[2], counts=[0] * (MAX_SCORE + 1))
+            # Assign a new list so the JSON column is flagged as changed
+            row.counts = [old + new for old, new in zip(row.counts, counts)]
+            row.total_tests = sum(row.counts)
+            for name, q in QUANTILES.items():
+                setattr(row, name, PercentileService.quantile(row.counts, q))
+            row.last_record_id = last_record_id
+            row.updated_at = now
+            db.add(row)
+
+    @staticmethod
+    def _histograms(db: Session, last_id: int, max_id: int, chunk_size: int) -> Iterator[Tuple[Dict[Key, List[int]], int, int]]:
+        """(added counts, last id, records) per keyset-paginated chunk of records in (last_id, max_id]"""
+        while last_id < max_id:
+            records = db.exec(
+                select(TestRecord.id, TestRecord.state_code, TestRecord.test_type, TestRecord.category, TestRecord.score)
+                .where(TestRecord.id > last_id, TestRecord.id <= max_id)
+                .order_by(TestRecord.id)
+                .limit(chunk_size)
+            ).all()
+            if not records:
+                return
+
+            added: Dict[Key, List[int]] = {}
+            for record_id, state_code, test_type, category, score in records:
+                score = min(max(score, 0), MAX_SCORE)
+                for key in ((state_code, test_type, category), (state_code, test_type, ALL_CATEGORIES)):
+                    added.setdefault(key, [0] * (MAX_SCORE + 1))[score] += 1
+            last_id = records[-1][0]
+            yield added, last_id, len(records)
+
+    @staticmethod
+    def refresh(db: Session, chunk_size: int = 10000, full: bool = False, now: Optional[datetime] = None) -> int:
+        """
+        Fold test records added since the last refresh into the distributions, in
+        keyset-paginated chunks committed separately. Records newer than ``SAFETY_LAG``
+        are left for the next refresh, so one still being committed is never skipped.
+
+        ``full`` rebuilds from scratch: the histograms (101 counts per key) are summed in
+        memory and replace the stored rows in one transaction, so readers see the old
+        distributions until the new ones are complete. Returns the number of test records
+        processed.
+        """
+        cutoff = (now or datetime.utcnow()) - SAFETY_LAG
+        last_id = 0 if full else db.exec(select(func.max(ScoreDistribution.last_record_id))).one() or 0
+        first_recent = db.exec(
+            select(func.min(TestRecord.id)).where(TestRecord.id > last_id, TestRecord.created_at > cutoff)
+        ).one()
+        max_id = first_recent - 1 if first_recent is not None else db.exec(select(func.max(TestRecord.id))).one() or 0
+        db.commit()
+
+        processed = 0
+        totals: Dict[Key, List[int]] = {}
+        for added, last_id, count in PercentileService._histograms(db, last_id, max_id, chunk_size):
+            processed += count
+            if full:
+                for key, counts in added.items():
+                    total = totals.setdefault(key, [0] * (MAX_SCORE + 1))
+                    for score, n in enumerate(counts):
+                        total[score] += n
+                # Nothing written yet: end the read transaction per chunk
+                db.commit()
+            else:
+                PercentileService._merge(db, added, last_id)
+                db.commit()
+                db.expunge_all()
+            logger.info(f"PERCENTILE_REFRESH | processed={processed} | last_id={last_id} | full={full}")
+
+        if full:
+            db.execute(delete(ScoreDistribution))
+            PercentileService._merge(db, totals, last_id, rows={})
+            db.commit()
+            db.expunge_all()
+        return processed
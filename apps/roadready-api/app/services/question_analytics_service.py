@@ -0,0 +1,223 @@
+from sqlmodel import Session, select, func, delete
+from sqlalchemy import Integer, cast, insert
+from typing import List, Optional
+import json
+import logging
+from app.models.question_attempt import QuestionAttempt
+from app.models.test_record import TestRecord
+from app.models.user import User
+from app.schemas.test_statistics import QuestionDifficulty, CategoryMissRate
+
+logger = logging.getLogger(__name__)
+
+
+def _load_list(payload: Optional[str]) -> list:
+    """Parse a JSON list column, treating malformed or non-list payloads as empty"""
+    if not payload:
+        return []
+    try:
+        value = json.loads(payload)
+    except (TypeError, ValueError):
+        return []
+    return value if isinstance(value, list) else []
+
+
+class QuestionAnalyticsService:
+    """Normalizes per-question results out of test records and answers question-level analytics"""
+
+    @staticmethod
+    def extract_attempts(test_record: TestRecord) -> List[QuestionAttempt]:
+        """Parse a test record's questions/user_answers/is_correct JSON into attempt rows"""
+        questions = _load_list(test_record.questions)
+        user_answers = _load_list(test_record.user_answers)
+        is_correct = _load_list(test_record.is_correct)
+
+        attempts = []
+        for index, question in enumerate(questions):
+            if isinstance(question, dict):
+                question_id = question.get("id", question.get("question_id"))
+                category = question.get("category") or test_record.category
+                correct_answer = question.get("correctAnswer", question.get("correct_answer"))
+            else:
+                question_id, category, correct_answer = question, test_record.category, None
+            if question_id is None or question_id == "":
+                continue
+
+            answer = user_answers[index] if index < len(user_answers) else None
+            if not isinstance(answer, int) or isinstance(answer, bool):
+                answer = None
+
+            if index < len(is_correct):
+                correct = bool(is_correct[index])
+            else:
+                correct = answer is not None and answer == correct_answer
+
+            attempts.append(QuestionAttempt(
+                test_record_id=test_record.id,
+                user_id=test_record.user_id,
+                question_id=str(question_id)[:64],
+                state_code=test_record.state_code,
+                test_type=test_record.test_type,
+                category=str(category)[:50],
+                is_correct=correct,
+                user_answer=answer,
+                attempted_at=test_record.completed_at or test_record.created_at,
+            ))
+        return attempts
+
+    @staticmethod
+    def record_attempts(test_record: TestRecord, db: Session) -> List[QuestionAttempt]:
+        """
+        Ingest a newly inserted (flushed) test record; returns the attempts written.
+
+        Written with one executemany INSERT; the returned rows are not added to the
+        session (their ids aren't needed, and fetching them costs a statement per row).
+        """
+        attempts = QuestionAnalyticsService.extract_attempts(test_record)
+        if attempts:
+            db.execute(insert(QuestionAttempt), [attempt.model_dump(exclude={"id"}) for attempt in attempts])
+        return attempts
+
+    @staticmethod
+    def backfill(db: Session, chunk_size: int = 500, reset: bool = True) -> int:
+        """
+        Extract attempts from historical test records.
+
+        Like ``ActivityService.backfill``: with ``reset`` the attempts are rebuilt
+        ``chunk_size`` users at a time, each user's attempts replaced in the transaction that
+        reads their records, so question analytics never see them missing. Without it,
+        records that existed when the job started are extracted on top of the existing rows
+        in keyset-paginated chunks of ``chunk_size`` records (records newer than the job
+        start are ingested at insert time). Returns the number of test records processed.
+        """
+        if reset:
+            return QuestionAnalyticsService._rebuild_users(db, chunk_size)
+
+        max_id = db.exec(select(func.max(TestRecord.id))).one()
+        db.commit()
+        if max_id is None:
+            return 0
+
+        processed = 0
+        last_id = 0
+        while last_id < max_id:
+            records = db.exec(
+                select(TestRecord)
+                .where(TestRecord.id > last_id, TestRecord.id <= max_id)
+                .order_by(TestRecord.id)
+                .limit(chunk_size)
+            ).all()
+            if not records:
+                break
+
+            last_id = records[-1].id
+            QuestionAnalyticsService._insert_attempts(db, records)
+            db.commit()
+            db.expunge_all()
+
+            processed += len(records)
+            logger.info(f"QUESTION_ATTEMPTS_BACKFILL | processed={processed} | last_id={last_id}")
+
+        return processed
+
+    @staticmethod
+    def _rebuild_users(db: Session, chunk_size: int) -> int:
+        processed = 0
+        last_user_id = 0
+        while True:
+            user_ids = db.exec(
+                select(User.id).where(User.id > last_user_id).order_by(User.id).limit(chunk_size)
+            ).all()
+            if not user_ids:
+                break
+
+            records = db.exec(select(TestRecord).where(TestRecord.user_id.in_(user_ids))).all()
+            db.execute(delete(QuestionAttempt).where(QuestionAttempt.user_id.in_(user_ids)))
+            QuestionAnalyticsService._insert_attempts(db, records)
+            db.commit()
+            db.expunge_all()
+
+            last_user_id = user_ids[-1]
+            processed += len(records)
+            logger.info(f"QUESTION_ATTEMPTS_BACKFILL | processed={processed} | last_user_id={last_user_id}")
+
+        return processed
+
+    @staticmethod
+    def _insert_attempts(db: Session, records: List[TestRecord]) -> None:
+        """Extract and insert the attempts of ``records`` with one executemany INSERT"""
+        rows = [
+            attempt.model_dump(exclude={"id"})
+            for record in records
+            for attempt in QuestionAnalyticsService.extract_attempts(record)
+        ]
+        if rows:
+            db.execute(insert(QuestionAttempt), rows)
+
+    @staticmethod
+    def hardest_questions(
+        db: Session,
+        state_code: str,
+        test_type: Optional[str] = None,
+        category: Optional[str] = None,
+        min_attempts: int = 5,
+        limit: int = 20
+    ) -> List[QuestionDifficulty]:
+        """Questions with the highest miss rate in a state (uses the state/question index)"""
+        attempts = func.count(QuestionAttempt.id)
+        misses = attempts - func.sum(cast(QuestionAttempt.is_correct, Integer))
+        miss_rate = (misses * 1.0) / attempts
+
+        statement = select(
+            QuestionAttempt.question_id,
+            func.max(QuestionAttempt.category),
+            attempts,
+            miss_rate
+        ).where(QuestionAttempt.state_code == state_code)
+        if test_type:
+            statement = statement.where(QuestionAttempt.test_type == test_type)
+        if category:
+            statement = statement.where(QuestionAttempt.category == category)
+        statement = (
+            statement.group_by(QuestionAttempt.question_id)
+            .having(attempts >= min_attempts)
+            .order_by(miss_rate.desc(), attempts.desc())
+            .limit(limit)
+        )
+
+        return [
+            QuestionDifficulty(
+                question_id=question_id,
+                category=category_name,
+                attempts=count,
+                miss_rate=round(float(rate), 4)
+            )
+            for question_id, category_name, count, rate in db.exec(statement).all()
+        ]
+
+    @staticmethod
+    def category_miss_rates(
+        db: Session,
+        state_code: str,
+        test_type: Optional[str] = None
+    ) -> List[CategoryMissRate]:
+        """Per-category miss rate in a state (uses the state/category index)"""
+        attempts = func.count(QuestionAttempt.id)
+        misses = attempts - func.sum(cast(QuestionAttempt.is_correct, Integer))
+
+        statement = select(QuestionAttempt.category, attempts, misses).where(
+            QuestionAttempt.state_code == state_code
+        )
+        if test_type:
+            statement = statement.where(QuestionAttempt.test_type == test_type)
+        statement = statement.group_by(QuestionAttempt.category)
+
+        results = [
+            CategoryMissRate(
+                category=category,
+                attempts=count,
+                miss_rate=round(missed / count, 4) if count else 0.0
+            )
+            for category, count, missed in db.exec(statement).all()
+        ]
+        return sorted(results, key=lambda r: r.miss_rate, reverse=True)
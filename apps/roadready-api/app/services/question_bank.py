@@ -0,0 +1,183 @@
+from sqlmodel import Session, select
+from types import MappingProxyType
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from datetime import datetime
+import hashlib
+import json
+import logging
+import random
+from app.models.question import Question
+
+logger = logging.getLogger(__name__)
+
+
+class BankQuestion(NamedTuple):
+    """Immutable in-memory copy of an active question"""
+    question_id: str
+    state_code: str
+    test_type: str
+    category: str
+    prompt: str
+    options: Tuple[str, ...]
+    correct_answer: int
+    explanation: Optional[str]
+    image_url: Optional[str]
+    version: int
+
+    def to_client(self) -> dict:
+        """Serialize in the shape the mobile client uses for questions"""
+        return {
+            "id": self.question_id,
+            "stateCode": self.state_code,
+            "testType": self.test_type,
+            "category": self.category,
+            "question": self.prompt,
+            "options": list(self.options),
+            "correctAnswer": self.correct_answer,
+            "explanation": self.explanation,
+            "imageUrl": self.image_url,
+        }
+
+
+def _etag(questions: Iterable[BankQuestion]) -> str:
+    digest = hashlib.sha1()
+    for question in sorted(questions, key=lambda q: (q.state_code, q.question_id)):
+        digest.update(f"{question.state_code}:{question.question_id}:{question.version};".encode())
+    return f'"{digest.hexdigest()[:16]}"'
+
+
+class QuestionBank:
+    """
+    Read-only index of the question catalog.
+
+    Built once from the ``questions`` table and never mutated; reloading builds a new
+    instance and swaps the module-level reference, so readers need no locking.
+    """
+
+    def __init__(self, questions: Iterable[BankQuestion] = ()):
+        by_id: Dict[Tuple[str, str], BankQuestion] = {}
+        by_category: Dict[Tuple[str, str, str], List[BankQuestion]] = {}
+        by_test: Dict[Tuple[str, str], List[BankQuestion]] = {}
+        for question in questions:
+            by_id[(question.state_code, question.question_id)] = question
+            by_category.setdefault((question.state_code, question.test_type, question.category), []).append(question)
+            by_test.setdefault((question.state_code, question.test_type), []).append(question)
+
+        self._by_id = MappingProxyType(by_id)
+        self._by_category = MappingProxyType({key: tuple(qs) for key, qs in by_category.items()})
+        self._by_test = MappingProxyType({key: tuple(qs) for key, qs in by_test.items()})
+        self._etags = MappingProxyType({key: _etag(qs) for key, qs in by_test.items()})
+        # Pre-serialized bank slices: downloading a full bank costs no per-request encoding
+        self._payloads = MappingProxyType({
+            key: json.dumps({
+                "state": key[0],
+                "test_type": key[1],
+                "version": self._etags[key],
+                "questions": [q.to_client() for q in qs],
+            }).encode()
+            for key, qs in self._by_test.items()
+        })
+        self.version = _etag(by_id.values())
+        self.loaded_at = datetime.utcnow()
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def get(self, state_code: str, question_id: str) -> Optional[BankQuestion]:
+        return self._by_id.get((state_code, question_id))
+
+    def questions(self, state_code: str, test_type: str, category: Optional[str] = None) -> Tuple[BankQuestion, ...]:
+        if category:
+            return self._by_category.get((state_code, test_type, category), ())
+        return self._by_test.get((state_code, test_type), ())
+
+    def categories(self, state_code: str, test_type: str) -> List[str]:
+        return sorted({q.category for q in self.questions(state_code, test_type)})
+
+    def sample(
+        self,
+        state_code: str,
+        test_type: str,
+        category: Optional[str] = None,
+        n: int = 20,
+        rng: Optional[random.Random] = None
+    ) -> List[BankQuestion]:
+        """Random test of up to ``n`` distinct questions"""
+        pool = self.questions(state_code, test_type, category)
+        return (rng or random).sample(pool, min(n, len(pool)))
+
+    def etag(self, state_code: str, test_type: str) -> Optional[str]:
+        return self._etags.get((state_code, test_type))
+
+    def payload(self, state_code: str, test_type: str) -> Optional[bytes]:
+        return self._payloads.get((state_code, test_type))
+
+
+_bank = QuestionBank()
+
+
+def get_question_bank() -> QuestionBank:
+    """Current in-memory question bank"""
+    return _bank
+
+
+def load_question_bank(db: Session) -> QuestionBank:
+    """Build a fresh bank from active questions and make it current"""
+    global _bank
+    rows = db.exec(select(Question).where(Question.is_active == True)).all()
+    _bank = QuestionBank(
+        BankQuestion(
+            question_id=row.question_id,
+            state_code=row.state_code,
+            test_type=row.test_type,
+            category=row.category,
+            prompt=row.prompt,
+            options=tuple(row.options or ()),
+            correct_answer=row.correct_answer,
+            explanation=row.explanation,
+            image_url=row.image_url,
+            version=row.version,
+        )
+        for row in rows
+    )
+    logger.info(f"QUESTION_BANK_LOADED | questions={len(_bank)} | version={_bank.version}")
+    return _bank
+
+
+def import_questions(items: Iterable[dict], db: Session) -> Dict[str, int]:
+    """
+    Upsert questions given in the client shape (id, stateCode, testType, category,
+    question, options, correctAnswer, explanation, imageUrl). Content changes bump
+    the question's version. Does not commit.
+    """
+    counts = {"created": 0, "updated": 0, "unchanged": 0}
+    for item in items:
+        state_code = item["stateCode"].upper()
+        fields = {
+            "test_type": (item.get("testType") or "car").lower(),
+            "category": item["category"],
+            "prompt": item["question"],
+            "options": list(item["options"]),
+            "correct_answer": int(item["correctAnswer"]),
+            "explanation": item.get("explanation"),
+            "image_url": item.get("imageUrl"),
+            "is_active": item.get("isActive", True),
+        }
+        existing = db.exec(select(Question).where(
+            Question.state_code == state_code,
+            Question.question_id == item["id"]
+        )).first()
+
+        if not existing:
+            db.add(Question(question_id=item["id"], state_code=state_code, **fields))
+            counts["created"] += 1
+        elif any(getattr(existing, key) != value for key, value in fields.items()):
+            for key, value in fields.items():
+                setattr(existing, key, value)
+            existing.version += 1
+            existing.updated_at = datetime.utcnow()
+            db.add(existing)
+            counts["updated"] += 1
+        else:
+            counts["unchanged"] += 1
+    return counts
@@ -0,0 +1,217 @@
+from sqlmodel import Session, select, delete
+from typing import Dict, List, Optional, Sequence, Tuple
+from datetime import datetime
+import heapq
+import logging
+import math
+from app.core.database import insert_for
+from app.models.question_attempt import QuestionAttempt
+from app.models.rating import QuestionRating, UserSkillRating
+from app.models.user import User
+from app.schemas.test_statistics import QuestionRecommendation
+
+logger = logging.getLogger(__name__)
+
+# Elo-style step sizes on the logit scale: large while a rating is new, shrinking with evidence
+BASE_K = 0.4
+MIN_K = 0.05
+K_DECAY_ATTEMPTS = 20
+
+
+def _sigmoid(x: float) -> float:
+    return 1.0 / (1.0 + math.exp(-x))
+
+
+def _step(attempts: int) -> float:
+    return max(MIN_K, BASE_K / (1 + attempts / K_DECAY_ATTEMPTS))
+
+
+def _locked(statement):
+    # Each update depends on the current rating, so read it under a row lock (in id order,
+    # so concurrent submissions can't deadlock), refreshing rows already in the session
+    return statement.with_for_update().execution_options(populate_existing=True)
+
+
+class RatingService:
+    """Incremental item difficulty / user mastery ratings (Rasch model with Elo updates)"""
+
+    @staticmethod
+    def probability_correct(ability: float, difficulty: float) -> float:
+        """P(correct) for a user of ``ability`` answering a question of ``difficulty``"""
+        return _sigmoid(ability - difficulty)
+
+    @staticmethod
+    def _load_question_ratings(attempts: Sequence[QuestionAttempt], db: Session) -> Dict[Tuple[str, str, str], QuestionRating]:
+        """Fetch (creating if missing) and lock the rating rows for the attempted questions"""
+        table = QuestionRating.__table__
+        new_rows = {}
+        for attempt in attempts:
+            new_rows[(attempt.state_code, attempt.test_type, attempt.question_id)] = {
+                "question_id": attempt.question_id,
+                "state_code": attempt.state_code,
+                "test_type": attempt.test_type,
+                "category": attempt.category,
+                "difficulty": 0.0,
+                "attempts": 0,
+                "updated_at": datetime.utcnow(),
+            }
+        db.execute(
+            insert_for(db, table).on_conflict_do_nothing(
+                index_elements=[table.c.state_code, table.c.test_type, table.c.question_id]
+            ),
+            list(new_rows.values())
+        )
+
+        ratings = {}
+        for state_code, test_type in sorted({key[:2] for key in new_rows}):
+            question_ids = [key[2] for key in new_rows if key[:2] == (state_code, test_type)]
+            for rating in db.exec(_locked(select(QuestionRating).where(
+                QuestionRating.state_code == state_code,
+                QuestionRating.test_type == test_type,
+                QuestionRating.question_id.in_(question_ids)
+            ).order_by(QuestionRating.id))).all():
+                ratings[(rating.state_code, rating.test_type, rating.question_id)] = rating
+        return ratings
+
+    @staticmethod
+    def _load_skills(user_id: int, categories: set, db: Session) -> Dict[str, UserSkillRating]:
+        """Fetch (creating if missing) and lock the user's mastery rows for the given categories"""
+        table = UserSkillRating.__table__
+        db.execute(
+            insert_for(db, table).on_conflict_do_nothing(index_elements=[table.c.user_id, table.c.category]),
+            [
+                {"user_id": user_id, "category": category, "ability": 0.0, "attempts": 0, "updated_at": datetime.utcnow()}
+                for category in categories
+            ]
+        )
+        return {
+            skill.category: skill
+            for skill in db.exec(_locked(select(UserSkillRating).where(
+                UserSkillRating.user_id == user_id,
+                UserSkillRating.category.in_(categories)
+            ).order_by(UserSkillRating.id))).all()
+        }
+
+    @staticmethod
+    def apply_attempts(user_id: int, attempts: Sequence[QuestionAttempt], db: Session) -> None:
+        """
+        Update ratings for one submitted test in O(questions in attempt).
+
+        Uses a constant number of statements (upsert-missing + locking select for questions
+        and for skills) followed by the batched UPDATE flush. The rows stay locked until the
+        caller commits, so concurrent submissions on a popular question update it one after
+        the other instead of overwriting each other's step.
+        """
+        if not attempts:
+            return
+
+        questions = RatingService._load_question_ratings(attempts, db)
+        skills = RatingService._load_skills(user_id, {a.category for a in attempts}, db)
+        now = datetime.utcnow()
+
+        for attempt in attempts:
+            question = questions[(attempt.state_code, attempt.test_type, attempt.question_id)]
+            skill = skills[attempt.category]
+
+            error = (1.0 if attempt.is_correct else 0.0) - RatingService.probability_correct(
+                skill.ability, question.difficulty
+            )
+            skill.ability += _step(skill.attempts) * error
+            question.difficulty -= _step(question.attempts) * error
+            skill.attempts += 1
+            question.attempts += 1
+            skill.updated_at = now
+            question.updated_at = now
+
+        db.add_all(list(questions.values()) + list(skills.values()))
+        db.flush()
+
+    @staticmethod
+    def recommend(
+        user: User,
+        db: Session,
+        n: int = 10,
+        state_code: Optional[str] = None,
+        test_type: Optional[str] = None
+    ) -> List[QuestionRecommendation]:
+        """
+        Rank rated questions by expected benefit to the user's pass probability.
+
+        Benefit is the item information p * (1 - p) - highest for questions the user is
+        about as likely to miss as to get right - weighted by how much of the question
+        pool the question's category represents.
+        """
+        state_code = state_code or user.state
+        test_type = test_type or user.test_type
+        if not state_code:
+            return []
+
+        abilities = {
+            category: ability
+            for category, ability in db.exec(
+                select(UserSkillRating.category, UserSkillRating.ability).where(UserSkillRating.user_id == user.id)
+            ).all()
+        }
+
+        statement = select(QuestionRating.question_id, QuestionRating.category, QuestionRating.difficulty).where(
+            QuestionRating.state_code == state_code
+        )
+        if test_type:
+            statement = statement.where(QuestionRating.test_type == test_type)
+        candidates = db.exec(statement).all()
+        if not candidates:
+            return []
+
+        category_counts: Dict[str, int] = {}
+        for _, category, _ in candidates:
+            category_counts[category] = category_counts.get(category, 0) + 1
+
+        scored = []
+        for question_id, category, difficulty in candidates:
+            p = RatingService.probability_correct(abilities.get(category, 0.0), difficulty)
+            weight = category_counts[category] / len(candidates)
+            scored.append((p * (1 - p) * weight, question_id, category, difficulty, p))
+
+        return [
+            QuestionRecommendation(
+                question_id=question_id,
+                category=category,
+                difficulty=round(difficulty, 4),
+                probability_correct=round(p, 4),
+                score=round(benefit, 6)
+            )
+            for benefit, question_id, category, difficulty, p in heapq.nlargest(n, scored)
+        ]
+
+    @staticmethod
+    def rebuild(db: Session, chunk_size: int = 2000) -> int:
+        """Recompute all ratings by replaying question_attempts in chunks (per-user order preserved)"""
+        db.execute(delete(QuestionRating))
+        db.execute(delete(UserSkillRating))
+        db.commit()
+
+        processed = 0
+        last_id = 0
+        while True:
+            attempts = db.exec(
+                select(QuestionAttempt)
+                .where(QuestionAttempt.id > last_id)
+                .order_by(QuestionAttempt.id)
+                .limit(chunk_size)
+            ).all()
+            if not attempts:
+                break
+            last_id = attempts[-1].id
+
+            by_user: Dict[int, List[QuestionAttempt]] = {}
+            for attempt in attempts:
+                by_user.setdefault(attempt.user_id, []).append(attempt)
+            for user_id, user_attempts in by_user.items():
+                RatingService.apply_attempts(user_id, user_attempts, db)
+            db.commit()
+            db.expunge_all()
+
+            processed += len(attempts)
+            logger.info(f"RATINGS_REBUILD | processed={processed} | last_id={last_id}")
+
+        return processed
@@ -0,0 +1,198 @@
+from sqlmodel import Session, select, delete, func
+from typing import Dict, Optional, Tuple
+from datetime import datetime, timedelta
+import logging
+from app.core.database import insert_for
+from app.models.readiness import ReadinessScore
+from app.models.test_record import TestRecord
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+PASSING_SCORE = 70
+# A test taken HALF_LIFE_DAYS before the latest one counts half as much
+HALF_LIFE_DAYS = 14.0
+# Beta prior on the pass rate: with no recent evidence the estimate is 50%
+PRIOR_PASSES = 1.0
+PRIOR_FAILS = 1.0
+
+
+def _decay(elapsed: timedelta) -> float:
+    return 0.5 ** (max(elapsed.total_seconds(), 0.0) / (HALF_LIFE_DAYS * 86400))
+
+
+class ReadinessService:
+    """Incrementally maintained readiness score and pass probability per user and state/test type"""
+
+    @staticmethod
+    def readiness_score(average_score: float, pass_rate: float, total_tests: int) -> int:
+        """0-100 score from volume, average and pass rate (same weights as the mobile client)"""
+        if total_tests <= 0:
+            return 0
+        volume = min(total_tests / 5, 1) * 25
+        average = (average_score / 100) * 45
+        passing = (pass_rate / 100) * 30
+        return round(min(100, average + passing + volume))
+
+    @staticmethod
+    def pass_probability(row: ReadinessScore, as_of: Optional[datetime] = None) -> float:
+        """
+        Posterior mean of the recent pass rate: decayed passes and fails on top of the
+        Beta prior, so a few lucky tests don't read as certainty. With ``as_of`` the
+        evidence is aged to that moment, so the estimate drifts back towards the prior
+        while the user takes no tests (0.5 with no tests at all).
+        """
+        factor = _decay(as_of - row.last_test_at) if as_of and row.last_test_at else 1.0
+        return (PRIOR_PASSES + factor * row.weighted_passes) / (PRIOR_PASSES + PRIOR_FAILS + factor * row.weight)
+
+    @staticmethod
+    def apply(row: ReadinessScore, score: int, taken_at: datetime) -> ReadinessScore:
+        """Add one test to ``row`` in place; O(1) regardless of history"""
+        if row.last_test_at is None or taken_at >= row.last_test_at:
+            # Age the existing evidence to the new test, which then has weight 1
+            factor = _decay(taken_at - row.last_test_at) if row.last_test_at else 1.0
+            row.weight *= factor
+            row.weighted_score *= factor
+            row.weighted_passes *= factor
+            row.last_test_at = taken_at
+            weight = 1.0
+        else:
+            # Older than the latest test (backfills): weight it by its age instead
+            weight = _decay(row.last_test_at - taken_at)
+
+        row.total_tests += 1
+        row.weight += weight
+        row.weighted_score += weight * score
+        row.weighted_passes += weight if score >= PASSING_SCORE else 0.0
+
+        average = row.weighted_score / row.weight
+        pass_rate = row.weighted_passes / row.weight * 100
+        row.readiness_score = ReadinessService.readiness_score(average, pass_rate, row.total_tests)
+        row.pass_probability = round(ReadinessService.pass_probability(row), 4)
+        row.updated_at = datetime.utcnow()
+        return row
+
+    @staticmethod
+    def record_test(test_record: TestRecord, db: Session) -> ReadinessScore:
+        """Fold a newly inserted test record into its readiness row (upsert-missing, select, update)"""
+        table = ReadinessScore.__table__
+        db.execute(
+            insert_for(db, table).on_conflict_do_nothing(
+                index_elements=[table.c.user_id, table.c.state_code, table.c.test_type]
+            ),
+            [{
+                "user_id": test_record.user_id,
+                "state_code": test_record.state_code,
+                "test_type": test_record.test_type,
+                "total_tests": 0,
+                "weight": 0.0,
+                "weighted_score": 0.0,
+                "weighted_passes": 0.0,
+                "readiness_score": 0,
+                "pass_probability": PRIOR_PASSES / (PRIOR_PASSES + PRIOR_FAILS),
+                "updated_at": datetime.utcnow(),
+            }]
+        )
+        row = db.exec(select(ReadinessScore).where(
+            ReadinessScore.user_id == test_record.user_id,
+            ReadinessScore.state_code == test_record.state_code,
+            ReadinessScore.test_type == test_record.test_type
+        )).one()
+        ReadinessService.apply(row, test_record.score, test_record.completed_at or test_record.created_at)
+        db.add(row)
+        return row
+
+    @staticmethod
+    def get(user_id: int, state_code: str, test_type: str, db: Session) -> Optional[ReadinessScore]:
+        return db.exec(select(ReadinessScore).where(
+            ReadinessScore.user_id == user_id,
+            ReadinessScore.state_code == state_code,
+            ReadinessScore.test_type == test_type
+        )).first()
+
+    @staticmethod
+    def backfill(db: Session, chunk_size: int = 1000, reset: bool = True) -> int:
+        """
+        Rebuild readiness rows from historical test records.
+
+        Like ``ActivityService.backfill``: with ``reset`` the rows are rebuilt ``chunk_size``
+        users at a time, each user's rows replaced in the transaction that reads their
+        records, so the endpoint never sees them missing. Without it, records that existed
+        when the job started are added on top of the existing rows in keyset-paginated
+        chunks of ``chunk_size`` records. Returns the number of test records processed.
+        """
+        if reset:
+            return ReadinessService._rebuild_users(db, chunk_size)
+
+        max_id = db.exec(select(func.max(TestRecord.id))).one()
+        db.commit()
+        if max_id is None:
+            return 0
+
+        processed = 0
+        last_id = 0
+        while last_id < max_id:
+            records = db.exec(
+                select(TestRecord.id, TestRecord.user_id, TestRecord.state_code, TestRecord.test_type,
+                       TestRecord.score, TestRecord.completed_at, TestRecord.created_at)
+                .where(TestRecord.id > last_id, TestRecord.id <= max_id)
+                .order_by(TestRecord.id)
+                .limit(chunk_size)
+            ).all()
+            if not records:
+                break
+
+            user_ids = {record.user_id for record in records}
+            rows: Dict[Tuple[int, str, str], ReadinessScore] = {
+                (row.user_id, row.state_code, row.test_type): row
+                for row in db.exec(select(ReadinessScore).where(ReadinessScore.user_id.in_(user_ids))).all()
+            }
+            ReadinessService._apply_all(rows, records)
+            db.add_all(list(rows.values()))
+            db.commit()
+            db.expunge_all()
+
+            last_id = records[-1].id
+            processed += len(records)
+            logger.info(f"READINESS_BACKFILL | processed={processed} | last_id={last_id}")
+
+        return processed
+
+    @staticmethod
+    def _rebuild_users(db: Session, chunk_size: int) -> int:
+        processed = 0
+        last_user_id = 0
+        while True:
+            user_ids = db.exec(
+                select(User.id).where(User.id > last_user_id).order_by(User.id).limit(chunk_size)
+            ).all()
+            if not user_ids:
+                break
+
+            records = db.exec(
+                select(TestRecord.id, TestRecord.user_id, TestRecord.state_code, TestRecord.test_type,
+                       TestRecord.score, TestRecord.completed_at, TestRecord.created_at)
+                .where(TestRecord.user_id.in_(user_ids))
+            ).all()
+            db.execute(delete(ReadinessScore).where(ReadinessScore.user_id.in_(user_ids)))
+            rows: Dict[Tuple[int, str, str], ReadinessScore] = {}
+            ReadinessService._apply_all(rows, records)
+            db.add_all(list(rows.values()))
+            db.commit()
+            db.expunge_all()
+
+            last_user_id = user_ids[-1]
+            processed += len(records)
+            logger.info(f"READINESS_BACKFILL | processed={processed} | last_user_id={last_user_id}")
+
+        return processed
+
+    @staticmethod
+    def _apply_all(rows: Dict[Tuple[int, str, str], ReadinessScore], records) -> None:
+        """Apply test record rows to ``rows`` (keyed by user/state/test type), creating missing ones"""
+        for record in records:
+            key = (record.user_id, record.state_code, record.test_type)
+            row = rows.get(key)
+            if row is None:
+                row = rows[key] = ReadinessScore(user_id=key[0], state_code=key[1], test_type=key[2])
+            ReadinessService.apply(row, record.score, record.completed_at or record.created_at)
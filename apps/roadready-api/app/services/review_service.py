@@ -0,0 +1,120 @@
+from sqlmodel import Session, select
+from typing import Dict, List, Optional, Sequence, Tuple
+from datetime import datetime, timedelta
+from app.core.database import insert_for
+from app.models.question_attempt import QuestionAttempt
+from app.models.review_item import ReviewItem
+from app.schemas.review import ReviewItemRead, ReviewQueue
+
+# SM-2 response quality (0-5) derived from the only signal we have per question
+QUALITY_CORRECT = 4
+QUALITY_INCORRECT = 1
+QUALITY_UNANSWERED = 0
+MIN_EASINESS = 1.3
+
+
+class ReviewService:
+    """SM-2 spaced-repetition scheduling of questions per user"""
+
+    @staticmethod
+    def quality_for(attempt: QuestionAttempt) -> int:
+        if attempt.is_correct:
+            return QUALITY_CORRECT
+        return QUALITY_UNANSWERED if attempt.user_answer is None else QUALITY_INCORRECT
+
+    @staticmethod
+    def review(item: ReviewItem, quality: int, reviewed_at: datetime) -> ReviewItem:
+        """Apply one SM-2 review to ``item`` in place"""
+        if quality < 3:
+            if item.repetitions > 0:
+                item.lapses += 1
+            item.repetitions = 0
+            item.interval_days = 1
+        else:
+            if item.repetitions == 0:
+                item.interval_days = 1
+            elif item.repetitions == 1:
+                item.interval_days = 6
+            else:
+                item.interval_days = round(item.interval_days * item.easiness)
+            item.repetitions += 1
+
+        item.easiness = max(
+            MIN_EASINESS,
+            item.easiness + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02)
+        )
+        item.last_reviewed_at = reviewed_at
+        item.due_at = reviewed_at + timedelta(days=item.interval_days)
+        return item
+
+    @staticmethod
+    def schedule_attempts(user_id: int, attempts: Sequence[QuestionAttempt], db: Session) -> None:
+        """Update review items for one submitted test (constant statements, O(questions))"""
+        if not attempts:
+            return
+
+        table = ReviewItem.__table__
+        now = datetime.utcnow()
+        keys = {}
+        for attempt in attempts:
+            keys[(attempt.state_code, attempt.question_id)] = {
+                "user_id": user_id,
+                "question_id": attempt.question_id,
+                "state_code": attempt.state_code,
+                "category": attempt.category,
+                "easiness": 2.5,
+                "interval_days": 0,
+                "repetitions": 0,
+                "lapses": 0,
+                "due_at": now,
+            }
+        db.execute(
+            insert_for(db, table).on_conflict_do_nothing(
+                index_elements=[table.c.user_id, table.c.state_code, table.c.question_id]
+            ),
+            list(keys.values())
+        )
+
+        items: Dict[Tuple[str, str], ReviewItem] = {}
+        for state_code in {key[0] for key in keys}:
+            question_ids = [key[1] for key in keys if key[0] == state_code]
+            for item in db.exec(select(ReviewItem).where(
+                ReviewItem.user_id == user_id,
+                ReviewItem.state_code == state_code,
+                ReviewItem.question_id.in_(question_ids)
+            )).all():
+                items[(item.state_code, item.question_id)] = item
+
+        for attempt in attempts:
+            reviewed_at = attempt.attempted_at or now
+            ReviewService.review(items[(attempt.state_code, attempt.question_id)], ReviewService.quality_for(attempt), reviewed_at)
+
+        db.add_all(list(items.values()))
+        db.flush()
+
+    @staticmethod
+    def review_queue(
+        user_id: int,
+        db: Session,
+        limit: int = 20,
+        state_code: Optional[str] = None,
+        now: Optional[datetime] = None
+    ) -> ReviewQueue:
+        """Due questions, oldest first, via the (user_id, due_at) index"""
+        now = now or datetime.utcnow()
+        statement = select(ReviewItem).where(ReviewItem.user_id == user_id, ReviewItem.due_at <= now)
+        if state_code:
+            statement = statement.where(ReviewItem.state_code == state_code)
+        items = db.exec(statement.order_by(ReviewItem.due_at).limit(limit)).all()
+
+        next_due_at = None
+        if not items:
+            upcoming = select(ReviewItem.due_at).where(ReviewItem.user_id == user_id, ReviewItem.due_at > now)
+            if state_code:
+                upcoming = upcoming.where(ReviewItem.state_code == state_code)
+            next_due_at = db.exec(upcoming.order_by(ReviewItem.due_at).limit(1)).first()
+
+        return ReviewQueue(
+            items=[ReviewItemRead.model_validate(item, from_attributes=True) for item in items],
+            next_due_at=next_due_at
+        )
@@ -1,38 +1,59 @@
 from sqlmodel import Session, select, func
-from typing import List, Dict
-from datetime import datetime, timedelta
+from sqlalchemy import update
+from typing import List, Dict, Optional
+import logging
 from app.models.test_record import TestRecord
 from app.models.onboarding_profile import OnboardingProfile
+from app.models.user import User
+from app.services.activity_service import ActivityService
 from app.schemas.test_statistics import TestStatistics, CategoryPerformance, WeakArea, ProfileStats
 
+logger = logging.getLogger(__name__)
+
 class StatisticsService:
     """Service for calculating test statistics and analytics"""
     
     @staticmethod
-    def calculate_user_statistics(user_id: int, db: Session) -> TestStatistics:
-        """Calculate comprehensive statistics for a user"""
-        
-        # Get all test records for user
-        statement = select(TestRecord).where(TestRecord.user_id == user_id).order_by(TestRecord.created_at)
-        test_records = db.exec(statement).all()
+    def calculate_user_statistics(user_id: int, db: Session, profile_id: Optional[int] = None) -> Optional[TestStatistics]:
+        """
+        Calculate comprehensive statistics for a user, or for one of their onboarding profiles.
+        Returns None if ``profile_id`` is not one of the user's profiles.
+        """
         
         # Get user profiles
         profiles = db.exec(select(OnboardingProfile).where(OnboardingProfile.user_id == user_id)).all()
         total_profiles = len(profiles)
-        active_profile_data = None
+        if profile_id is not None and not any(p.id == profile_id for p in profiles):
+            return None
+        
+        # Scalar columns of the user's (or the profile's) test records, via the
+        # (user_id, onboarding_profile_id, created_at) index
+        statement = select(TestRecord.category, TestRecord.score, TestRecord.time_spent, TestRecord.created_at).where(
+            TestRecord.user_id == user_id
+        )
+        if profile_id is not None:
+            statement = statement.where(TestRecord.onboarding_profile_id == profile_id)
+        test_records = db.exec(statement.order_by(TestRecord.created_at)).all()
         
-        # Get active profile stats
-        active_profile = next((p for p in profiles if p.is_active), None)
+        # Get active profile stats (aggregated in the database, without the other profiles' tests)
+        user = db.get(User, user_id)
+        active_profile_data = None
+        active_profile = next((p for p in profiles if p.id == user.active_profile_id), None)
         if active_profile:
-            profile_tests = [r for r in test_records if r.onboarding_profile_id == active_profile.id]
-            if profile_tests:
+            profile_total, profile_average, profile_last = db.exec(
+                select(func.count(), func.avg(TestRecord.score), func.max(TestRecord.created_at)).where(
+                    TestRecord.user_id == user_id,
+                    TestRecord.onboarding_profile_id == active_profile.id
+                )
+            ).one()
+            if profile_total:
                 active_profile_data = ProfileStats(
                     profile_name=active_profile.profile_name,
                     state=active_profile.state,
                     test_type=active_profile.test_type,
-                    total_tests=len(profile_tests),
-                    average_score=round(sum(r.score for r in profile_tests) / len(profile_tests), 2),
-                    last_test_date=max(r.created_at for r in profile_tests)
+                    total_tests=profile_total,
+                    average_score=round(float(profile_average), 2),
+                    last_test_date=profile_last
                 )
         
         if not test_records:
@@ -71,16 +92,12 @@ class StatisticsService:
         total_time_spent = sum(record.time_spent for record in test_records)
         average_time_per_test = total_time_spent // total_tests
         
-        # Time-based stats
-        now = datetime.utcnow()
-        week_ago = now - timedelta(days=7)
-        month_ago = now - timedelta(days=30)
-        tests_this_week = sum(1 for r in test_records if r.created_at >= week_ago)
-        tests_this_month = sum(1 for r in test_records if r.created_at >= month_ago)
-        
-        # Streak calculation
-        current_streak = StatisticsService._calculate_current_streak(test_records)
-        longest_streak = StatisticsService._calculate_longest_streak(test_records)
+        # Time-based stats and streaks from the timezone-aware daily rollup (per-user), or
+        # from the profile's own tests
+        if profile_id is None:
+            activity = ActivityService.summarize(user, db)
+        else:
+            activity = ActivityService.summarize_tests(user, [record.created_at for record in test_records])
         
         # Improvement rate (compare first half vs second half)
         improvement_rate = None
@@ -131,76 +148,75 @@ class StatisticsService:
             recent_trend=recent_trend,
             total_profiles=total_profiles,
             active_profile=active_profile_data,
-            tests_this_week=tests_this_week,
-            tests_this_month=tests_this_month,
-            current_streak=current_streak,
-            longest_streak=longest_streak
+            tests_this_week=activity["tests_this_week"],
+            tests_this_month=activity["tests_this_month"],
+            current_streak=activity["current_streak"],
+            longest_streak=activity["longest_streak"]
         )
     
     @staticmethod
-    def _calculate_current_streak(test_records: List[TestRecord]) -> int:
-        """Calculate current consecutive days with tests"""
-        if not test_records:
-            return 0
-        
-        dates = sorted(set(r.created_at.date() for r in test_records), reverse=True)
-        if not dates:
-            return 0
-        
-        today = datetime.utcnow().date()
-        if dates[0] != today and dates[0] != today - timedelta(days=1):
-            return 0
-        
-        streak = 1
-        for i in range(len(dates) - 1):
-            if (dates[i] - dates[i + 1]).days == 1:
-                streak += 1
-            else:
-                break
-        return streak
-    
-    @staticmethod
-    def _calculate_longest_streak(test_records: List[TestRecord]) -> int:
-        """Calculate longest consecutive days with tests"""
-        if not test_records:
-            return 0
-        
-        dates = sorted(set(r.created_at.date() for r in test_records))
-        if not dates:
-            return 0
-        
-        longest = 1
-        current = 1
-        
-        for i in range(len(dates) - 1):
-            if (dates[i + 1] - dates[i]).days == 1:
-                current += 1
-                longest = max(longest, current)
-            else:
-                current = 1
-        
-        return longest
-    
-    @staticmethod
-    def get_weak_areas(user_id: int, db: Session, threshold: float = 70.0) -> Dict[str, List[WeakArea]]:
-        """Identify categories where user is performing below threshold"""
-        statement = select(TestRecord).where(TestRecord.user_id == user_id)
-        test_records = db.exec(statement).all()
-        
-        category_scores: Dict[str, List[int]] = {}
-        for record in test_records:
-            if record.category not in category_scores:
-                category_scores[record.category] = []
-            category_scores[record.category].append(record.score)
+    def get_weak_areas(
+        user_id: int, db: Session, threshold: float = 70.0, profile_id: Optional[int] = None
+    ) -> Dict[str, List[WeakArea]]:
+        """Identify categories where user (or one of their profiles) is performing below threshold"""
+        statement = select(TestRecord.category, func.avg(TestRecord.score), func.count()).where(
+            TestRecord.user_id == user_id
+        )
+        if profile_id is not None:
+            statement = statement.where(TestRecord.onboarding_profile_id == profile_id)
+        category_stats = db.exec(statement.group_by(TestRecord.category).order_by(TestRecord.category)).all()
         
         weak_areas = []
-        for category, scores in category_scores.items():
-            avg_score = sum(scores) / len(scores)
+        for category, avg_score, attempts in category_stats:
+            avg_score = float(avg_score)
             if avg_score < threshold:
                 weak_areas.append(WeakArea(
                     category=category,
                     average_score=round(avg_score, 2),
-                    total_attempts=len(scores)
+                    total_attempts=attempts
                 ))
         
         return {"weak_areas": weak_areas}
+
+    @staticmethod
+    def backfill_profile_links(db: Session, chunk_size: int = 10000) -> int:
+        """
+        Link historical test records to the user's onboarding profile for the same state and
+        test type (the active one if several match), in id-range chunks committed separately.
+        Returns the number of unlinked test records processed.
+        """
+        max_id = db.exec(select(func.max(TestRecord.id))).one()
+        db.commit()
+        if max_id is None:
+            return 0
+
+        table = TestRecord.__table__
+        matching_profile = (
+            select(OnboardingProfile.id)
+            .where(
+                OnboardingProfile.user_id == table.c.user_id,
+                OnboardingProfile.state == table.c.state_code,
+                OnboardingProfile.test_type == table.c.test_type
+            )
+            .order_by(
+                (OnboardingProfile.id == select(User.active_profile_id).where(User.id == table.c.user_id).scalar_subquery()).desc(),
+                OnboardingProfile.id
+            )
+            .limit(1)
+            .scalar_subquery()
+        )
+        processed = 0
+        last_id = 0
+        while last_id < max_id:
+            upper = min(last_id + chunk_size, max_id)
+            result = db.execute(
+                update(table)
+                .where(table.c.id > last_id, table.c.id <= upper, table.c.onboarding_profile_id.is_(None))
+                .values(onboarding_profile_id=matching_profile)
+            )
+            db.commit()
+            last_id = upper
+            processed += result.rowcount
+            logger.info(f"TEST_RECORD_PROFILE_BACKFILL | processed={processed} | last_id={last_id}")
+
+        return processed
@@ -0,0 +1,71 @@
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import update
+from sqlmodel import Session, select
+from typing import Any, Callable
+import logging
+from app.core.cache import etag_matches, stats_cache
+from app.models.user import User
+from app.services.activity_service import ActivityService
+
+logger = logging.getLogger(__name__)
+
+
+class StatsCache:
+    """
+    Versioned cache for per-user statistics responses.
+
+    Writes that change a user's statistics call ``bump`` in the same transaction. Reads
+    key on the stats version of the already-loaded user, so a poll costs no query beyond
+    authentication: 304 if the client's ETag matches, cached bytes otherwise.
+
+    The version comes from the primary, so a body is only computed on a read replica that
+    has already applied the user's latest write; otherwise it is computed on the primary.
+    """
+
+    @staticmethod
+    def bump(user_id: int, db: Session) -> None:
+        """Invalidate the user's cached statistics (atomic, so concurrent writes both count)"""
+        db.execute(update(User).where(User.id == user_id).values(stats_version=User.stats_version + 1))
+
+    @staticmethod
+    def etag(user: User) -> str:
+        # Weekly counts and streaks roll over at local midnight without any write
+        return f'"stats-{user.id}-{user.stats_version}-{ActivityService.today_for(user).isoformat()}"'
+
+    @staticmethod
+    def _session_for(user: User, db: Session, primary: Session) -> Session:
+        """``db`` if it has caught up with the user's stats version, otherwise ``primary``"""
+        if db.get_bind() is primary.get_bind():
+            return db
+        version = db.exec(select(User.stats_version).where(User.id == user.id)).first()
+        if version is not None and version >= user.stats_version:
+            return db
+        logger.info(f"STATS_CACHE | replica behind | user_id={user.id} | version={user.stats_version} | replica={version}")
+        return primary
+
+    @staticmethod
+    def cached(user: User, name: str, compute: Callable[[Session], Any], db: Session, primary: Session) -> bytes:
+        """
+        JSON bytes of ``compute(session)`` under ``name`` for the user's current stats
+        version. ``db`` is the read session (possibly a replica), ``primary`` the request's.
+        """
+        key = f"{StatsCache.etag(user)}:{name}"
+        body = stats_cache.get(key)
+        if body is None:
+            session = StatsCache._session_for(user, db, primary)
+            body = ORJSONResponse(jsonable_encoder(compute(session))).body
+            stats_cache.set(key, body)
+        return body
+
+    @staticmethod
+    def respond(request: Request, user: User, compute: Callable[[Session], Any], db: Session, primary: Session) -> Response:
+        """Serve ``compute(session)`` for this URL from the cache, computing and storing it on a miss"""
+        etag = StatsCache.etag(user)
+        headers = {"ETag": etag, "Cache-Control": "private, max-age=0, must-revalidate"}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+
+        body = StatsCache.cached(user, f"{request.url.path}?{request.url.query}", compute, db, primary)
+        return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+Rebuild the daily_activity rollup from historical test records
+Usage: python scripts/backfill_daily_activity.py [--chunk-size N] [--no-reset]
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlmodel import Session
+from app.core.database import engine
+from app.services.activity_service import ActivityService
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Users per transaction (test records with --no-reset)")
+    parser.add_argument("--no-reset", action="store_true", help="Keep existing rollup rows (adds on top)")
+    args = parser.parse_args()
+    
+    print("Backfilling daily activity...")
+    with Session(engine) as session:
+        processed = ActivityService.backfill(session, chunk_size=args.chunk_size, reset=not args.no_reset)
+    print(f"✓ Processed {processed} test records")
+
+if __name__ == "__main__":
+    main()
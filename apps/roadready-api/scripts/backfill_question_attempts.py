@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+Extract question_attempts rows from historical test record JSON payloads
+Usage: python scripts/backfill_question_attempts.py [--chunk-size N] [--no-reset]
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlmodel import Session
+from app.core.database import engine
+from app.services.question_analytics_service import QuestionAnalyticsService
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chunk-size", type=int, default=500, help="Users per transaction (test records with --no-reset)")
+    parser.add_argument("--no-reset", action="store_true", help="Keep existing attempt rows (adds on top)")
+    args = parser.parse_args()
+    
+    print("Backfilling question attempts...")
+    with Session(engine) as session:
+        processed = QuestionAnalyticsService.backfill(session, chunk_size=args.chunk_size, reset=not args.no_reset)
+    print(f"✓ Processed {processed} test records")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""
+Link historical test records to the onboarding profile for their state and test type
+Usage: python scripts/backfill_test_record_profiles.py [--chunk-size N]
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlmodel import Session
+from app.core.database import engine
+from app.services.statistics_service import StatisticsService
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chunk-size", type=int, default=10000, help="Test record ids per transaction")
+    args = parser.parse_args()
+    
+    print("Linking test records to onboarding profiles...")
+    with Session(engine) as session:
+        processed = StatisticsService.backfill_profile_links(session, chunk_size=args.chunk_size)
+    print(f"✓ Processed {processed} unlinked test records")
+
+if __name__ == "__main__":
+    main()
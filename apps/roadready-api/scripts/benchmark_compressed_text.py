@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Compare storage size and read/write latency of CompressedText against plain Text
+Usage: python scripts/benchmark_compressed_text.py [--database-url URL] [--rows N] [--length CHARS]
+
+Defaults to an in-memory SQLite database; pass the Postgres URL (e.g. $DATABASE_URL) to
+benchmark Postgres. Uses a scratch table that is dropped afterwards.
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import Column, Integer, MetaData, Table, Text, create_engine, func, select, cast, LargeBinary
+from app.core.config import settings
+from app.models.types import CompressedText
+
+WORDS = (
+    "helmet gloves jacket permit practice test road sign lane merge yield brake signal mirror "
+    "condition excellent used once includes manual pickup available weekend price negotiable "
+    "motorcycle car license instructor parking highway speed limit intersection"
+).split()
+
+
+def sample_text(length: int, rng: random.Random) -> str:
+    words = []
+    size = 0
+    while size < length:
+        word = rng.choice(WORDS)
+        words.append(word)
+        size += len(word) + 1
+    return " ".join(words)[:length]
+
+
+def stored_bytes(conn, column) -> int:
+    if conn.dialect.name == "postgresql":
+        return conn.execute(select(func.sum(func.octet_length(column)))).scalar() or 0
+    return conn.execute(select(func.sum(func.length(cast(column, LargeBinary))))).scalar() or 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--database-url", default="sqlite:///:memory:")
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--length", type=int, default=1500, help="Characters per value")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    metadata = MetaData()
+    tables = {
+        "text": Table("bench_plain_text", metadata, Column("id", Integer, primary_key=True), Column("value", Text)),
+        "compressed": Table("bench_compressed_text", metadata, Column("id", Integer, primary_key=True), Column("value", CompressedText())),
+    }
+    rng = random.Random(42)
+    values = [{"value": sample_text(args.length, rng)} for _ in range(args.rows)]
+
+    print(f"{engine.dialect.name}: {args.rows} rows x {args.length} chars, codec={settings.COMPRESSED_TEXT_CODEC}")
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+    try:
+        for name, table in tables.items():
+            with engine.begin() as conn:
+                start = time.perf_counter()
+                conn.execute(table.insert(), values)
+                write_ms = (time.perf_counter() - start) * 1000
+            with engine.connect() as conn:
+                start = time.perf_counter()
+                rows = conn.execute(select(table.c.value)).all()
+                read_ms = (time.perf_counter() - start) * 1000
+                assert rows[0][0] == values[0]["value"]
+                size = stored_bytes(conn, table.c.value)
+            print(f"  {name:<10} stored={size / 1024:>9.1f} KiB  write={write_ms:>8.1f} ms  read={read_ms:>8.1f} ms")
+    finally:
+        metadata.drop_all(engine)
+
+
+if __name__ == "__main__":
+    main()
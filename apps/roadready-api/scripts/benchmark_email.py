@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark weekly digest throughput against a local SMTP sink, in messages/second
+Usage: python scripts/benchmark_email.py [--users N] [--batch-size N]
+
+Before: templates read and formatted and an email.message.EmailMessage built for every
+message, one SMTP connection per message (how transactional emails were sent inline).
+After: compiled, cached templates serialized straight into a fixed MIME layout, and
+DigestService's batches over one reused connection. Uses in-memory SQLite; no server needed.
+"""
+import argparse
+import email.policy
+import sys
+import time
+from datetime import date
+from email.message import EmailMessage
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlmodel import Session, SQLModel, create_engine, select
+from sqlmodel.pool import StaticPool
+from app.core.database import _import_orm_models
+from app.core.config import settings
+from app.core.mailer import OutgoingEmail, SMTPSink, SMTPTransport, build_message
+from app.models.user import User
+from app.services.digest_service import DigestService
+from app.services.email_templates import TEMPLATE_DIR, get_template
+
+
+def make_users(session: Session, n: int) -> None:
+    session.add_all([
+        User(email=f"user{i}@example.com", first_name=f"User{i}", email_verified=True, current_streak=i % 10)
+        for i in range(n)
+    ])
+    session.commit()
+
+
+def payload(first_name: str, streak: int) -> dict:
+    return {
+        "name": first_name, "tests_this_week": 3, "average_this_week": 81, "total_tests": 42, "pass_rate": 76,
+        "streak_message": DigestService.streak_message(streak, date.today(), date.today()),
+    }
+
+
+def render_before(to: str, values: dict) -> OutgoingEmail:
+    subject, _, text = (TEMPLATE_DIR / "weekly_digest.txt").read_text().partition("\n\n")
+    html = (TEMPLATE_DIR / "weekly_digest.html").read_text()
+    message = EmailMessage()
+    message["From"] = settings.EMAIL_FROM
+    message["To"] = to
+    message["Subject"] = subject[len("Subject: "):].format(**values)
+    message.set_content(text.format(**values))
+    message.add_alternative(html.format(**values), subtype="html")
+    return OutgoingEmail(to, message["Subject"], message.as_bytes(policy=email.policy.SMTP))
+
+
+def render_after(to: str, values: dict) -> OutgoingEmail:
+    template = get_template("weekly_digest")
+    return build_message(to, template.subject(values), template.text(values), template.html(values))
+
+
+def timed_render(render, users: list) -> float:
+    start = time.perf_counter()
+    for to, first_name, streak in users:
+        render(to, payload(first_name, streak))
+    return len(users) / (time.perf_counter() - start)
+
+
+def send_before(session: Session, transport: SMTPTransport) -> float:
+    users = session.exec(select(User.email, User.first_name, User.current_streak).order_by(User.id)).all()
+    start = time.perf_counter()
+    for to, first_name, streak in users:
+        transport.send([render_before(to, payload(first_name, streak))])
+    return len(users) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    _import_orm_models()
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine)
+    sink = SMTPSink().start()
+    try:
+        with Session(engine) as session:
+            make_users(session, args.users)
+            users = session.exec(select(User.email, User.first_name, User.current_streak)).all()
+            print(f"{args.users} digests to a local SMTP sink")
+
+            before, after = timed_render(render_before, users), timed_render(render_after, users)
+            print(f"  render   before={before:>9.0f} msg/s  after={after:>9.0f} msg/s  speedup={after / before:>4.1f}x")
+
+            transport = SMTPTransport(sink.host, sink.port)
+            before = send_before(session, transport)
+            connections = sink.connections
+            result = DigestService.send_weekly(session, transport, batch_size=args.batch_size)
+            after = result["per_second"]
+            print(f"  send     before={before:>9.0f} msg/s  after={after:>9.0f} msg/s  speedup={after / before:>4.1f}x")
+            print(f"  SMTP connections: before={connections}  after={sink.connections - connections}")
+    finally:
+        sink.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark serializing large list responses: untyped dicts + stdlib json (before)
+against typed response models + orjson (after)
+Usage: python scripts/benchmark_json_responses.py [--items N] [--repeat N]
+
+Times what FastAPI does after the endpoint returns (response model validation,
+serialization, rendering the body) for in-memory rows; no database or server needed.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import APIRoute, serialize_response
+from sqlmodel import SQLModel
+from app.models.marketplace import UserListing
+from app.models.test_record import TestRecord
+from app.schemas.marketplace import UserListingRead
+from app.schemas.test_statistics import TestRecordPaginated
+
+
+class UntypedPaginated(SQLModel):
+    items: List[dict]
+    total: int
+    page: int
+    page_size: int
+    total_pages: int
+
+
+def make_records(n: int) -> List[TestRecord]:
+    questions = json.dumps([{"id": f"ca_{i:03d}", "stateCode": "CA", "category": "road-signs"} for i in range(20)])
+    return [
+        TestRecord(
+            id=i, user_id=1, state_code="CA", test_type="car", category="road-signs",
+            score=80, total_questions=20, correct_answers=16, time_spent=300,
+            questions=questions, user_answers=json.dumps([1] * 20), is_correct=json.dumps([True] * 20),
+            completed_at=datetime.utcnow(), created_at=datetime.utcnow()
+        )
+        for i in range(n)
+    ]
+
+
+def make_listings(n: int) -> List[UserListing]:
+    return [
+        UserListing(
+            id=i, user_id=1, title=f"Helmet {i}", description="Barely used, DOT certified. " * 10,
+            price=Decimal("49.99"), category="safety_gear", condition="like_new", images=["a.jpg", "b.jpg"],
+            status="active", created_at=datetime.utcnow()
+        )
+        for i in range(n)
+    ]
+
+
+def build_app(records, listings) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/before/records", response_model=UntypedPaginated, response_class=JSONResponse)
+    def records_before():
+        return UntypedPaginated(items=[r.model_dump() for r in records], total=len(records), page=1, page_size=len(records), total_pages=1)
+
+    @app.get("/after/records", response_model=TestRecordPaginated, response_class=ORJSONResponse)
+    def records_after():
+        return TestRecordPaginated(items=records, total=len(records), page=1, page_size=len(records), total_pages=1)
+
+    @app.get("/before/listings", response_class=JSONResponse)
+    def listings_before():
+        return [listing.model_dump() for listing in listings]
+
+    @app.get("/after/listings", response_model=List[UserListingRead], response_class=ORJSONResponse)
+    def listings_after():
+        return listings
+
+    return app
+
+
+def render(route: APIRoute) -> bytes:
+    content = asyncio.run(serialize_response(field=route.response_field, response_content=route.endpoint()))
+    return route.response_class(content).body
+
+
+def timed(route: APIRoute, repeat: int) -> float:
+    render(route)  # warm up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        render(route)
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    app = build_app(make_records(args.items), make_listings(args.items))
+    routes = {route.path: route for route in app.routes if isinstance(route, APIRoute)}
+    print(f"{args.items} items per response, mean of {args.repeat} runs")
+    for name in ("records", "listings"):
+        before = timed(routes[f"/before/{name}"], args.repeat)
+        after = timed(routes[f"/after/{name}"], args.repeat)
+        print(f"  {name:<9} before={before:>8.1f} ms  after={after:>8.1f} ms  speedup={before / after:>4.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Export application tables to partitioned Parquet for analytics
+Usage: python scripts/export_parquet.py OUTPUT_DIR [--tables test_records user ...] [--chunk-size N] [--full]
+
+Incremental: only rows added (or, for user, onboarding_profiles and the marketplace listings,
+products and inquiries, updated) since the last run, and older than the 10-minute safety lag, are exported. Watermarks are kept in OUTPUT_DIR/_watermarks.json. Requires pyarrow.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlmodel import Session
+from app.core.database import engine
+from app.services.parquet_export import AnalyticsExportService, EXPORT_TABLES
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("output_dir", type=Path)
+    parser.add_argument("--tables", nargs="+", choices=[spec.name for spec in EXPORT_TABLES], help="Default: all tables")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="Rows per query / Parquet file")
+    parser.add_argument("--full", action="store_true", help="Ignore watermarks and export everything (use a fresh OUTPUT_DIR)")
+    args = parser.parse_args()
+    
+    print(f"Exporting to {args.output_dir}...")
+    with Session(engine) as session:
+        counts = AnalyticsExportService.export(
+            session, args.output_dir, tables=args.tables, chunk_size=args.chunk_size, full=args.full
+        )
+    for table, count in counts.items():
+        print(f"✓ {table}: {count} rows")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Import questions into the question bank from a JSON file
+Usage: python scripts/import_questions.py questions.json
+
+The file holds a list of questions in the mobile client's shape:
+{"id", "stateCode", "testType", "category", "question", "options", "correctAnswer", "explanation", "imageUrl"}
+"""
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlmodel import Session
+from app.core.database import engine
+from app.services.question_bank import import_questions, load_question_bank
+
+def main():
+    if len(sys.argv) != 2:
+        print(__doc__)
+        sys.exit(1)
+    
+    items = json.loads(Path(sys.argv[1]).read_text())
+    with Session(engine) as session:
+        counts = import_questions(items, session)
+        session.commit()
+        bank = load_question_bank(session)
+    print(f"✓ Created {counts['created']}, updated {counts['updated']}, unchanged {counts['unchanged']}")
+    print(f"✓ Bank version {bank.version} ({len(bank)} active questions). Restart API workers to serve it.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""
+Recompute question difficulty and user mastery ratings from question_attempts
+Usage: python scripts/rebuild_ratings.py [--chunk-size N]
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlmodel import Session
+from app.core.database import engine
+from app.services.rating_service import RatingService
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chunk-size", type=int, default=2000, help="Attempts per transaction")
+    args = parser.parse_args()
+    
+    print("Rebuilding ratings...")
+    with Session(engine) as session:
+        processed = RatingService.rebuild(session, chunk_size=args.chunk_size)
+    print(f"✓ Replayed {processed} question attempts")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Refresh the score distributions behind GET /statistics/percentile
+Usage: python scripts/refresh_percentiles.py [--chunk-size N] [--full]
+
+Incremental: only test records added since the last refresh (and older than the
+10-minute safety lag) are read.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlmodel import Session
+from app.core.database import engine
+from app.services.percentile_service import PercentileService
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chunk-size", type=int, default=10000, help="Test records per transaction")
+    parser.add_argument("--full", action="store_true", help="Rebuild the distributions from all test records")
+    args = parser.parse_args()
+    
+    print("Refreshing score percentiles...")
+    with Session(engine) as session:
+        processed = PercentileService.refresh(session, chunk_size=args.chunk_size, full=args.full)
+    print(f"✓ Processed {processed} test records")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Recompute per-user and per-cohort report statistics (nightly job)
+Usage: python scripts/run_batch_analytics.py [--chunk-size N]
+
+Writes user_statistics and cohort_statistics. Requires numpy.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlmodel import Session
+from app.core.database import engine
+from app.services.batch_analytics import BatchAnalyticsService
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chunk-size", type=int, default=5000, help="Users per transaction")
+    args = parser.parse_args()
+    
+    print("Computing batch analytics...")
+    with Session(engine) as session:
+        counts = BatchAnalyticsService.run(session, chunk_size=args.chunk_size)
+    print(f"✓ {counts['users']} users, {counts['tests']} test records, {counts['cohorts']} cohorts")
+
+if __name__ == "__main__":
+    main()
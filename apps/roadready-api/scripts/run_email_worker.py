@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Deliver queued emails from the email outbox
+Usage: python scripts/run_email_worker.py [--once] [--batch-size N]
+
+Runs until interrupted; --once drains the outbox and exits (e.g. from cron). Set
+EMAIL_WORKER_ENABLED=false on the API when running the worker separately.
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.config import settings
+from app.core.database import engine
+from app.services.email_outbox import EmailOutboxWorker
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--once", action="store_true", help="Send everything that is due, then exit")
+    parser.add_argument("--batch-size", type=int, default=settings.EMAIL_WORKER_BATCH_SIZE, help="Emails per SMTP connection")
+    args = parser.parse_args()
+    
+    worker = EmailOutboxWorker(engine, batch_size=args.batch_size)
+    if args.once:
+        total = 0
+        while attempted := worker.run_once():
+            total += attempted
+        print(f"✓ Attempted {total} emails")
+        return
+    
+    print("Delivering queued emails (Ctrl+C to stop)...")
+    try:
+        asyncio.run(worker.run(asyncio.Event()))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Send the weekly progress digest to all active, verified users (weekly job)
+Usage: python scripts/send_weekly_digest.py [--batch-size N]
+
+Uses user_statistics from the nightly batch analytics run and daily_activity for each
+user's local week. Sends through SMTP_HOST (logged only when unset), one connection for
+the run. Skips unsubscribed users and anyone sent a digest in the last 6 days, so a rerun
+(e.g. after a failure) only sends what is missing. Unsubscribe links use PUBLIC_BASE_URL.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlmodel import Session
+from app.core.database import engine
+from app.core.mailer import default_transport
+from app.services.digest_service import DigestService
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batch-size", type=int, default=500, help="Users rendered and sent per batch")
+    args = parser.parse_args()
+    
+    print("Sending weekly digests...")
+    with Session(engine) as session:
+        result = DigestService.send_weekly(session, default_transport(), batch_size=args.batch_size)
+    print(f"✓ Sent {result['sent']}, failed {result['failed']}, skipped {result['skipped']} in {result['seconds']}s ({result['per_second']} messages/s)")
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,73 @@
 import pytest
+from datetime import datetime
+from fastapi import Request
 from fastapi.testclient import TestClient
+from sqlalchemy import event
 from sqlmodel import Session, SQLModel, create_engine
 from sqlmodel.pool import StaticPool
 from app.main import app
+from app.core.cache import stats_cache
+from app.core.rate_limit import rate_limiter
 from app.core.database import get_db
+from app.services import question_bank
 from app.models.user import User
 from app.models.test_record import TestRecord
+from app.models.question_attempt import QuestionAttempt
 from app.models.onboarding_profile import OnboardingProfile
 from app.models.session import Session as SessionModel
 from app.models.email_verification import EmailVerification
 from app.models.password_reset import PasswordReset
 from app.core.security import get_password_hash, create_tokens
+from app.services.activity_service import ActivityService
+
+def make_record(user_id: int, score: int = 80, created_at: datetime = None, **fields) -> TestRecord:
+    """A CA car test record completed at ``created_at`` (default now); keywords override any column"""
+    values = dict(
+        user_id=user_id,
+        state_code="CA",
+        test_type="car",
+        category="traffic_signs",
+        score=score,
+        total_questions=20,
+        correct_answers=score // 5,
+        time_spent=300,
+        questions="[]",
+        user_answers="[]",
+        is_correct="[]",
+    )
+    if created_at is not None:
+        values.update(created_at=created_at, completed_at=created_at)
+    values.update(fields)
+    return TestRecord(**values)
+
+def add_records(session: Session, user_id: int, scores: list, **fields) -> list:
+    """Insert and commit one ``make_record`` per score"""
+    records = [make_record(user_id, score, **fields) for score in scores]
+    session.add_all(records)
+    session.commit()
+    return records
+
+def add_record(session: Session, user: User, score: int, created_at: datetime, **fields) -> TestRecord:
+    """Insert a record and roll it up into daily activity, as the create endpoint does (not committed)"""
+    record = make_record(user.id, score, created_at, **fields)
+    session.add(record)
+    session.flush()
+    ActivityService.record_test(user, record, session)
+    return record
+
+def make_attempt(user_id: int, question_id: str, correct: bool, **fields) -> QuestionAttempt:
+    """An unsaved attempt at a CA car road-signs question; keywords override any column"""
+    values = dict(
+        test_record_id=0,
+        user_id=user_id,
+        question_id=question_id,
+        state_code="CA",
+        test_type="car",
+        category="road-signs",
+        is_correct=correct,
+    )
+    values.update(fields)
+    return QuestionAttempt(**values)
 
 @pytest.fixture(name="session")
 def session_fixture():
@@ -21,14 +78,120 @@ def session_fixture():
         poolclass=StaticPool,
     )
     SQLModel.metadata.create_all(engine)
+    # Every test's database starts with user 1 at stats version 0
+    stats_cache.clear()
+    rate_limiter.clear()
     with Session(engine) as session:
         yield session
 
+@pytest.fixture(autouse=True)
+def restore_question_bank(monkeypatch):
+    """``load_question_bank`` swaps the process-wide bank; put the previous one back after each test"""
+    monkeypatch.setattr(question_bank, "_bank", question_bank.get_question_bank())
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "query_budget(n): fail if any API request made through the client issues more than n SQL statements",
+    )
+    config.addinivalue_line(
+        "markers",
+        "allow_repeated_queries: don't fail on the same SQL statement repeated with different parameters in one request",
+    )
+
+class QueryCounter:
+    """
+    SQL statements and commits issued on the test engine while recording.
+
+    Requests made through the ``client`` fixture are also checked one by one: more
+    statements than the test's ``query_budget`` marker allows, or the same statement
+    issued repeatedly with different parameters (an N+1 loop), is recorded as a
+    violation and fails the test.
+    """
+
+    def __init__(self, budget: int = None, allow_repeated: bool = False):
+        self.budget = budget
+        self.allow_repeated = allow_repeated
+        self.executions = []
+        self.commits = 0
+        self.violations = []
+
+    @property
+    def statements(self):
+        return [statement for statement, _ in self.executions]
+
+    def reset(self):
+        self.executions = []
+        self.commits = 0
+
+    def __len__(self):
+        return len(self.executions)
+
+    def check_request(self, label: str, executions: list):
+        if self.budget is not None and len(executions) > self.budget:
+            listing = "\n".join(f"  {statement}" for statement, _ in executions)
+            self.violations.append(
+                f"{label} issued {len(executions)} SQL statements (budget {self.budget}):\n{listing}"
+            )
+        if self.allow_repeated:
+            return
+        parameters_by_statement = {}
+        for statement, parameters in executions:
+            parameters_by_statement.setdefault(statement, set()).add(repr(parameters))
+        for statement, parameter_sets in parameters_by_statement.items():
+            if len(parameter_sets) > 1:
+                self.violations.append(
+                    f"{label} repeated a statement with {len(parameter_sets)} different parameter sets "
+                    f"(N+1 query?):\n  {statement}"
+                )
+
+@pytest.fixture(name="query_counter")
+def query_counter_fixture(session: Session, request):
+    """Count statements and commits; call ``reset()`` right before the request under test"""
+    budget = request.node.get_closest_marker("query_budget")
+    counter = QueryCounter(
+        budget=budget.args[0] if budget else None,
+        allow_repeated=request.node.get_closest_marker("allow_repeated_queries") is not None,
+    )
+    engine = session.get_bind()
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        counter.executions.append((statement, parameters))
+
+    def on_commit(conn):
+        counter.commits += 1
+
+    event.listen(engine, "before_cursor_execute", on_execute)
+    event.listen(engine, "commit", on_commit)
+    yield counter
+    event.remove(engine, "before_cursor_execute", on_execute)
+    event.remove(engine, "commit", on_commit)
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    result = yield
+    counter = item.funcargs.get("query_counter")
+    if counter is not None and counter.violations:
+        pytest.fail("\n\n".join(counter.violations), pytrace=False)
+    return result
+
 @pytest.fixture(name="client")
-def client_fixture(session: Session):
+def client_fixture(session: Session, query_counter: QueryCounter):
     """Create a test client"""
-    def get_session_override():
-        return session
+    def get_session_override(http_request: Request):
+        # Same unit of work as get_db: one commit after the handler, rollback on error
+        start = len(query_counter.executions)
+        try:
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            query_counter.check_request(
+                f"{http_request.method} {http_request.url.path}",
+                query_counter.executions[start:],
+            )
 
     app.dependency_overrides[get_db] = get_session_override
     client = TestClient(app)
@@ -101,6 +264,7 @@ def auth_headers_fixture(test_user: User, session: Session):
     mock_request.headers.get.return_value = "test-agent"
     
     access_token, refresh_token = create_tokens(test_user.id, session, mock_request)
+    session.commit()
     return {
         "Authorization": f"Bearer {access_token}",
         "refresh_token": refresh_token
@@ -116,6 +280,7 @@ def verified_auth_headers_fixture(verified_user: User, session: Session):
     mock_request.headers.get.return_value = "test-agent"
     
     access_token, refresh_token = create_tokens(verified_user.id, session, mock_request)
+    session.commit()
     return {
         "Authorization": f"Bearer {access_token}",
         "refresh_token": refresh_token
@@ -0,0 +1,88 @@
+import pytest
+from sqlmodel import Session, select
+from datetime import datetime, timedelta
+from app.models.user import User
+from app.models.analytics import UserStatistics, CohortStatistics
+from app.services.activity_service import ActivityService
+from app.services.statistics_service import StatisticsService
+
+pytest.importorskip("numpy")
+
+from app.services.batch_analytics import BatchAnalyticsService, MAX_ATTEMPTS
+from tests.conftest import add_record
+
+@pytest.fixture(name="history")
+def history_fixture(session: Session, test_user: User):
+    """Two users with tests across several days; a third user without tests"""
+    now = datetime.utcnow()
+    other = User(email="other@example.com", hashed_password="x", timezone="Asia/Tokyo")
+    idle = User(email="idle@example.com", hashed_password="x")
+    session.add_all([other, idle])
+    session.flush()
+
+    for days, score in ((9, 40), (8, 55), (7, 60), (2, 80), (1, 85), (0, 90)):
+        add_record(session, test_user, score, now - timedelta(days=days))
+    for days, score in ((30, 100), (29, 65), (28, 70)):
+        add_record(session, other, score, now - timedelta(days=days))
+    add_record(session, other, 75, now - timedelta(days=27), test_type="motorcycle")
+    session.commit()
+    return [test_user.id, other.id, idle.id]
+
+class TestBatchAnalytics:
+    """Test the vectorized nightly statistics against the per-user services"""
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 1000])
+    def test_matches_statistics_service(self, session: Session, history: list, chunk_size: int):
+        """Test that every user row equals the online calculation, regardless of chunking"""
+        expected = {user_id: StatisticsService.calculate_user_statistics(user_id, session) for user_id in history}
+
+        counts = BatchAnalyticsService.run(session, chunk_size=chunk_size)
+        assert counts == {"users": 3, "tests": 10, "cohorts": 2}
+
+        rows = {row.user_id: row for row in session.exec(select(UserStatistics)).all()}
+        assert set(rows) == set(history)
+        for user_id, stats in expected.items():
+            row = rows[user_id]
+            assert row.total_tests == stats.total_tests
+            assert row.average_score == stats.average_score
+            assert row.best_score == stats.best_score
+            assert row.worst_score == stats.worst_score
+            assert row.pass_rate == stats.pass_rate
+            assert row.total_time_spent == stats.total_time_spent
+            assert row.improvement_rate == stats.improvement_rate
+            assert row.current_streak == stats.current_streak
+            assert row.longest_streak == stats.longest_streak
+
+        assert rows[history[0]].current_streak == 3
+        assert rows[history[1]].current_streak == 0
+        assert rows[history[1]].longest_streak == 4
+        assert rows[history[2]].last_test_at is None
+
+    def test_cohorts(self, session: Session, history: list):
+        """Test cohort totals, histogram and attempt curve"""
+        BatchAnalyticsService.run(session, chunk_size=1)
+        car = session.exec(select(CohortStatistics).where(CohortStatistics.test_type == "car")).one()
+        assert car.users == 2
+        assert car.total_tests == 9
+        assert car.pass_rate == round(5 / 9 * 100, 2)
+        assert sum(car.score_histogram) == 9
+        assert car.score_histogram[10] == 1  # the perfect score
+        assert len(car.attempt_curve) == MAX_ATTEMPTS
+        assert car.attempt_curve[:3] == [70.0, 60.0, 65.0]
+        assert car.attempt_curve[3] == 80.0
+        assert car.attempt_curve[6] is None
+
+        motorcycle = session.exec(select(CohortStatistics).where(CohortStatistics.test_type == "motorcycle")).one()
+        assert (motorcycle.users, motorcycle.total_tests, motorcycle.attempt_curve[0]) == (1, 1, 75.0)
+
+    def test_rerun_replaces_rows(self, session: Session, history: list):
+        """Test that a second run upserts instead of duplicating"""
+        BatchAnalyticsService.run(session)
+        add_record(session, session.get(User, history[0]), 100, datetime.utcnow())
+        session.commit()
+        BatchAnalyticsService.run(session)
+
+        row = session.exec(select(UserStatistics).where(UserStatistics.user_id == history[0])).one()
+        assert row.total_tests == 7
+        assert row.best_score == 100
+        assert len(session.exec(select(CohortStatistics)).all()) == 2
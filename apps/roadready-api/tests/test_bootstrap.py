@@ -0,0 +1,74 @@
+import asyncio
+import threading
+from fastapi.testclient import TestClient
+from sqlmodel import Session, SQLModel, create_engine
+from app.core import database
+from app.core.database import run_in_sessions
+from app.models.onboarding_profile import OnboardingProfile
+from app.models.user import User
+from tests.test_query_counts import AUTH_STATEMENTS, TEST_RECORD
+
+class TestBootstrap:
+    """Test GET /bootstrap"""
+
+    def test_all_sections(self, client: TestClient, auth_headers: dict, session: Session, test_user: User, query_counter):
+        """Test that every section matches its own endpoint"""
+        headers = {"Authorization": auth_headers["Authorization"]}
+        profile = OnboardingProfile(user_id=test_user.id, profile_name="Car", state="CA", test_type="car")
+        session.add(profile)
+        session.commit()
+        client.post(f"/api/v1/onboarding-profiles/{profile.id}/activate", headers=headers)
+        client.post("/api/v1/test-records/", headers=headers, json=TEST_RECORD)
+
+        data = client.get("/api/v1/bootstrap/", headers=headers).json()
+        assert set(data) == {"me", "active_profile", "statistics", "gamification", "achievements"}
+        assert data["me"] == client.get("/api/v1/auth/me", headers=headers).json()
+        assert data["active_profile"]["id"] == profile.id
+        assert data["statistics"] == client.get("/api/v1/statistics/", headers=headers).json()
+        assert data["gamification"] == client.get("/api/v1/gamification/stats", headers=headers).json()
+        assert data["achievements"] == client.get("/api/v1/gamification/achievements", headers=headers).json()
+        assert data["statistics"]["total_tests"] == 1
+
+        # Statistics come from the cache: only achievements need a query
+        query_counter.reset()
+        client.get("/api/v1/bootstrap/", headers=headers)
+        assert len(query_counter) == AUTH_STATEMENTS + 1
+
+    def test_field_selection(self, client: TestClient, auth_headers: dict, query_counter):
+        """Test that only the requested sections are returned and queried"""
+        headers = {"Authorization": auth_headers["Authorization"]}
+        query_counter.reset()
+        response = client.get("/api/v1/bootstrap/?fields=me,active_profile,gamification", headers=headers)
+        assert set(response.json()) == {"me", "active_profile", "gamification"}
+        assert response.json()["active_profile"] is None
+        assert len(query_counter) == AUTH_STATEMENTS
+
+        response = client.get("/api/v1/bootstrap/?fields=me,friends", headers=headers)
+        assert response.status_code == 400
+
+    def test_loaders_run_in_separate_sessions(self, tmp_path):
+        """Test that loaders overlap on a pool with separate connections"""
+        engine = create_engine(f"sqlite:///{tmp_path / 'bootstrap.db'}", connect_args={"check_same_thread": False})
+        SQLModel.metadata.create_all(engine)
+        barrier = threading.Barrier(2, timeout=5)
+
+        def loader(session: Session):
+            # Both loaders must be running at once to get past the barrier
+            barrier.wait()
+            return session, session.exec(User.__table__.select()).all()
+
+        with Session(engine) as db:
+            results = asyncio.run(run_in_sessions(db, {"a": loader, "b": loader}))
+        assert results["a"][0] is not results["b"][0]
+        assert results["a"][1] == results["b"][1] == []
+
+    def test_loaders_share_the_session_when_no_connections_are_free(self, tmp_path, monkeypatch):
+        """Test that loaders fall back to the request's session once the extra connections are taken"""
+        engine = create_engine(f"sqlite:///{tmp_path / 'bootstrap.db'}", connect_args={"check_same_thread": False})
+        monkeypatch.setattr(database, "_parallel_connections", threading.BoundedSemaphore(1))
+        database._parallel_connections.acquire()
+
+        with Session(engine) as db:
+            results = asyncio.run(run_in_sessions(db, {"a": lambda session: session, "b": lambda session: session}))
+        assert results["a"] is results["b"] is db
+        assert list(results) == ["a", "b"]
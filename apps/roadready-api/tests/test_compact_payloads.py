@@ -0,0 +1,169 @@
+import json
+import pytest
+from decimal import Decimal
+from sqlalchemy import text
+from sqlmodel import Session
+from app.models.marketplace import UserListing
+from app.models.test_record import TestRecord
+from app.models import types
+from app.models.types import (
+    AnswerIndices, CompressedText, PackedBools, ZLIB, check_codec, pack_bools, unpack_bools
+)
+from app.services.question_bank import QuestionBank, import_questions, load_question_bank
+
+QUESTIONS = [
+    {
+        "id": f"ca_{i:03d}",
+        "stateCode": "CA",
+        "testType": "car",
+        "category": "road-signs",
+        "question": f"Question {i}?",
+        "options": ["A", "B", "C", "D"],
+        "correctAnswer": i % 4,
+        "explanation": None,
+        "imageUrl": None
+    }
+    for i in range(20)
+]
+
+def stored(session: Session, record_id: int, column: str) -> bytes:
+    return bytes(session.exec(text(f"SELECT {column} FROM test_records WHERE id = :id").bindparams(id=record_id)).one()[0])
+
+class TestEncoding:
+    """Test the compact column encodings"""
+    
+    @pytest.mark.parametrize("values", [[], [True], [False] * 8, [True, False, True] * 11])
+    def test_bitset_round_trip(self, values):
+        """Test packing booleans"""
+        assert unpack_bools(pack_bools(values)) == values
+    
+    def test_is_correct_is_a_bitset(self):
+        """Test that 20 booleans take 5 bytes (header, length, 3 bytes of bits)"""
+        column = PackedBools()
+        payload = json.dumps([i % 3 == 0 for i in range(20)])
+        encoded = column.process_bind_param(payload, None)
+        assert len(encoded) == 5
+        assert column.process_result_value(encoded, None) == payload
+    
+    def test_answers_are_byte_indices(self):
+        """Test answer indices, including unanswered questions"""
+        column = AnswerIndices()
+        payload = json.dumps([0, 3, None, 1])
+        encoded = column.process_bind_param(payload, None)
+        assert encoded == bytes([1, 1, 4, 0, 2])
+        assert column.process_result_value(encoded, None) == payload
+    
+    @pytest.mark.parametrize("column,payload", [
+        (PackedBools(), '[1, 0]'),
+        (AnswerIndices(), '["A", "B"]'),
+        (AnswerIndices(), 'not json'),
+    ])
+    def test_unencodable_payloads_are_stored_raw(self, column, payload):
+        """Test that payloads outside the compact formats round-trip unchanged"""
+        encoded = column.process_bind_param(payload, None)
+        assert encoded[0] == 0
+        assert column.process_result_value(encoded, None) == payload
+    
+    def test_legacy_json_is_readable(self):
+        """Test reading rows written before the column type changed"""
+        assert PackedBools().process_result_value(b"[true, false]", None) == "[true, false]"
+
+class TestTestRecordPayloads:
+    """Test test record payloads through the database"""
+    
+    def test_round_trip(self, session: Session, test_user):
+        """Test that questions are stored compressed in full and the answers packed"""
+        payload = json.dumps(QUESTIONS)
+        record = TestRecord(
+            user_id=test_user.id, state_code="CA", test_type="car", category="road-signs",
+            score=50, total_questions=20, correct_answers=10, time_spent=300,
+            questions=payload,
+            user_answers=json.dumps([i % 4 for i in range(20)]),
+            is_correct=json.dumps([i % 2 == 0 for i in range(20)])
+        )
+        session.add(record)
+        session.commit()
+        
+        assert stored(session, record.id, "questions")[0] == ZLIB
+        assert len(stored(session, record.id, "questions")) < len(payload) // 3
+        
+        session.expire_all()
+        loaded = session.get(TestRecord, record.id)
+        assert json.loads(loaded.questions) == QUESTIONS
+        assert json.loads(loaded.user_answers) == [i % 4 for i in range(20)]
+        assert json.loads(loaded.is_correct) == [i % 2 == 0 for i in range(20)]
+    
+    def test_history_is_independent_of_the_bank(self, session: Session, test_user, monkeypatch):
+        """Test that editing or not loading the question bank never changes stored tests"""
+        import_questions(QUESTIONS, session)
+        session.commit()
+        load_question_bank(session)
+        record = TestRecord(
+            user_id=test_user.id, state_code="CA", test_type="car", category="road-signs",
+            score=50, total_questions=1, correct_answers=1, time_spent=30,
+            questions=json.dumps(QUESTIONS[:1]), user_answers="[0]", is_correct="[true]"
+        )
+        session.add(record)
+        session.commit()
+        
+        import_questions([dict(QUESTIONS[0], question="Edited?", correctAnswer=3)], session)
+        session.commit()
+        load_question_bank(session)
+        session.expire_all()
+        assert json.loads(session.get(TestRecord, record.id).questions) == QUESTIONS[:1]
+        
+        monkeypatch.setattr("app.services.question_bank._bank", QuestionBank())
+        session.expire_all()
+        assert json.loads(session.get(TestRecord, record.id).questions) == QUESTIONS[:1]
+
+class TestCompressedText:
+    """Test transparent compression of large text columns"""
+    
+    def test_short_values_are_stored_raw(self):
+        """Test values under the threshold"""
+        column = CompressedText(threshold=64)
+        assert column.process_bind_param("Barely used helmet", None) == b"\x00Barely used helmet"
+    
+    def test_large_values_are_compressed(self):
+        """Test values over the threshold round-trip through zlib"""
+        column = CompressedText()
+        value = "Excellent condition helmet, used once. " * 50
+        encoded = column.process_bind_param(value, None)
+        assert encoded[0] == ZLIB
+        assert len(encoded) < len(value) // 5
+        assert column.process_result_value(encoded, None) == value
+    
+    def test_codec_comes_from_setting(self, monkeypatch):
+        """Test that an installed zstandard doesn't change what is written"""
+        class FakeZstandard:
+            pass
+        monkeypatch.setattr(types, "zstandard", FakeZstandard)
+        assert CompressedText().process_bind_param("helmet " * 100, None)[0] == ZLIB
+    
+    def test_zstd_requires_package(self, monkeypatch):
+        """Test that choosing zstd without zstandard fails instead of writing unreadable rows"""
+        monkeypatch.setattr(types, "zstandard", None)
+        with pytest.raises(RuntimeError, match="zstandard"):
+            check_codec("zstd")
+        with pytest.raises(ValueError):
+            check_codec("lz4")
+        check_codec("zlib")
+    
+    def test_legacy_text_is_readable(self):
+        """Test reading values written before the column type changed"""
+        assert CompressedText().process_result_value("Plain description".encode(), None) == "Plain description"
+    
+    def test_listing_description_round_trip(self, session: Session, test_user):
+        """Test the column type on a model"""
+        description = "Selling my practice motorcycle gear, pickup only. " * 40
+        listing = UserListing(
+            user_id=test_user.id, title="Gear", description=description,
+            price=Decimal("10.00"), category="Gear", condition="used"
+        )
+        session.add(listing)
+        session.commit()
+        
+        raw = bytes(session.exec(text("SELECT description FROM user_listing WHERE id = :id").bindparams(id=listing.id)).one()[0])
+        assert len(raw) < len(description) // 5
+        session.expire_all()
+        assert session.get(UserListing, listing.id).description == description
@@ -0,0 +1,90 @@
+import pytest
+from sqlmodel import Session, select
+from datetime import datetime, date, timedelta
+from app.models.user import User
+from app.models.daily_activity import DailyActivity
+from app.services.activity_service import ActivityService
+from tests.conftest import add_record, make_record
+
+class TestLocalDate:
+    """Test timezone conversion of activity dates"""
+    
+    def test_utc_when_timezone_unset(self):
+        """Test that naive UTC timestamps map to their UTC date"""
+        assert ActivityService.local_date(datetime(2025, 3, 1, 2, 0), None) == date(2025, 3, 1)
+    
+    def test_converts_to_user_timezone(self):
+        """Test that early-UTC timestamps fall on the previous day in US timezones"""
+        assert ActivityService.local_date(datetime(2025, 3, 1, 2, 0), "America/Los_Angeles") == date(2025, 2, 28)
+    
+    def test_invalid_timezone_falls_back_to_utc(self):
+        """Test that an unknown timezone does not raise"""
+        assert ActivityService.local_date(datetime(2025, 3, 1, 2, 0), "Mars/Olympus") == date(2025, 3, 1)
+
+class TestDailyActivityRollup:
+    """Test rollup maintenance and summaries"""
+    
+    def test_record_test_upserts_single_row(self, session: Session, test_user: User):
+        """Test that multiple tests on the same day share one rollup row"""
+        now = datetime.utcnow()
+        for score in (80, 90):
+            add_record(session, test_user, score, now)
+        session.commit()
+        
+        rows = session.exec(select(DailyActivity).where(DailyActivity.user_id == test_user.id)).all()
+        assert len(rows) == 1
+        assert rows[0].test_count == 2
+        assert rows[0].total_score == 170
+        assert rows[0].time_spent == 600
+    
+    def test_summarize_counters_and_streaks(self, session: Session, test_user: User):
+        """Test weekly/monthly counters and streaks from rollup rows"""
+        today = ActivityService.today_for(test_user)
+        for days_ago in (0, 1, 2, 10, 11, 40):
+            session.add(DailyActivity(
+                user_id=test_user.id,
+                activity_date=today - timedelta(days=days_ago),
+                test_count=2,
+                total_score=160,
+                time_spent=600
+            ))
+        session.commit()
+        
+        summary = ActivityService.summarize(test_user, session)
+        assert summary["tests_this_week"] == 6
+        assert summary["tests_this_month"] == 10
+        assert summary["current_streak"] == 3
+        assert summary["longest_streak"] == 3
+    
+    def test_backfill_rebuilds_from_records(self, session: Session, test_user: User):
+        """Test chunked backfill produces the same rollup as live maintenance"""
+        base = datetime.utcnow() - timedelta(days=3)
+        for i in range(7):
+            session.add(make_record(test_user.id, 70 + i, base + timedelta(days=i % 3)))
+        idle = User(email="idle@example.com")
+        session.add(idle)
+        session.commit()
+        session.add(DailyActivity(user_id=test_user.id, activity_date=date(2000, 1, 1), test_count=99))
+        session.add(DailyActivity(user_id=idle.id, activity_date=date(2000, 1, 1), test_count=99))
+        session.commit()
+        
+        processed = ActivityService.backfill(session, chunk_size=1)
+        assert processed == 7
+        
+        rows = session.exec(select(DailyActivity).where(DailyActivity.user_id == test_user.id)).all()
+        assert len(rows) == 3
+        assert sum(r.test_count for r in rows) == 7
+        assert sum(r.total_score for r in rows) == sum(70 + i for i in range(7))
+        assert session.exec(select(DailyActivity).where(DailyActivity.user_id == idle.id)).all() == []
+    
+    def test_backfill_without_reset_adds_on_top(self, session: Session, test_user: User):
+        """Test that --no-reset keeps existing rows and adds historical records in record chunks"""
+        base = datetime.utcnow() - timedelta(days=3)
+        for i in range(4):
+            session.add(make_record(test_user.id, 80, base))
+        session.add(DailyActivity(user_id=test_user.id, activity_date=date(2000, 1, 1), test_count=99))
+        session.commit()
+        
+        assert ActivityService.backfill(session, chunk_size=3, reset=False) == 4
+        rows = session.exec(select(DailyActivity).where(DailyActivity.user_id == test_user.id)).all()
+        assert sorted(r.test_count for r in rows) == [4, 99]
@@ -0,0 +1,81 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.core.config import settings
+from sqlalchemy import create_engine, event
+from app.core import database
+from app.core.database import (
+    FALLBACK_MAX_CONNECTIONS, _create_engine, max_connections_for, pool_sizing, server_max_connections
+)
+
+class TestPoolSizing:
+    """Test per-worker pool sizing"""
+    
+    def test_single_worker_defaults(self):
+        """Test sizing for one worker against Postgres' default max_connections"""
+        assert pool_sizing(max_connections=100, reserved=10, workers=1) == (10, 80)
+    
+    def test_workers_share_the_connection_budget(self):
+        """Test that all workers' pools together fit in max_connections"""
+        size, overflow = pool_sizing(max_connections=100, reserved=10, workers=8)
+        assert (size, overflow) == (5, 6)
+        assert 8 * (size + overflow) <= 90
+    
+    def test_explicit_settings_win(self):
+        """Test configured pool_size and max_overflow"""
+        assert pool_sizing(100, 10, 4, pool_size=3, max_overflow=0) == (3, 0)
+    
+    def test_minimum_of_one_connection(self):
+        """Test sizing with more workers than connections"""
+        assert pool_sizing(max_connections=10, reserved=10, workers=4) == (1, 0)
+
+class TestServerMaxConnections:
+    """Test where max_connections comes from"""
+    
+    def test_reads_server_setting(self):
+        """Test SHOW max_connections on the server"""
+        probe = create_engine("sqlite://")
+        
+        @event.listens_for(probe, "before_cursor_execute", retval=True)
+        def show_as_select(conn, cursor, statement, parameters, context, executemany):
+            return ("SELECT 20", parameters) if statement == "SHOW max_connections" else (statement, parameters)
+        
+        assert server_max_connections(probe) == 20
+    
+    def test_falls_back_when_unreadable(self):
+        """Test the Postgres default when the query fails"""
+        assert server_max_connections(create_engine("sqlite://")) == FALLBACK_MAX_CONNECTIONS
+    
+    def test_setting_overrides_server(self, monkeypatch):
+        """Test that DB_MAX_CONNECTIONS skips the query"""
+        monkeypatch.setattr(settings, "DB_MAX_CONNECTIONS", 500)
+        assert max_connections_for("postgresql+psycopg://nobody@unreachable.invalid/roadready") == 500
+    
+    def test_pool_sized_from_server(self, monkeypatch):
+        """Test that the engine's pool is sized from the server's value"""
+        monkeypatch.setattr(database, "max_connections_for", lambda url: 20)
+        monkeypatch.setattr(settings, "DB_POOL_SIZE", 0)
+        monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", -1)
+        engine = _create_engine("postgresql+psycopg://nobody@unreachable.invalid/roadready")
+        expected = pool_sizing(20, settings.DB_RESERVED_CONNECTIONS, settings.WEB_CONCURRENCY)
+        assert (engine.pool.size(), engine.pool._max_overflow) == expected
+        engine.dispose()
+
+class TestAdminPoolEndpoint:
+    """Test the pool statistics endpoint"""
+    
+    def test_disabled_without_admin_token(self, client: TestClient, monkeypatch):
+        """Test that admin endpoints don't exist unless ADMIN_TOKEN is set"""
+        monkeypatch.setattr(settings, "ADMIN_TOKEN", "")
+        response = client.get("/api/v1/admin/db-pool", headers={"X-Admin-Token": ""})
+        assert response.status_code == 404
+    
+    def test_requires_matching_token(self, client: TestClient, monkeypatch):
+        """Test token check and response"""
+        monkeypatch.setattr(settings, "ADMIN_TOKEN", "secret")
+        assert client.get("/api/v1/admin/db-pool", headers={"X-Admin-Token": "wrong"}).status_code == 404
+        
+        response = client.get("/api/v1/admin/db-pool", headers={"X-Admin-Token": "secret"})
+        assert response.status_code == 200
+        data = response.json()
+        assert "pool_class" in data
+        assert data["pre_ping"] == settings.DB_POOL_PRE_PING
@@ -0,0 +1,172 @@
+import email
+import email.policy
+import pytest
+from datetime import date, datetime, timedelta
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+from app.core.mailer import SMTPSink, SMTPTransport, build_message
+from app.core.security import create_unsubscribe_token
+from app.models.analytics import UserStatistics
+from app.models.daily_activity import DailyActivity
+from app.models.user import User
+from app.services.activity_service import ActivityService
+from app.services.digest_service import DigestService
+from app.services.email_templates import compile_template, get_template
+
+TODAY = date(2026, 10, 19)
+
+def parse(data: bytes):
+    return email.message_from_bytes(data, policy=email.policy.default)
+
+class TestEmailTemplates:
+    """Test compiled templates and message serialization"""
+
+    def test_compile_template(self):
+        """Test placeholders, HTML escaping and unsupported fields"""
+        assert compile_template("Hi {name}, {count} tests")({"name": "Ann", "count": 3}) == "Hi Ann, 3 tests"
+        assert compile_template("<p>{name}</p>", escape=True)({"name": "<b>&"}) == "<p>&lt;b&gt;&amp;</p>"
+        assert compile_template("{{literal}}")({}) == "{literal}"
+        assert compile_template("")({}) == ""
+        template = compile_template("{a}-{b}")
+        assert (template({"a": 1, "b": 2}), template({"a": 3, "b": 4})) == ("1-2", "3-4")
+        with pytest.raises(KeyError):
+            compile_template("Hi {name}")({})
+        with pytest.raises(ValueError):
+            compile_template("{score:.1f}")
+
+    def test_templates_cached(self):
+        """Test that each template file is loaded and compiled once"""
+        assert get_template("weekly_digest") is get_template("weekly_digest")
+        assert get_template("welcome").subject({}) == "Welcome to RoadReady"
+
+    def test_build_message(self):
+        """Test that messages parse back with both parts and no injected headers"""
+        message = parse(build_message("a@example.com", "Héllo\r\nBcc: b@example.com", "Hi José\n.dot", "<p>Hi</p>").data)
+        assert message["Subject"] == "Héllo Bcc: b@example.com"
+        assert message["Bcc"] is None
+        assert message.get_body(("plain",)).get_content().replace("\r\n", "\n") == "Hi José\n.dot"
+        assert message.get_body(("html",)).get_content() == "<p>Hi</p>"
+
+    def test_build_message_headers(self):
+        """Test Date, a unique Message-ID and extra headers"""
+        first = parse(build_message("a@example.com", "Hi", "Hi", headers={"List-Unsubscribe": "<https://x/u>"}).data)
+        second = parse(build_message("a@example.com", "Hi", "Hi").data)
+        assert first["Date"].datetime.tzinfo is not None
+        assert first["Message-ID"].endswith("@roadready.app>")
+        assert first["Message-ID"] != second["Message-ID"]
+        assert first["List-Unsubscribe"] == "<https://x/u>"
+        assert second["List-Unsubscribe"] is None
+
+class TestWeeklyDigest:
+    """Test the bulk weekly digest sender"""
+
+    @pytest.fixture(name="sink")
+    def sink_fixture(self):
+        sink = SMTPSink().start()
+        yield sink
+        sink.stop()
+
+    def test_send_weekly(self, session: Session, sink: SMTPSink):
+        """Test digest content, recipients and one connection for all batches"""
+        users = [
+            User(email="streak@example.com", first_name="Ann", email_verified=True, current_streak=4, last_activity_date=TODAY - timedelta(days=1)),
+            User(email="new@example.com", email_verified=True),
+            User(email="unverified@example.com"),
+            User(email="inactive@example.com", email_verified=True, is_active=False),
+            User(email="unsubscribed@example.com", email_verified=True, digest_opt_out=True),
+        ]
+        session.add_all(users)
+        session.commit()
+        session.add_all([
+            UserStatistics(user_id=users[0].id, total_tests=12, pass_rate=75.0),
+            DailyActivity(user_id=users[0].id, activity_date=TODAY - timedelta(days=1), test_count=2, total_score=170),
+            DailyActivity(user_id=users[0].id, activity_date=TODAY - timedelta(days=3), test_count=1, total_score=70),
+            DailyActivity(user_id=users[0].id, activity_date=TODAY - timedelta(days=8), test_count=5, total_score=400),
+        ])
+        session.commit()
+
+        result = DigestService.send_weekly(session, SMTPTransport(sink.host, sink.port), batch_size=1, today=TODAY)
+        assert (result["sent"], result["failed"], result["skipped"]) == (2, 0, 0)
+        assert result["per_second"] > 0
+        assert sink.connections == 1
+        assert [m["to"] for m in sink.messages] == [["streak@example.com"], ["new@example.com"]]
+
+        first = parse(sink.messages[0]["data"])
+        assert first["Subject"] == "Your RoadReady week: 3 tests"
+        text = first.get_body(("plain",)).get_content()
+        assert "Hi Ann," in text
+        assert "average score 80" in text
+        assert "12 tests, pass rate 75%" in text
+        assert "keep your 4-day streak going" in text
+        assert first["List-Unsubscribe-Post"] == "List-Unsubscribe=One-Click"
+        assert f"token={create_unsubscribe_token(users[0].id)}>" in first["List-Unsubscribe"]
+
+        second = parse(sink.messages[1]["data"]).get_body(("plain",)).get_content()
+        assert "Hi there," in second
+        assert "start a new streak" in second
+
+    def test_rerun_skips_sent_users(self, session: Session, sink: SMTPSink):
+        """Test that a second run in the same week sends nothing, and the next week sends again"""
+        session.add_all([User(email=f"user{i}@example.com", email_verified=True) for i in range(3)])
+        session.commit()
+        transport = SMTPTransport(sink.host, sink.port)
+
+        assert DigestService.send_weekly(session, transport, batch_size=2, today=TODAY)["sent"] == 3
+        rerun = DigestService.send_weekly(session, transport, batch_size=2, today=TODAY + timedelta(days=2))
+        assert (rerun["sent"], rerun["skipped"]) == (0, 3)
+        assert DigestService.send_weekly(session, transport, today=TODAY + timedelta(days=7))["sent"] == 3
+        assert len(sink.messages) == 6
+
+    def test_failed_sends_not_recorded(self, session: Session, sink: SMTPSink):
+        """Test that a user whose digest failed gets it on the next run"""
+        user = User(email="a@example.com", email_verified=True)
+        session.add(user)
+        session.commit()
+        sink.reject.add("a@example.com")
+
+        assert DigestService.send_weekly(session, SMTPTransport(sink.host, sink.port), today=TODAY)["failed"] == 1
+        session.refresh(user)
+        assert user.last_digest_on is None
+
+    def test_local_dates(self, session: Session, sink: SMTPSink):
+        """Test that each user's week and streak use their own local date"""
+        now = datetime.utcnow()
+        users = []
+        for tz_name in ("Pacific/Kiritimati", "Pacific/Pago_Pago"):  # UTC+14 and UTC-11
+            today = ActivityService.local_date(now, tz_name)
+            user = User(email=f"{tz_name.lower()}@example.com", email_verified=True, timezone=tz_name,
+                        current_streak=2, last_activity_date=today)
+            session.add(user)
+            session.commit()
+            session.add_all([
+                DailyActivity(user_id=user.id, activity_date=today - timedelta(days=6), test_count=1, total_score=90),
+                DailyActivity(user_id=user.id, activity_date=today - timedelta(days=7), test_count=4, total_score=300),
+            ])
+            users.append((user, today))
+        session.commit()
+
+        assert DigestService.send_weekly(session, SMTPTransport(sink.host, sink.port))["sent"] == 2
+        for message, (user, today) in zip(sink.messages, users):
+            parsed = parse(message["data"])
+            assert parsed["Subject"] == "Your RoadReady week: 1 tests"
+            assert "on a 2-day streak" in parsed.get_body(("plain",)).get_content()
+            session.refresh(user)
+            assert user.last_digest_on == today
+
+class TestUnsubscribe:
+    """Test the one-click digest unsubscribe endpoint"""
+
+    def test_unsubscribe(self, client: TestClient, session: Session):
+        """Test that a valid token opts the user out and others are rejected"""
+        user = User(email="a@example.com", email_verified=True)
+        session.add(user)
+        session.commit()
+
+        response = client.post(f"/api/v1/auth/unsubscribe-digest?token={create_unsubscribe_token(user.id)}",
+                               data={"List-Unsubscribe": "One-Click"})
+        assert response.status_code == 200
+        session.refresh(user)
+        assert user.digest_opt_out
+
+        assert client.post("/api/v1/auth/unsubscribe-digest?token=not-a-token").status_code == 400
+        assert client.post(f"/api/v1/auth/unsubscribe-digest?token={create_unsubscribe_token(user.id + 1)}").status_code == 400
@@ -0,0 +1,111 @@
+import pytest
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+from app.core.mailer import SMTPSink, SMTPTransport
+from app.models.email_outbox import EmailOutbox
+from app.models.user import User
+from app.services.email_outbox import EmailOutboxWorker
+from app.services.email_service import EmailService
+
+@pytest.fixture(name="sink")
+def sink_fixture():
+    sink = SMTPSink().start()
+    yield sink
+    sink.stop()
+
+@pytest.fixture(name="worker")
+def worker_fixture(session: Session, sink: SMTPSink):
+    return EmailOutboxWorker(session.get_bind(), SMTPTransport(sink.host, sink.port), batch_size=10, max_attempts=2)
+
+class TestEmailQueue:
+    """Test that request handlers queue emails in their own transaction"""
+
+    def test_signup_queues_welcome(self, client: TestClient, session: Session):
+        """Test that signup writes the welcome email to the outbox instead of sending it"""
+        response = client.post("/api/v1/auth/signup", json={"email": "new@example.com", "password": "SecurePass123!"})
+        assert response.status_code == 201
+        email = session.exec(select(EmailOutbox)).one()
+        assert (email.kind, email.to_email, email.status) == ("welcome", "new@example.com", "pending")
+
+    def test_password_reset_queues_link(self, client: TestClient, session: Session, test_user: User):
+        """Test that the reset link is queued only for existing users"""
+        client.post("/api/v1/auth/request-password-reset", json={"email": "nobody@example.com"})
+        assert session.exec(select(EmailOutbox)).all() == []
+
+        client.post("/api/v1/auth/request-password-reset", json={"email": test_user.email})
+        email = session.exec(select(EmailOutbox)).one()
+        assert email.kind == "password_reset"
+        assert "reset-password?token=" in email.payload["link"]
+
+    def test_rollback_discards_email(self, session: Session):
+        """Test that an email queued in a rolled back transaction is never sent"""
+        EmailService.send_welcome_email(session, "new@example.com")
+        session.rollback()
+        assert session.exec(select(EmailOutbox)).all() == []
+
+class TestEmailOutboxWorker:
+    """Test delivery to a local SMTP sink"""
+
+    def test_batch_over_one_connection(self, session: Session, worker: EmailOutboxWorker, sink: SMTPSink):
+        """Test that a batch is sent over one connection and marked sent"""
+        for i in range(3):
+            EmailService.send_welcome_email(session, f"user{i}@example.com")
+        session.commit()
+
+        assert worker.run_once() == 3
+        assert worker.run_once() == 0
+        assert sink.connections == 1
+        assert [m["to"] for m in sink.messages] == [[f"user{i}@example.com"] for i in range(3)]
+        assert b"Subject: Welcome to RoadReady" in sink.messages[0]["data"]
+        session.expire_all()
+        assert {e.status for e in session.exec(select(EmailOutbox)).all()} == {"sent"}
+
+    def test_retry_with_backoff(self, session: Session, worker: EmailOutboxWorker, sink: SMTPSink):
+        """Test that a refused recipient is retried after the backoff and fails after max attempts"""
+        EmailService.send_welcome_email(session, "bounce@example.com")
+        EmailService.send_welcome_email(session, "ok@example.com")
+        session.commit()
+        sink.reject.add("bounce@example.com")
+
+        now = datetime.utcnow()
+        assert worker.run_once(now) == 2
+        assert [m["to"] for m in sink.messages] == [["ok@example.com"]]
+        session.expire_all()
+        bounced = session.exec(select(EmailOutbox).where(EmailOutbox.to_email == "bounce@example.com")).one()
+        assert (bounced.status, bounced.attempts) == ("pending", 1)
+        assert bounced.next_attempt_at == now + timedelta(seconds=worker.retry_base_seconds)
+
+        assert worker.run_once(now + timedelta(seconds=1)) == 0
+        assert worker.run_once(now + timedelta(seconds=worker.retry_base_seconds)) == 1
+        session.expire_all()
+        bounced = session.get(EmailOutbox, bounced.id)
+        assert (bounced.status, bounced.attempts) == ("failed", 2)
+        assert "refused" in bounced.last_error
+
+    def test_render_failure_is_per_row(self, session: Session, worker: EmailOutboxWorker, sink: SMTPSink):
+        """Test that a row that can't be rendered backs off alone while the rest of the batch is sent"""
+        session.add(EmailOutbox(kind="no_such_template", to_email="broken@example.com", payload={}))
+        EmailService.send_welcome_email(session, "ok@example.com")
+        session.commit()
+
+        now = datetime.utcnow()
+        assert worker.run_once(now) == 2
+        assert [m["to"] for m in sink.messages] == [["ok@example.com"]]
+        session.expire_all()
+        broken = session.exec(select(EmailOutbox).where(EmailOutbox.to_email == "broken@example.com")).one()
+        assert (broken.status, broken.attempts) == ("pending", 1)
+        assert broken.next_attempt_at == now + timedelta(seconds=worker.retry_base_seconds)
+        assert broken.last_error.startswith("render failed")
+
+    def test_connection_failure(self, session: Session):
+        """Test that an unreachable server leaves the whole batch pending for retry"""
+        worker = EmailOutboxWorker(session.get_bind(), SMTPTransport("127.0.0.1", 1, timeout=1))
+        EmailService.send_welcome_email(session, "new@example.com")
+        session.commit()
+
+        assert worker.run_once() == 1
+        session.expire_all()
+        email = session.exec(select(EmailOutbox)).one()
+        assert (email.status, email.attempts) == ("pending", 1)
+        assert email.last_error.startswith("connection")
@@ -116,21 +116,22 @@ class TestOnboardingProfiles:
             user_id=test_user.id,
             profile_name="CA Class C",
             state="CA",
-            test_type="car",
-            is_active=True
+            test_type="car"
         )
         profile2 = OnboardingProfile(
             user_id=test_user.id,
             profile_name="TX Motorcycle",
             state="TX",
-            test_type="motorcycle",
-            is_active=False
+            test_type="motorcycle"
         )
         session.add(profile1)
         session.add(profile2)
         session.commit()
         session.refresh(profile1)
         session.refresh(profile2)
+        test_user.active_profile_id = profile1.id
+        session.add(test_user)
+        session.commit()
         
         # Activate profile2
         response = client.post(
@@ -144,11 +145,10 @@ class TestOnboardingProfiles:
         assert data["id"] == profile2.id
         
         # Verify profile1 is now inactive
-        session.refresh(profile1)
-        assert profile1.is_active is False
+        session.refresh(test_user)
+        assert test_user.active_profile_id == profile2.id
         
         # Verify user's state and test_type updated
-        session.refresh(test_user)
         assert test_user.state == "TX"
         assert test_user.test_type == "motorcycle"
     
@@ -159,19 +159,20 @@ class TestOnboardingProfiles:
             user_id=test_user.id,
             profile_name="CA Class C",
             state="CA",
-            test_type="car",
-            is_active=False
+            test_type="car"
         )
         profile2 = OnboardingProfile(
             user_id=test_user.id,
             profile_name="TX Motorcycle",
             state="TX",
-            test_type="motorcycle",
-            is_active=True
+            test_type="motorcycle"
         )
         session.add(profile1)
         session.add(profile2)
         session.commit()
+        test_user.active_profile_id = profile2.id
+        session.add(test_user)
+        session.commit()
         
         response = client.get(
             "/api/v1/onboarding-profiles/active",
@@ -225,3 +226,37 @@ class TestOnboardingProfiles:
             headers=auth_headers
         )
         assert response.status_code == 404
+    
+    def test_single_active_profile(self, client: TestClient, auth_headers: dict):
+        """Test that activating profiles in turn always leaves exactly one active"""
+        ids = []
+        for name, test_type in (("Car", "car"), ("Bike", "motorcycle"), ("Truck", "cdl")):
+            response = client.post(
+                "/api/v1/onboarding-profiles/",
+                headers=auth_headers,
+                json={"profile_name": name, "state": "CA", "test_type": test_type}
+            )
+            ids.append(response.json()["id"])
+        
+        for profile_id in (ids[0], ids[2], ids[1]):
+            assert client.post(f"/api/v1/onboarding-profiles/{profile_id}/activate", headers=auth_headers).status_code == 200
+            profiles = client.get("/api/v1/onboarding-profiles/", headers=auth_headers).json()
+            assert [p["id"] for p in profiles if p["is_active"]] == [profile_id]
+        
+        me = client.get("/api/v1/auth/me", headers=auth_headers).json()
+        assert me["active_profile"]["id"] == ids[1]
+        assert me["test_type"] == "motorcycle"
+    
+    def test_delete_active_profile(self, client: TestClient, auth_headers: dict):
+        """Test that deleting the active profile leaves no active profile"""
+        response = client.post(
+            "/api/v1/onboarding-profiles/",
+            headers=auth_headers,
+            json={"profile_name": "Car", "state": "CA", "test_type": "car"}
+        )
+        profile_id = response.json()["id"]
+        client.post(f"/api/v1/onboarding-profiles/{profile_id}/activate", headers=auth_headers)
+        
+        assert client.delete(f"/api/v1/onboarding-profiles/{profile_id}", headers=auth_headers).status_code == 204
+        assert client.get("/api/v1/onboarding-profiles/active", headers=auth_headers).json() == {"profile": None}
+        assert client.get("/api/v1/auth/me", headers=auth_headers).json()["active_profile"] is None
@@ -0,0 +1,89 @@
+import pytest
+from datetime import datetime, timedelta
+from decimal import Decimal
+from sqlmodel import Session
+from app.models.marketplace import UserListing
+from app.models.user import User
+from app.services.parquet_export import AnalyticsExportService, SAFETY_LAG
+from tests.conftest import add_records
+
+pq = pytest.importorskip("pyarrow.parquet")
+ds = pytest.importorskip("pyarrow.dataset")
+
+# Well outside the export's safety lag
+NOON = datetime(2026, 10, 19, 12, 0)
+
+class TestParquetExport:
+    """Test the incremental Parquet export"""
+    
+    def test_partitions_by_date_and_state(self, session: Session, test_user: User, tmp_path):
+        """Test partition layout and row contents"""
+        add_records(session, test_user.id, [80] * 3, created_at=NOON, is_correct="[true, false]")
+        add_records(session, test_user.id, [80] * 2, created_at=datetime(2026, 10, 18, 9, 0), state_code="NY")
+        
+        counts = AnalyticsExportService.export(session, tmp_path, tables=["test_records"], chunk_size=2)
+        assert counts == {"test_records": 5}
+        
+        ca = pq.read_table(tmp_path / "test_records" / "date=2026-10-19" / "state_code=CA")
+        ny = pq.read_table(tmp_path / "test_records" / "date=2026-10-18" / "state_code=NY")
+        assert ca.num_rows == 3
+        assert ny.num_rows == 2
+        assert ca.column("is_correct").to_pylist()[0] == "[true, false]"
+        
+        dataset = ds.dataset(tmp_path / "test_records", partitioning="hive")
+        assert sorted(dataset.to_table().column("state_code").to_pylist()) == ["CA"] * 3 + ["NY"] * 2
+    
+    def test_exports_only_new_rows(self, session: Session, test_user: User, tmp_path):
+        """Test that watermarks make repeated runs incremental"""
+        add_records(session, test_user.id, [80] * 4, created_at=NOON)
+        AnalyticsExportService.export(session, tmp_path, tables=["test_records"])
+        assert AnalyticsExportService.export(session, tmp_path, tables=["test_records"]) == {"test_records": 0}
+        
+        add_records(session, test_user.id, [80] * 2, created_at=NOON)
+        assert AnalyticsExportService.export(session, tmp_path, tables=["test_records"]) == {"test_records": 2}
+        assert ds.dataset(tmp_path / "test_records", partitioning="hive").count_rows() == 6
+    
+    def test_recent_rows_wait_for_the_next_run(self, session: Session, test_user: User, tmp_path):
+        """Test that rows inside the safety lag are left for a later run, not skipped"""
+        add_records(session, test_user.id, [80] * 2, created_at=NOON)
+        add_records(session, test_user.id, [80], created_at=datetime.utcnow())
+        assert AnalyticsExportService.export(session, tmp_path, tables=["test_records"]) == {"test_records": 2}
+        
+        later = datetime.utcnow() + SAFETY_LAG + timedelta(minutes=1)
+        assert AnalyticsExportService.export(session, tmp_path, tables=["test_records"], now=later) == {"test_records": 1}
+        assert ds.dataset(tmp_path / "test_records", partitioning="hive").count_rows() == 3
+    
+    def test_updated_users_are_exported_again(self, session: Session, test_user: User, tmp_path):
+        """Test the (updated_at, id) watermark and credential and PII exclusion"""
+        later = datetime.utcnow() + SAFETY_LAG + timedelta(hours=1)
+        assert AnalyticsExportService.export(session, tmp_path, tables=["user"], now=later) == {"user": 1}
+        test_user.updated_at = datetime.utcnow() + timedelta(minutes=1)
+        session.add(test_user)
+        session.commit()
+        
+        assert AnalyticsExportService.export(session, tmp_path, tables=["user"], now=later) == {"user": 1}
+        users = ds.dataset(tmp_path / "user", partitioning="hive").to_table()
+        assert users.num_rows == 2
+        for column in ("hashed_password", "email", "first_name", "phone_number", "date_of_birth", "license_number"):
+            assert column not in users.column_names
+    
+    def test_updated_listings_are_exported_again(self, session: Session, test_user: User, tmp_path):
+        """Test that a listing status change moves its updated_at past the watermark"""
+        listing = UserListing(
+            user_id=test_user.id, title="Mirror", price=Decimal("10.00"), category="gear", condition="new",
+            location_state="CA", created_at=NOON, updated_at=NOON
+        )
+        session.add(listing)
+        session.commit()
+        later = datetime.utcnow() + SAFETY_LAG + timedelta(hours=1)
+        assert AnalyticsExportService.export(session, tmp_path, tables=["user_listing"], now=later) == {"user_listing": 1}
+        assert AnalyticsExportService.export(session, tmp_path, tables=["user_listing"], now=later) == {"user_listing": 0}
+        
+        listing.status = "sold"
+        session.add(listing)
+        session.commit()
+        assert listing.updated_at > NOON
+        
+        assert AnalyticsExportService.export(session, tmp_path, tables=["user_listing"], now=later) == {"user_listing": 1}
+        listings = ds.dataset(tmp_path / "user_listing", partitioning="hive").to_table()
+        assert sorted(listings.column("status").to_pylist()) == ["active", "sold"]
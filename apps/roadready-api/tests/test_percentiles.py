@@ -0,0 +1,96 @@
+import pytest
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+from app.models.user import User
+from app.models.score_distribution import ScoreDistribution
+from app.services.percentile_service import PercentileService, ALL_CATEGORIES, SAFETY_LAG
+from tests.conftest import add_records
+
+def earlier() -> datetime:
+    """A creation time outside the refresh's safety lag"""
+    return datetime.utcnow() - SAFETY_LAG - timedelta(minutes=1)
+
+class TestPercentileService:
+    """Test the histogram quantiles and incremental refresh"""
+
+    def test_quantile_and_rank(self):
+        """Test nearest-rank quantiles and mid-rank percentiles"""
+        counts = [0] * 101
+        for score in (50, 60, 70, 80, 90):
+            counts[score] += 1
+        assert PercentileService.quantile(counts, 0.5) == 70
+        assert PercentileService.quantile(counts, 0.1) == 50
+        assert PercentileService.quantile(counts, 0.9) == 90
+        assert PercentileService.percentile_rank(counts, 70) == 50.0
+        assert PercentileService.percentile_rank(counts, 100) == 100.0
+        assert PercentileService.percentile_rank(counts, 0) == 0.0
+
+    def test_incremental_refresh_matches_full(self, session: Session, test_user: User):
+        """Test that refreshing in steps equals a full rebuild"""
+        user_id = test_user.id
+        add_records(session, user_id, [40, 65, 72], created_at=earlier())
+        assert PercentileService.refresh(session, chunk_size=2) == 3
+        add_records(session, user_id, [88, 95], category="right_of_way", created_at=earlier())
+        assert PercentileService.refresh(session) == 2
+        assert PercentileService.refresh(session) == 0
+
+        incremental = PercentileService.get(session, "CA", "car")
+        expected = (incremental.counts, incremental.total_tests, incremental.p50)
+        assert incremental.total_tests == 5
+        assert incremental.p50 == 72
+        assert PercentileService.get(session, "CA", "car", "right_of_way").total_tests == 2
+
+        PercentileService.refresh(session, full=True)
+        rebuilt = PercentileService.get(session, "CA", "car", ALL_CATEGORIES)
+        assert (rebuilt.counts, rebuilt.total_tests, rebuilt.p50) == expected
+        assert len(session.exec(select(ScoreDistribution)).all()) == 3
+
+    def test_recent_records_wait_for_the_next_refresh(self, session: Session, test_user: User):
+        """Test that records inside the safety lag are folded in later, not skipped"""
+        add_records(session, test_user.id, [60, 70], created_at=earlier())
+        add_records(session, test_user.id, [80])
+        assert PercentileService.refresh(session) == 2
+        assert PercentileService.refresh(session) == 0
+
+        later = datetime.utcnow() + SAFETY_LAG + timedelta(minutes=1)
+        assert PercentileService.refresh(session, now=later) == 1
+        assert PercentileService.get(session, "CA", "car").total_tests == 3
+
+    def test_full_rebuild_replaces_rows(self, session: Session, test_user: User):
+        """Test that a full rebuild drops distributions whose records are gone"""
+        session.add(ScoreDistribution(state_code="NY", test_type="car", category=ALL_CATEGORIES, counts=[1] * 101))
+        session.commit()
+        add_records(session, test_user.id, [75], created_at=earlier())
+
+        assert PercentileService.refresh(session, full=True) == 1
+        assert PercentileService.get(session, "NY", "car") is None
+        assert PercentileService.get(session, "CA", "car").total_tests == 1
+
+class TestPercentileEndpoint:
+    """Test GET /statistics/percentile"""
+
+    def test_percentile(self, client: TestClient, auth_headers: dict, session: Session, test_user: User):
+        """Test ranking a score against the user's state and test type"""
+        headers = {"Authorization": auth_headers["Authorization"]}
+        assert client.get("/api/v1/statistics/percentile?score=80", headers=headers).status_code == 404
+
+        add_records(session, test_user.id, [50, 60, 70, 80, 90], created_at=earlier())
+        add_records(session, test_user.id, [100], test_type="motorcycle", created_at=earlier())
+        PercentileService.refresh(session)
+
+        data = client.get("/api/v1/statistics/percentile?score=80", headers=headers).json()
+        assert data["state_code"] == "CA"
+        assert data["test_type"] == "car"
+        assert data["category"] is None
+        assert data["percentile"] == 70.0
+        assert data["total_tests"] == 5
+        assert data["p50"] == 70
+
+        data = client.get(
+            "/api/v1/statistics/percentile?score=100&state_code=ca&test_type=motorcycle", headers=headers
+        ).json()
+        assert (data["total_tests"], data["percentile"]) == (1, 50.0)
+        response = client.get("/api/v1/statistics/percentile?score=80&category=parking", headers=headers)
+        assert response.status_code == 404
+        assert client.get("/api/v1/statistics/percentile?score=101", headers=headers).status_code == 422
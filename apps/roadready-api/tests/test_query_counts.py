@@ -0,0 +1,217 @@
+import json
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+from app.core import database
+from app.core.database import ReplicaSet
+from app.models.marketplace import UserListing
+from app.models.onboarding_profile import OnboardingProfile
+from app.models.user import User, Achievement
+from app.services.gamification_service import GamificationService
+from tests.conftest import QueryCounter
+
+# Every authenticated request: session lookup, session last_activity update, user lookup
+AUTH_STATEMENTS = 3
+
+QUESTIONS = [
+    {"id": "q1", "stateCode": "CA", "category": "signs", "question": "Stop sign shape?", "options": ["Octagon", "Circle"], "correctAnswer": 0},
+    {"id": "q2", "stateCode": "CA", "category": "signs", "question": "Yield sign shape?", "options": ["Square", "Triangle"], "correctAnswer": 1},
+]
+
+TEST_RECORD = {
+    "state_code": "CA",
+    "test_type": "car",
+    "category": "signs",
+    "score": 50,
+    "total_questions": 2,
+    "correct_answers": 1,
+    "time_spent": 120,
+    "questions": json.dumps(QUESTIONS),
+    "user_answers": "[0, 0]",
+    "is_correct": "[true, false]",
+}
+
+@pytest.fixture(name="headers")
+def headers_fixture(auth_headers: dict):
+    return {"Authorization": auth_headers["Authorization"]}
+
+class TestQueryCounts:
+    """Statement budgets for hot routes: one commit per request and no refresh round trips"""
+
+    def test_get_me(self, client: TestClient, headers: dict, query_counter):
+        """Test GET /auth/me"""
+        query_counter.reset()
+        assert client.get("/api/v1/auth/me", headers=headers).status_code == 200
+        assert len(query_counter) == AUTH_STATEMENTS
+        assert query_counter.commits == 1
+
+    def test_get_me_includes_active_profile(self, client: TestClient, headers: dict, query_counter, session: Session, test_user: User):
+        """Test that the active profile is loaded with the user, not by another query"""
+        profile = OnboardingProfile(user_id=test_user.id, profile_name="Car", state="CA", test_type="car")
+        session.add(profile)
+        session.commit()
+        test_user.active_profile_id = profile.id
+        session.add(test_user)
+        session.commit()
+        session.expunge_all()
+
+        query_counter.reset()
+        response = client.get("/api/v1/auth/me", headers=headers)
+        assert response.json()["active_profile"]["profile_name"] == "Car"
+        assert response.json()["active_profile"]["is_active"] is True
+        assert len(query_counter) == AUTH_STATEMENTS
+
+    def test_activate_profile(self, client: TestClient, headers: dict, query_counter, session: Session, test_user: User):
+        """Test POST /onboarding-profiles/{id}/activate: profile lookup and one UPDATE of the user"""
+        profiles = [OnboardingProfile(user_id=test_user.id, profile_name=name, state="CA", test_type=name) for name in ("car", "motorcycle")]
+        session.add_all(profiles)
+        session.commit()
+        profile_ids = [profile.id for profile in profiles]
+        session.expunge_all()
+
+        query_counter.reset()
+        response = client.post(f"/api/v1/onboarding-profiles/{profile_ids[1]}/activate", headers=headers)
+        assert response.status_code == 200
+        assert len(query_counter) == AUTH_STATEMENTS + 2
+        assert sum(statement.startswith("UPDATE user") for statement in query_counter.statements) == 1
+
+    def test_update_profile(self, client: TestClient, headers: dict, query_counter):
+        """Test PATCH /auth/me: a single UPDATE, no re-select"""
+        query_counter.reset()
+        response = client.patch("/api/v1/auth/me", headers=headers, json={"first_name": "Updated"})
+        assert response.status_code == 200
+        assert response.json()["first_name"] == "Updated"
+        assert len(query_counter) == AUTH_STATEMENTS + 1
+        assert query_counter.commits == 1
+
+    def test_create_test_record(self, client: TestClient, headers: dict, query_counter):
+        """Test POST /test-records/ including rollups, attempts, ratings and review scheduling"""
+        query_counter.reset()
+        response = client.post("/api/v1/test-records/", headers=headers, json=TEST_RECORD)
+        assert response.status_code == 201
+        assert response.json()["id"]
+        assert len(query_counter) == AUTH_STATEMENTS + 17
+        assert query_counter.commits == 1
+
+    def test_list_test_records(self, client: TestClient, headers: dict, query_counter):
+        """Test GET /test-records/: count and page"""
+        client.post("/api/v1/test-records/", headers=headers, json=TEST_RECORD)
+        query_counter.reset()
+        assert client.get("/api/v1/test-records/", headers=headers).status_code == 200
+        assert len(query_counter) == AUTH_STATEMENTS + 2
+        assert query_counter.commits == 1
+
+    def test_get_statistics(self, client: TestClient, headers: dict, query_counter):
+        """Test GET /statistics/"""
+        client.post("/api/v1/test-records/", headers=headers, json=TEST_RECORD)
+        query_counter.reset()
+        assert client.get("/api/v1/statistics/", headers=headers).status_code == 200
+        assert len(query_counter) == AUTH_STATEMENTS + 4
+        assert query_counter.commits == 1
+
+    def test_get_statistics_cached(self, client: TestClient, headers: dict, query_counter):
+        """Test that repeated polls cost only authentication until the next test record"""
+        client.post("/api/v1/test-records/", headers=headers, json=TEST_RECORD)
+        first = client.get("/api/v1/statistics/", headers=headers)
+        query_counter.reset()
+        second = client.get("/api/v1/statistics/", headers=headers)
+        assert second.json() == first.json()
+        assert len(query_counter) == AUTH_STATEMENTS
+        query_counter.reset()
+        response = client.get("/api/v1/statistics/", headers={**headers, "If-None-Match": first.headers["ETag"]})
+        assert response.status_code == 304
+        assert len(query_counter) == AUTH_STATEMENTS
+
+    @pytest.mark.parametrize("with_replica", [False, True])
+    def test_get_readiness_active_profile(self, client: TestClient, headers: dict, query_counter, session: Session, test_user: User, monkeypatch, with_replica):
+        """Test that the active profile comes from the primary session even when reads go to a replica"""
+        profile = OnboardingProfile(user_id=test_user.id, profile_name="Bike", state="CA", test_type="motorcycle")
+        session.add(profile)
+        session.commit()
+        test_user.active_profile_id = profile.id
+        session.add(test_user)
+        session.commit()
+        session.expunge_all()
+        if with_replica:
+            # A replica on the test engine, so its statements are counted too
+            monkeypatch.setattr(database, "replicas", ReplicaSet([session.get_bind()], cooldown_seconds=30))
+
+        query_counter.reset()
+        response = client.get("/api/v1/statistics/readiness", headers=headers)
+        assert response.json()["test_type"] == "motorcycle"
+        # Auth, then the readiness row
+        assert len(query_counter) == AUTH_STATEMENTS + 1
+
+    def test_update_streak(self, client: TestClient, headers: dict, query_counter):
+        """Test POST /gamification/update-streak: the service no longer commits itself"""
+        query_counter.reset()
+        assert client.post("/api/v1/gamification/update-streak", headers=headers).status_code == 200
+        assert len(query_counter) == AUTH_STATEMENTS + 1
+        assert query_counter.commits == 1
+
+    def test_create_listing(self, client: TestClient, headers: dict, query_counter):
+        """Test POST /marketplace/listings: the generated id comes back from the INSERT"""
+        query_counter.reset()
+        response = client.post(
+            "/api/v1/marketplace/listings",
+            headers=headers,
+            json={"title": "Helmet", "price": 25, "category": "gear", "condition": "used"}
+        )
+        assert response.status_code == 200
+        assert response.json()["id"]
+        assert len(query_counter) == AUTH_STATEMENTS + 1
+        assert query_counter.commits == 1
+
+    @pytest.mark.query_budget(AUTH_STATEMENTS + 2)
+    def test_create_inquiry(self, client: TestClient, headers: dict, query_counter, session: Session, verified_user: User):
+        """Test POST /marketplace/listings/{id}/inquire"""
+        listing = UserListing(user_id=verified_user.id, title="Mirror", price=10, category="gear", condition="new")
+        session.add(listing)
+        session.commit()
+        listing_id = listing.id
+        # Start from an empty identity map, as a real request does
+        session.expunge_all()
+
+        query_counter.reset()
+        response = client.post(f"/api/v1/marketplace/listings/{listing_id}/inquire", headers=headers, json={})
+        assert response.status_code == 200
+        assert len(query_counter) == AUTH_STATEMENTS + 2
+        assert query_counter.commits == 1
+
+    def test_award_test_xp_checks_achievements_once(self, session: Session, test_user: User, query_counter):
+        """Test that several reachable achievements are looked up with one query"""
+        query_counter.reset()
+        result = GamificationService.award_test_xp(test_user, score=100, test_count=1, db=session)
+        session.flush()
+        assert {a["type"] for a in result["new_achievements"]} == {"perfect_score", "first_test"}
+        assert sum("FROM achievement" in statement for statement in query_counter.statements) == 1
+
+        # Already earned: nothing new
+        result = GamificationService.award_test_xp(test_user, score=100, test_count=1, db=session)
+        assert result["new_achievements"] == []
+
+class TestQueryDetector:
+    """Test the per-request statement checks behind the client fixture"""
+
+    def test_repeated_statement_with_different_parameters(self):
+        """Test that a per-row loop of the same query is reported"""
+        counter = QueryCounter()
+        counter.check_request("GET /things", [("SELECT * FROM user WHERE id = ?", (1,)), ("SELECT * FROM user WHERE id = ?", (2,))])
+        assert len(counter.violations) == 1
+        assert "N+1" in counter.violations[0]
+
+    def test_identical_repeats_and_opt_out(self):
+        """Test that identical repeats pass, and allow_repeated disables the check"""
+        counter = QueryCounter()
+        counter.check_request("GET /things", [("SELECT 1", ()), ("SELECT 1", ())])
+        assert counter.violations == []
+
+        counter = QueryCounter(allow_repeated=True)
+        counter.check_request("GET /things", [("SELECT ?", (1,)), ("SELECT ?", (2,))])
+        assert counter.violations == []
+
+    def test_budget(self):
+        """Test that exceeding the declared budget is reported"""
+        counter = QueryCounter(budget=1)
+        counter.check_request("GET /things", [("SELECT 1", ()), ("SELECT 2", ())])
+        assert "budget 1" in counter.violations[0]
@@ -0,0 +1,102 @@
+import json
+import pytest
+from sqlmodel import Session, func, select
+from app.models.user import User
+from app.models.test_record import TestRecord
+from app.models.question_attempt import QuestionAttempt
+from app.services.question_analytics_service import QuestionAnalyticsService
+from tests.conftest import make_record
+
+QUESTIONS = [
+    {"id": "rs_001", "category": "road-signs", "correctAnswer": 1},
+    {"id": "tl_001", "category": "traffic-laws", "correctAnswer": 1},
+    {"id": "sd_001", "category": "safe-driving", "correctAnswer": 2},
+]
+
+def answered_record(user: User, answers: list, correct: list) -> TestRecord:
+    """A mixed test over QUESTIONS with the given answers"""
+    return make_record(
+        user.id,
+        round(100 * sum(correct) / len(correct)),
+        category="mixed",
+        total_questions=len(QUESTIONS),
+        correct_answers=sum(correct),
+        time_spent=120,
+        questions=json.dumps(QUESTIONS),
+        user_answers=json.dumps(answers),
+        is_correct=json.dumps(correct),
+    )
+
+class TestExtractAttempts:
+    """Test normalization of test record JSON payloads"""
+    
+    def test_extracts_one_row_per_question(self, test_user: User):
+        """Test that each question becomes an attempt with its own category"""
+        record = answered_record(test_user, [1, 0, None], [True, False, False])
+        attempts = QuestionAnalyticsService.extract_attempts(record)
+        
+        assert [a.question_id for a in attempts] == ["rs_001", "tl_001", "sd_001"]
+        assert [a.category for a in attempts] == ["road-signs", "traffic-laws", "safe-driving"]
+        assert [a.is_correct for a in attempts] == [True, False, False]
+        assert attempts[2].user_answer is None
+    
+    def test_malformed_payload_yields_nothing(self, test_user: User):
+        """Test that invalid JSON is ignored instead of failing the insert"""
+        record = answered_record(test_user, [], [True])
+        record.questions = "not json"
+        assert QuestionAnalyticsService.extract_attempts(record) == []
+
+class TestQuestionAnalytics:
+    """Test SQL analytics over question_attempts"""
+    
+    def test_record_and_rank_hardest(self, session: Session, test_user: User):
+        """Test that ingested attempts drive hardest-question and category rankings"""
+        for answers, correct in [([1, 0, 2], [True, False, True]), ([1, 3, 0], [True, False, False])]:
+            record = answered_record(test_user, answers, correct)
+            session.add(record)
+            session.flush()
+            QuestionAnalyticsService.record_attempts(record, session)
+        session.commit()
+        
+        hardest = QuestionAnalyticsService.hardest_questions(session, "CA", min_attempts=2)
+        assert hardest[0].question_id == "tl_001"
+        assert hardest[0].miss_rate == 1.0
+        assert hardest[-1].question_id == "rs_001"
+        
+        categories = {c.category: c for c in QuestionAnalyticsService.category_miss_rates(session, "CA")}
+        assert categories["safe-driving"].miss_rate == 0.5
+        assert categories["road-signs"].attempts == 2
+    
+    def test_backfill_extracts_existing_records(self, session: Session, test_user: User):
+        """Test chunked backfill from records inserted without ingestion"""
+        for _ in range(5):
+            session.add(answered_record(test_user, [1, 1, 2], [True, True, True]))
+        session.commit()
+        
+        assert QuestionAnalyticsService.backfill(session, chunk_size=2) == 5
+        attempts = session.exec(select(QuestionAttempt)).all()
+        assert len(attempts) == 15
+    
+    def test_backfill_replaces_attempts_per_user(self, session: Session, test_user: User, monkeypatch):
+        """Test that a reset rebuild replaces one chunk of users at a time, leaving the others' attempts"""
+        other = User(email="other@example.com")
+        session.add(other)
+        session.commit()
+        for user in (test_user, other):
+            record = answered_record(user, [1, 1, 2], [True, True, True])
+            session.add(record)
+            session.flush()
+            QuestionAnalyticsService.record_attempts(record, session)
+        session.commit()
+        
+        remaining = []
+        insert_attempts = QuestionAnalyticsService._insert_attempts
+        
+        def counting_insert(db, records):
+            remaining.append(db.exec(select(func.count()).select_from(QuestionAttempt)).one())
+            insert_attempts(db, records)
+        
+        monkeypatch.setattr(QuestionAnalyticsService, "_insert_attempts", staticmethod(counting_insert))
+        assert QuestionAnalyticsService.backfill(session, chunk_size=1) == 2
+        assert remaining == [3, 3]
+        assert len(session.exec(select(QuestionAttempt)).all()) == 6
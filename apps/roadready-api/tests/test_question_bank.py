@@ -0,0 +1,88 @@
+import random
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+from app.models.question import Question
+from app.services.question_bank import QuestionBank, import_questions, load_question_bank, get_question_bank
+
+def client_question(question_id: str, category: str, state_code: str = "CA", text: str = "What does this sign mean?") -> dict:
+    return {
+        "id": question_id,
+        "stateCode": state_code,
+        "testType": "car",
+        "category": category,
+        "question": text,
+        "options": ["Yield", "Stop", "Caution", "No Entry"],
+        "correctAnswer": 1,
+        "explanation": "Because."
+    }
+
+@pytest.fixture(name="bank")
+def bank_fixture(session: Session) -> QuestionBank:
+    items = [client_question(f"rs_{i:03d}", "road-signs") for i in range(10)]
+    items += [client_question(f"tl_{i:03d}", "traffic-laws") for i in range(5)]
+    items.append(client_question("ny_001", "road-signs", state_code="NY"))
+    import_questions(items, session)
+    session.commit()
+    return load_question_bank(session)
+
+class TestQuestionBank:
+    """Test the in-memory question catalog"""
+    
+    def test_load_indexes_by_state_type_and_category(self, bank: QuestionBank):
+        """Test catalog lookups"""
+        assert len(bank) == 16
+        assert get_question_bank() is bank
+        assert len(bank.questions("CA", "car")) == 15
+        assert len(bank.questions("CA", "car", "traffic-laws")) == 5
+        assert bank.categories("CA", "car") == ["road-signs", "traffic-laws"]
+        assert bank.get("NY", "ny_001").to_client()["correctAnswer"] == 1
+    
+    def test_sample_is_random_and_bounded(self, bank: QuestionBank):
+        """Test that samples are distinct, capped by pool size, and reproducible with a seed"""
+        sample = bank.sample("CA", "car", "road-signs", n=50)
+        assert len(sample) == 10
+        assert len({q.question_id for q in sample}) == 10
+        
+        first = bank.sample("CA", "car", n=5, rng=random.Random(7))
+        second = bank.sample("CA", "car", n=5, rng=random.Random(7))
+        assert first == second
+    
+    def test_index_is_immutable(self, bank: QuestionBank):
+        """Test that readers cannot mutate the shared index"""
+        with pytest.raises(TypeError):
+            bank._by_test[("CA", "car")] = ()
+        with pytest.raises(AttributeError):
+            bank.get("CA", "rs_000").prompt = "changed"
+
+class TestQuestionImport:
+    """Test importing and versioning questions"""
+    
+    def test_content_change_bumps_version_and_etag(self, session: Session, bank: QuestionBank):
+        """Test that editing a question changes the bank ETag"""
+        old_etag = bank.etag("CA", "car")
+        counts = import_questions([
+            client_question("rs_000", "road-signs", text="Updated prompt"),
+            client_question("rs_001", "road-signs"),
+        ], session)
+        session.commit()
+        assert counts == {"created": 0, "updated": 1, "unchanged": 1}
+        
+        reloaded = load_question_bank(session)
+        assert reloaded.get("CA", "rs_000").version == 2
+        assert reloaded.etag("CA", "car") != old_etag
+        assert reloaded.etag("NY", "car") == bank.etag("NY", "car")
+
+class TestBankDownload:
+    """Test the bank download endpoint"""
+    
+    def test_if_none_match(self, client: TestClient, bank: QuestionBank):
+        """Test 304 for the current tag in any list or weak form, 200 otherwise"""
+        response = client.get("/api/v1/tests/bank?state=CA")
+        assert response.status_code == 200
+        etag = response.headers["ETag"]
+        assert len(response.json()["questions"]) == 15
+        
+        for header in (etag, f"W/{etag}", f'"stale", {etag}', "*"):
+            assert client.get("/api/v1/tests/bank?state=CA", headers={"If-None-Match": header}).status_code == 304
+        assert client.get("/api/v1/tests/bank?state=CA", headers={"If-None-Match": '"stale"'}).status_code == 200
@@ -0,0 +1,150 @@
+import re
+import threading
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from app.core.config import settings
+from app.core.rate_limit import (
+    LocalCounters, RateLimiter, RateLimitMiddleware, RateLimitRule, MAX_BODY_BYTES, email_account, parse_limits,
+    rate_limiter
+)
+from app.models.user import User
+
+class TestRateLimiter:
+    """Test the sliding-window limiter and its backends"""
+
+    def test_parse_limits(self):
+        """Test the per-route limit format"""
+        assert parse_limits("ip=30/minute, account=5/hour") == {"ip": (30, 60), "account": (5, 3600)}
+        assert parse_limits("ip_account=10/minute") == {"ip_account": (10, 60)}
+        assert parse_limits("") == {}
+        with pytest.raises(ValueError):
+            parse_limits("ip=30/week")
+
+    def test_sliding_window(self):
+        """Test that the previous window still counts in proportion to its overlap"""
+        limiter = RateLimiter(LocalCounters())
+        assert [limiter.hit("k", 3, 60, now=6000 + t) for t in (0, 1, 2)] == [0, 0, 0]
+        assert limiter.hit("k", 3, 60, now=6030) == 30
+        # 10s into the next window 5/6 of the previous one still overlaps: 2.5 of 3
+        assert limiter.hit("k", 3, 60, now=6070) == 0
+        assert limiter.hit("k", 3, 60, now=6075) > 0
+        # Half of it slid out
+        assert limiter.hit("k", 3, 60, now=6090) == 0
+        assert limiter.hit("other", 3, 60, now=6075) == 0
+
+    def test_shared_backend(self):
+        """Test that processes sharing a backend share counts, and that backend errors fall back to local"""
+        shared = LocalCounters()
+        first, second = RateLimiter(LocalCounters(), shared=shared), RateLimiter(LocalCounters(), shared=shared)
+        assert (first.hit("k", 2, 60, now=0), second.hit("k", 2, 60, now=1)) == (0, 0)
+        assert first.hit("k", 2, 60, now=2) > 0
+
+        class Broken:
+            def hit(self, current_key, previous_key, limit, overlap, ex):
+                raise ConnectionError("down")
+
+        limiter = RateLimiter(LocalCounters(), shared=Broken())
+        assert limiter.hit("k", 1, 60, now=0) == 0
+        assert limiter.hit("k", 1, 60, now=1) > 0
+
+    def test_concurrent_hits_never_exceed_limit(self):
+        """Test that the check and the increment are one step, so racing requests can't all pass"""
+        limiter = RateLimiter(LocalCounters())
+        barrier = threading.Barrier(20)
+        allowed = []
+
+        def hit():
+            barrier.wait()
+            allowed.append(limiter.hit("k", 5, 60, now=30) == 0)
+
+        threads = [threading.Thread(target=hit) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert allowed.count(True) == 5
+
+class TestRateLimitMiddleware:
+    """Test the limits on abuse-prone routes"""
+
+    @pytest.fixture(autouse=True)
+    def frozen_clock(self, monkeypatch):
+        # Mid-window, so a test's requests never straddle a window boundary
+        monkeypatch.setattr(rate_limiter, "clock", lambda: 1800.0)
+
+    def test_login_per_account(self, client: TestClient, test_user: User, query_counter):
+        """Test that repeated logins for one email are rejected before any DB work"""
+        email = test_user.email
+        for _ in range(10):
+            response = client.post("/api/v1/auth/login", json={"email": email, "password": "WrongPass123!"})
+            assert response.status_code == 401
+
+        query_counter.reset()
+        response = client.post("/api/v1/auth/login", json={"email": email.upper(), "password": "TestPass123!"})
+        assert response.status_code == 429
+        assert int(response.headers["Retry-After"]) > 0
+        assert len(query_counter) == 0
+
+        # Other accounts are unaffected
+        response = client.post("/api/v1/auth/login", json={"email": "other@example.com", "password": "TestPass123!"})
+        assert response.status_code == 401
+
+    def test_login_account_limit_is_per_ip(self, client: TestClient, test_user: User, monkeypatch):
+        """Test that failed logins from one address don't lock the account out elsewhere"""
+        monkeypatch.setattr(settings, "RATE_LIMIT_TRUST_FORWARDED", True)
+        attacker = {"X-Forwarded-For": "203.0.113.7"}
+        for _ in range(10):
+            client.post("/api/v1/auth/login", headers=attacker, json={"email": test_user.email, "password": "Guess123!"})
+        response = client.post("/api/v1/auth/login", headers=attacker, json={"email": test_user.email, "password": "Guess123!"})
+        assert response.status_code == 429
+
+        owner = {"X-Forwarded-For": "198.51.100.2"}
+        response = client.post("/api/v1/auth/login", headers=owner, json={"email": test_user.email, "password": "TestPass123!"})
+        assert response.status_code == 200
+
+    def test_login_account_limit_across_ips(self, monkeypatch):
+        """Test that one account guessed from many addresses is still limited"""
+        monkeypatch.setattr(settings, "RATE_LIMIT_TRUST_FORWARDED", True)
+        login = FastAPI()
+        
+        @login.post("/login")
+        def reject():
+            raise HTTPException(status_code=401)
+        
+        rule = RateLimitRule("login", "POST", re.compile("/login"), parse_limits("ip_account=2/minute,account=5/minute"), email_account, True)
+        login.add_middleware(RateLimitMiddleware, rules=[rule], limiter=RateLimiter(LocalCounters(), clock=lambda: 1800.0))
+        client = TestClient(login)
+        
+        def attempt(ip: str, email: str = "victim@example.com"):
+            return client.post("/login", headers={"X-Forwarded-For": ip}, json={"email": email, "password": "Guess123!"})
+        
+        assert [attempt(f"203.0.113.{i}").status_code for i in range(5)] == [401] * 5
+        assert attempt("203.0.113.99").status_code == 429
+        assert attempt("203.0.113.99", "other@example.com").status_code == 401
+    
+    def test_oversized_body_rejected(self, client: TestClient, test_user: User):
+        """Test that padding the body past the buffer limit can't skip the account limit"""
+        padding = "x" * (MAX_BODY_BYTES + 1)
+        response = client.post("/api/v1/auth/login", json={"email": test_user.email, "password": "TestPass123!", "pad": padding})
+        assert response.status_code == 413
+
+    def test_login_per_ip(self, client: TestClient):
+        """Test that one client spreading attempts over many emails is rejected too"""
+        for i in range(30):
+            client.post("/api/v1/auth/login", json={"email": f"user{i}@example.com", "password": "TestPass123!"})
+        response = client.post("/api/v1/auth/login", json={"email": "new@example.com", "password": "TestPass123!"})
+        assert response.status_code == 429
+
+    def test_inquire_per_account(self, client: TestClient, auth_headers: dict):
+        """Test that inquiries are limited per token user"""
+        headers = {"Authorization": auth_headers["Authorization"]}
+        for _ in range(20):
+            assert client.post("/api/v1/marketplace/listings/999/inquire", headers=headers, json={}).status_code != 429
+        assert client.post("/api/v1/marketplace/listings/999/inquire", headers=headers, json={}).status_code == 429
+
+    def test_other_routes_unlimited(self, client: TestClient, auth_headers: dict):
+        """Test that routes without rules pass straight through"""
+        headers = {"Authorization": auth_headers["Authorization"]}
+        for _ in range(40):
+            assert client.get("/api/v1/auth/me", headers=headers).status_code == 200
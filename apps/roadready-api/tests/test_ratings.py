@@ -0,0 +1,64 @@
+import pytest
+from sqlmodel import Session, select
+from app.models.user import User
+from app.models.rating import QuestionRating, UserSkillRating
+from app.services.rating_service import RatingService
+from tests.conftest import make_attempt
+
+class TestRatingUpdates:
+    """Test incremental Elo-style rating updates"""
+    
+    def test_missed_question_gets_harder_and_user_weaker(self, session: Session, test_user: User):
+        """Test that a miss raises difficulty and lowers mastery"""
+        RatingService.apply_attempts(test_user.id, [make_attempt(test_user.id, "rs_001", False)], session)
+        session.commit()
+        
+        question = session.exec(select(QuestionRating).where(QuestionRating.question_id == "rs_001")).one()
+        skill = session.exec(select(UserSkillRating).where(UserSkillRating.user_id == test_user.id)).one()
+        assert question.difficulty > 0
+        assert skill.ability < 0
+        assert question.attempts == 1
+        assert skill.attempts == 1
+    
+    def test_updates_are_incremental(self, session: Session, test_user: User, verified_user: User):
+        """Test that ratings accumulate across submissions without recomputation"""
+        for user in (test_user, verified_user):
+            RatingService.apply_attempts(user.id, [
+                make_attempt(user.id, "rs_001", True),
+                make_attempt(user.id, "rs_002", False),
+            ], session)
+        session.commit()
+        
+        ratings = {r.question_id: r for r in session.exec(select(QuestionRating)).all()}
+        assert ratings["rs_001"].attempts == 2
+        assert ratings["rs_001"].difficulty < 0 < ratings["rs_002"].difficulty
+    
+    def test_ratings_are_per_test_type(self, session: Session, test_user: User):
+        """Test that the same question id under another test type gets its own rating"""
+        cdl = make_attempt(test_user.id, "rs_001", True)
+        cdl.test_type = "cdl"
+        RatingService.apply_attempts(test_user.id, [make_attempt(test_user.id, "rs_001", False), cdl], session)
+        session.commit()
+        
+        ratings = {r.test_type: r for r in session.exec(select(QuestionRating)).all()}
+        assert ratings["car"].difficulty > 0 > ratings["cdl"].difficulty
+        assert ratings["car"].attempts == ratings["cdl"].attempts == 1
+    
+    def test_probability_is_symmetric(self):
+        """Test the Rasch probability at equal ability and difficulty"""
+        assert RatingService.probability_correct(0.0, 0.0) == 0.5
+        assert RatingService.probability_correct(1.0, 0.0) > 0.5
+
+class TestRecommendations:
+    """Test question recommendations"""
+    
+    def test_prefers_questions_near_even_odds(self, session: Session, test_user: User):
+        """Test that trivially easy questions rank below informative ones"""
+        session.add(QuestionRating(question_id="easy", state_code="CA", test_type="car", category="road-signs", difficulty=-4.0, attempts=50))
+        session.add(QuestionRating(question_id="fair", state_code="CA", test_type="car", category="road-signs", difficulty=0.1, attempts=50))
+        session.add(QuestionRating(question_id="other_state", state_code="NY", test_type="car", category="road-signs", difficulty=0.0, attempts=50))
+        session.commit()
+        
+        recommendations = RatingService.recommend(test_user, session, n=5)
+        assert [r.question_id for r in recommendations] == ["fair", "easy"]
+        assert 0.4 < recommendations[0].probability_correct < 0.5
@@ -0,0 +1,99 @@
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import event
+from sqlmodel import Session, SQLModel, create_engine, select
+from sqlmodel.pool import StaticPool
+from app.core.database import ReadSession, ReplicaSet, pin_reads_to_primary
+from app.models.session import Session as SessionModel
+from app.models.test_record import TestRecord
+from app.models.user import User
+
+def make_engine(email: str):
+    """In-memory database holding a single user, so queries reveal which database served them"""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(User(email=email))
+        session.commit()
+    return engine
+
+@pytest.fixture(name="primary")
+def primary_fixture():
+    with Session(make_engine("primary@example.com")) as session:
+        yield session
+
+def served_by(session: Session) -> str:
+    return session.exec(select(User.email)).one()
+
+class TestReplicaRouting:
+    """Test routing read-only sessions to replicas"""
+    
+    def test_round_robin(self, primary: Session):
+        """Test that consecutive requests alternate between replicas"""
+        replicas = ReplicaSet([make_engine("a@example.com"), make_engine("b@example.com")], cooldown_seconds=30)
+        served = []
+        for _ in range(4):
+            with ReadSession(primary, replicas) as session:
+                served.append(served_by(session))
+        assert served == ["a@example.com", "b@example.com"] * 2
+    
+    def test_failover_skips_unreachable_replica(self, primary: Session):
+        """Test that a replica failing to connect is skipped for the cooldown"""
+        broken = create_engine("sqlite:////nonexistent/dir/replica.db")
+        replicas = ReplicaSet([broken, make_engine("b@example.com")], cooldown_seconds=30)
+        with ReadSession(primary, replicas) as session:
+            assert served_by(session) == "b@example.com"
+        assert replicas.candidates() == [replicas.engines[1]]
+    
+    def test_no_connection_before_first_query(self, primary: Session):
+        """Test that choosing a replica doesn't check out (or ping) a connection"""
+        replica = make_engine("a@example.com")
+        checkouts = []
+        event.listen(replica, "checkout", lambda *args: checkouts.append(1))
+        replicas = ReplicaSet([replica], cooldown_seconds=30)
+        with ReadSession(primary, replicas) as session:
+            assert session.get_bind() is replica
+            assert checkouts == []
+            served_by(session)
+        assert len(checkouts) == 1
+    
+    def test_falls_back_to_primary(self, primary: Session):
+        """Test reads when no replica is healthy"""
+        replicas = ReplicaSet([create_engine("sqlite:////nonexistent/dir/replica.db")], cooldown_seconds=30)
+        with ReadSession(primary, replicas) as session:
+            assert served_by(session) == "primary@example.com"
+
+class TestReadAfterWrite:
+    """Test that recent writers read from the primary"""
+    
+    def test_recent_writer_is_pinned_to_primary(self, primary: Session):
+        """Test pinning by the auth session's last write"""
+        replicas = ReplicaSet([make_engine("a@example.com")], cooldown_seconds=30)
+        pin_reads_to_primary(primary, datetime.utcnow() - timedelta(seconds=2))
+        with ReadSession(primary, replicas) as session:
+            assert served_by(session) == "primary@example.com"
+    
+    def test_old_writes_do_not_pin(self, primary: Session):
+        """Test that writes older than the window don't pin"""
+        pin_reads_to_primary(primary, datetime.utcnow() - timedelta(hours=1))
+        pin_reads_to_primary(primary, None)
+        assert "read_primary" not in primary.info
+    
+    def test_auth_session_activity_is_not_a_write(self, session: Session, test_user: User):
+        """Test write tracking ignores the per-request auth session update"""
+        auth = SessionModel(user_id=test_user.id, session_id="s", token_hash="t", expires_at=datetime.utcnow())
+        session.add(auth)
+        session.flush()
+        session.info.pop("wrote", None)
+        
+        auth.last_activity = datetime.utcnow()
+        session.flush()
+        assert "wrote" not in session.info
+        
+        session.add(TestRecord(
+            user_id=test_user.id, state_code="CA", test_type="car", category="road-signs",
+            score=80, total_questions=1, correct_answers=1, time_spent=1,
+            questions="[]", user_answers="[]", is_correct="[]"
+        ))
+        session.flush()
+        assert session.info["wrote"] is True
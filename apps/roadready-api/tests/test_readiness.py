@@ -0,0 +1,150 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+from datetime import datetime, timedelta
+from app.models.user import User
+from app.models.onboarding_profile import OnboardingProfile
+from app.models.readiness import ReadinessScore
+from app.services.readiness_service import ReadinessService, HALF_LIFE_DAYS
+from tests.conftest import make_record
+
+class TestReadinessScore:
+    """Test the score formula and decayed aggregates"""
+
+    def test_matches_client_formula(self):
+        """Test the same weights as roadready-ui/utils/readiness-score.ts"""
+        assert ReadinessService.readiness_score(80, 60, 10) == 79
+        assert ReadinessService.readiness_score(80, 60, 1) == 59
+        assert ReadinessService.readiness_score(100, 100, 0) == 0
+
+    def test_older_tests_count_less(self):
+        """Test that a test one half-life older has half the weight"""
+        start = datetime(2026, 1, 1)
+        row = ReadinessScore(user_id=1, state_code="CA", test_type="car")
+        ReadinessService.apply(row, 40, start)
+        ReadinessService.apply(row, 100, start + timedelta(days=HALF_LIFE_DAYS))
+        assert row.weight == pytest.approx(1.5)
+        assert row.weighted_score / row.weight == pytest.approx((0.5 * 40 + 100) / 1.5)
+        assert row.total_tests == 2
+
+    def test_order_independent(self):
+        """Test that applying tests out of order (backfills) gives the same result"""
+        moments = [datetime(2026, 1, 1) + timedelta(days=d) for d in (0, 3, 20)]
+        scores = [50, 90, 75]
+        in_order = ReadinessScore(user_id=1, state_code="CA", test_type="car")
+        shuffled = ReadinessScore(user_id=1, state_code="CA", test_type="car")
+        for score, moment in zip(scores, moments):
+            ReadinessService.apply(in_order, score, moment)
+        for index in (1, 2, 0):
+            ReadinessService.apply(shuffled, scores[index], moments[index])
+        assert shuffled.weighted_score == pytest.approx(in_order.weighted_score)
+        assert shuffled.readiness_score == in_order.readiness_score
+        assert shuffled.pass_probability == pytest.approx(in_order.pass_probability)
+
+    def test_pass_probability_is_shrunk(self):
+        """Test that one passed test does not mean certainty"""
+        row = ReadinessService.apply(ReadinessScore(user_id=1, state_code="CA", test_type="car"), 95, datetime(2026, 1, 1))
+        assert 0.5 < row.pass_probability < 1.0
+
+    def test_backfill_matches_incremental(self, session: Session, test_user: User):
+        """Test that the backfill rebuilds the rows kept at insert time"""
+        user_id = test_user.id
+        now = datetime.utcnow()
+        for days, score in ((10, 60), (5, 75), (1, 90)):
+            record = make_record(test_user.id, score, now - timedelta(days=days))
+            session.add(record)
+            session.flush()
+            ReadinessService.record_test(record, session)
+        session.commit()
+        incremental = ReadinessService.get(user_id, "CA", "car", session)
+        expected = (incremental.readiness_score, incremental.pass_probability, incremental.total_tests)
+
+        assert ReadinessService.backfill(session, chunk_size=2) == 3
+        rebuilt = ReadinessService.get(user_id, "CA", "car", session)
+        assert (rebuilt.readiness_score, rebuilt.pass_probability, rebuilt.total_tests) == expected
+
+    def test_pass_probability_decays_to_read_time(self):
+        """Test that old evidence fades back towards the prior when read later"""
+        taken_at = datetime(2026, 1, 1)
+        row = ReadinessScore(user_id=1, state_code="CA", test_type="car")
+        for _ in range(5):
+            ReadinessService.apply(row, 95, taken_at)
+        stored = ReadinessService.pass_probability(row)
+        assert ReadinessService.pass_probability(row, taken_at) == pytest.approx(stored)
+        later = ReadinessService.pass_probability(row, taken_at + timedelta(days=4 * HALF_LIFE_DAYS))
+        assert 0.5 < later < stored
+        assert ReadinessService.pass_probability(ReadinessScore(user_id=1, state_code="CA", test_type="car")) == 0.5
+
+    def test_backfill_replaces_rows_per_user(self, session: Session, test_user: User):
+        """Test that a reset rebuild drops stale rows, including those of users without records"""
+        idle = User(email="idle@example.com")
+        session.add(idle)
+        session.add(make_record(test_user.id, 90, datetime.utcnow()))
+        session.commit()
+        session.add(ReadinessScore(user_id=test_user.id, state_code="CA", test_type="car", total_tests=99))
+        session.add(ReadinessScore(user_id=idle.id, state_code="CA", test_type="car", total_tests=99))
+        session.commit()
+        user_id, idle_id = test_user.id, idle.id
+
+        assert ReadinessService.backfill(session, chunk_size=1) == 1
+        assert ReadinessService.get(user_id, "CA", "car", session).total_tests == 1
+        assert ReadinessService.get(idle_id, "CA", "car", session) is None
+
+class TestReadinessEndpoint:
+    """Test GET /statistics/readiness"""
+
+    def post_test(self, client: TestClient, headers: dict, score: int, test_type: str = "car"):
+        response = client.post("/api/v1/test-records/", headers=headers, json={
+            "state_code": "CA", "test_type": test_type, "category": "traffic_signs", "score": score,
+            "total_questions": 20, "correct_answers": score // 5, "time_spent": 300,
+            "questions": "[]", "user_answers": "[]", "is_correct": "[]"
+        })
+        assert response.status_code == 201
+
+    def test_defaults_to_user_state_and_test_type(self, client: TestClient, auth_headers: dict):
+        """Test readiness for the user's own state/test type, updated by new test records"""
+        headers = {"Authorization": auth_headers["Authorization"]}
+        response = client.get("/api/v1/statistics/readiness", headers=headers)
+        assert response.status_code == 200
+        assert response.json()["total_tests"] == 0
+        assert response.json()["pass_probability"] == 0.5
+
+        self.post_test(client, headers, 85)
+        self.post_test(client, headers, 65)
+        data = client.get("/api/v1/statistics/readiness", headers=headers).json()
+        assert data["state_code"] == "CA"
+        assert data["test_type"] == "car"
+        assert data["total_tests"] == 2
+        assert data["readiness_score"] == ReadinessService.readiness_score(75, 50, 2)
+
+    def test_profile_scoping(self, client: TestClient, auth_headers: dict, session: Session, test_user: User):
+        """Test that each onboarding profile has its own score"""
+        headers = {"Authorization": auth_headers["Authorization"]}
+        profile = OnboardingProfile(user_id=test_user.id, profile_name="Bike", state="CA", test_type="motorcycle")
+        session.add(profile)
+        session.commit()
+        test_user.active_profile_id = profile.id
+        session.add(test_user)
+        session.commit()
+        self.post_test(client, headers, 90, test_type="motorcycle")
+        self.post_test(client, headers, 40)
+
+        active = client.get("/api/v1/statistics/readiness", headers=headers).json()
+        assert active["test_type"] == "motorcycle"
+        assert active["total_tests"] == 1
+        by_id = client.get(f"/api/v1/statistics/readiness?profile_id={profile.id}", headers=headers).json()
+        assert by_id == active
+        assert client.get("/api/v1/statistics/readiness?profile_id=999", headers=headers).status_code == 404
+
+    def test_etag(self, client: TestClient, auth_headers: dict):
+        """Test conditional requests until the next test record"""
+        headers = {"Authorization": auth_headers["Authorization"]}
+        self.post_test(client, headers, 80)
+        response = client.get("/api/v1/statistics/readiness", headers=headers)
+        etag = response.headers["ETag"]
+        assert client.get("/api/v1/statistics/readiness", headers={**headers, "If-None-Match": etag}).status_code == 304
+
+        self.post_test(client, headers, 90)
+        response = client.get("/api/v1/statistics/readiness", headers={**headers, "If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
@@ -0,0 +1,55 @@
+import pytest
+from sqlmodel import Session
+from datetime import datetime, timedelta
+from app.models.user import User
+from app.models.review_item import ReviewItem
+from app.services.review_service import ReviewService
+from tests.conftest import make_attempt
+
+class TestSM2:
+    """Test SM-2 interval scheduling"""
+    
+    def test_intervals_grow_on_correct_answers(self):
+        """Test the 1, 6, 6*EF progression"""
+        item = ReviewItem(user_id=1, question_id="q", state_code="CA", category="c")
+        now = datetime(2025, 1, 1)
+        intervals = [ReviewService.review(item, 4, now).interval_days for _ in range(3)]
+        assert intervals == [1, 6, 15]
+        assert item.due_at == now + timedelta(days=15)
+    
+    def test_miss_resets_repetitions(self):
+        """Test that a wrong answer schedules a review tomorrow and lowers easiness"""
+        item = ReviewItem(user_id=1, question_id="q", state_code="CA", category="c", repetitions=3, interval_days=15)
+        ReviewService.review(item, 1, datetime(2025, 1, 1))
+        assert item.repetitions == 0
+        assert item.interval_days == 1
+        assert item.lapses == 1
+        assert item.easiness < 2.5
+
+class TestReviewQueue:
+    """Test the due-question queue"""
+    
+    def test_queue_returns_due_items_oldest_first(self, session: Session, test_user: User):
+        """Test that only due questions are returned, ordered by due date"""
+        two_days_ago = datetime.utcnow() - timedelta(days=2)
+        ReviewService.schedule_attempts(test_user.id, [
+            make_attempt(test_user.id, "missed", False, user_answer=1, attempted_at=two_days_ago),
+            make_attempt(test_user.id, "known", True, user_answer=1, attempted_at=datetime.utcnow()),
+        ], session)
+        ReviewService.schedule_attempts(test_user.id, [
+            make_attempt(test_user.id, "missed_later", False, user_answer=1, attempted_at=two_days_ago + timedelta(hours=1)),
+        ], session)
+        session.commit()
+        
+        queue = ReviewService.review_queue(test_user.id, session)
+        assert [item.question_id for item in queue.items] == ["missed", "missed_later"]
+        assert queue.next_due_at is None
+    
+    def test_queue_reports_next_due_when_empty(self, session: Session, test_user: User):
+        """Test that an empty queue reports when the next review is due"""
+        ReviewService.schedule_attempts(test_user.id, [make_attempt(test_user.id, "known", True, user_answer=1, attempted_at=datetime.utcnow())], session)
+        session.commit()
+        
+        queue = ReviewService.review_queue(test_user.id, session)
+        assert queue.items == []
+        assert queue.next_due_at > datetime.utcnow()
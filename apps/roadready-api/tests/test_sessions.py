@@ -34,6 +34,7 @@ class TestSessionManagement:
         
         token1, refresh1 = create_tokens(test_user.id, session, mock_request)
         token2, refresh2 = create_tokens(test_user.id, session, mock_request)
+        session.commit()
         
         headers1 = {"Authorization": f"Bearer {token1}"}
         headers2 = {"Authorization": f"Bearer {token2}"}
@@ -0,0 +1,130 @@
+import threading
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlmodel import Session, SQLModel
+from app.core.config import settings
+from app.core.database import _create_engine, get_db
+from app.core.security import create_tokens
+from app.main import app
+from app.models.user import User
+
+@pytest.fixture
+def file_engine(tmp_path):
+    engine = _create_engine(f"sqlite:///{tmp_path / 'roadready.db'}")
+    SQLModel.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+class TestSQLitePragmas:
+    """Test per-connection SQLite settings"""
+
+    def test_performance_pragmas(self, file_engine):
+        """Test WAL, synchronous, cache, mmap and busy timeout on a database file"""
+        with file_engine.connect() as conn:
+            assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+            assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1  # NORMAL
+            assert conn.exec_driver_sql("PRAGMA cache_size").scalar() == -settings.SQLITE_CACHE_SIZE_KB
+            assert conn.exec_driver_sql("PRAGMA mmap_size").scalar() == settings.SQLITE_MMAP_SIZE
+            assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() == settings.SQLITE_BUSY_TIMEOUT_MS
+
+    def test_performance_mode_off(self, tmp_path, monkeypatch):
+        """Test that disabling performance mode keeps SQLite's defaults"""
+        monkeypatch.setattr(settings, "SQLITE_PERFORMANCE_MODE", False)
+        engine = _create_engine(f"sqlite:///{tmp_path / 'plain.db'}")
+        with engine.connect() as conn:
+            assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "delete"
+            assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() == settings.SQLITE_BUSY_TIMEOUT_MS
+        engine.dispose()
+
+class TestSQLiteWriterLock:
+    """Test serialization of write transactions"""
+
+    def test_lock_held_until_commit(self, file_engine):
+        """Test that the lock is taken by the first write and released on commit"""
+        with Session(file_engine) as session:
+            session.execute(text("SELECT 1"))
+            assert "writer_lock" not in session.connection().info
+            session.add(User(email="a@example.com", first_name="A"))
+            session.flush()
+            lock = session.connection().info["writer_lock"]
+            assert lock.locked()
+            session.commit()
+            assert not lock.locked()
+
+    def test_lock_released_on_rollback(self, file_engine):
+        """Test that an abandoned write transaction releases the lock"""
+        with Session(file_engine) as session:
+            session.add(User(email="b@example.com", first_name="B"))
+            session.flush()
+            lock = session.connection().info["writer_lock"]
+        assert not lock.locked()
+
+    def test_concurrent_writers(self, file_engine):
+        """Test that many threads writing at once never hit 'database is locked'"""
+        errors = []
+
+        def write(worker: int):
+            try:
+                for i in range(10):
+                    with Session(file_engine) as session:
+                        session.add(User(email=f"user{worker}-{i}@example.com", first_name="Writer"))
+                        session.commit()
+            except Exception as exc:
+                errors.append(exc)
+
+        threads = [threading.Thread(target=write, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        with Session(file_engine) as session:
+            assert session.execute(text("SELECT COUNT(*) FROM user")).scalar() == 80
+
+    def test_concurrent_api_writes(self, file_engine):
+        """Test that concurrent POSTs through the app queue on the lock instead of failing"""
+        with Session(file_engine) as session:
+            user = User(email="d@example.com", first_name="D")
+            session.add(user)
+            session.flush()
+            access_token, _ = create_tokens(user.id, session)
+            session.commit()
+
+        def get_file_db():
+            with Session(file_engine) as session:
+                try:
+                    yield session
+                    session.commit()
+                except Exception:
+                    session.rollback()
+                    raise
+
+        app.dependency_overrides[get_db] = get_file_db
+        client = TestClient(app, raise_server_exceptions=False)
+        statuses = []
+
+        def post(worker: int):
+            for i in range(5):
+                response = client.post(
+                    "/api/v1/test-records/",
+                    headers={"Authorization": f"Bearer {access_token}"},
+                    json={"state_code": "CA", "test_type": "car", "category": "traffic_signs", "score": 80,
+                          "total_questions": 20, "correct_answers": 16, "time_spent": 60 + worker * 10 + i,
+                          "questions": "[]", "user_answers": "[]", "is_correct": "[]"},
+                )
+                statuses.append(response.status_code)
+
+        threads = [threading.Thread(target=post, args=(n,)) for n in range(8)]
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            app.dependency_overrides.clear()
+
+        assert statuses == [201] * 40
+        with Session(file_engine) as session:
+            assert session.execute(text("SELECT COUNT(*) FROM test_records")).scalar() == 40
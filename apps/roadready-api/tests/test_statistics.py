@@ -1,9 +1,11 @@
 import pytest
 from fastapi.testclient import TestClient
-from sqlmodel import Session
+from sqlmodel import Session, select
 from datetime import datetime, timedelta
 from app.models.user import User
 from app.models.test_record import TestRecord
+from app.models.onboarding_profile import OnboardingProfile
+from app.services.statistics_service import StatisticsService
 
 @pytest.fixture(name="test_records")
 def test_records_fixture(test_user: User, session: Session):
@@ -159,3 +161,99 @@ class TestStatistics:
         
         # With threshold 90, both traffic_signs (87.5) and road_rules (70) should be weak
         assert len(weak_areas) >= 2
+
+class TestProfileStatistics:
+    """Test statistics scoped to one onboarding profile"""
+    
+    def post_test(self, client: TestClient, headers: dict, score: int, test_type: str, category: str = "traffic_signs", **extra):
+        response = client.post("/api/v1/test-records/", headers=headers, json={
+            "state_code": "CA", "test_type": test_type, "category": category, "score": score,
+            "total_questions": 20, "correct_answers": score // 5, "time_spent": 300,
+            "questions": "[]", "user_answers": "[]", "is_correct": "[]", **extra
+        })
+        assert response.status_code == 201
+        return response.json()
+    
+    @pytest.fixture(name="profiles")
+    def profiles_fixture(self, client: TestClient, auth_headers: dict, session: Session, test_user: User):
+        """Car (active) and motorcycle profiles with two and one tests"""
+        headers = {"Authorization": auth_headers["Authorization"]}
+        car = OnboardingProfile(user_id=test_user.id, profile_name="Car", state="CA", test_type="car")
+        bike = OnboardingProfile(user_id=test_user.id, profile_name="Bike", state="CA", test_type="motorcycle")
+        session.add_all([car, bike])
+        session.commit()
+        test_user.active_profile_id = car.id
+        session.add(test_user)
+        session.commit()
+        
+        assert self.post_test(client, headers, 90, "car")["onboarding_profile_id"] == car.id
+        self.post_test(client, headers, 60, "car", category="road_rules")
+        # Not the active profile: linked only when given explicitly
+        assert self.post_test(client, headers, 50, "motorcycle")["onboarding_profile_id"] is None
+        assert self.post_test(client, headers, 40, "motorcycle", onboarding_profile_id=bike.id)["onboarding_profile_id"] == bike.id
+        return headers, car.id, bike.id
+    
+    def test_statistics_by_profile(self, client: TestClient, profiles: tuple):
+        """Test that each profile only counts its own tests"""
+        headers, car_id, bike_id = profiles
+        everything = client.get("/api/v1/statistics/", headers=headers).json()
+        assert everything["total_tests"] == 4
+        assert everything["active_profile"]["total_tests"] == 2
+        assert everything["active_profile"]["average_score"] == 75.0
+        
+        car = client.get(f"/api/v1/statistics/?profile_id={car_id}", headers=headers).json()
+        assert (car["total_tests"], car["best_score"], car["tests_this_week"], car["current_streak"]) == (2, 90, 2, 1)
+        bike = client.get(f"/api/v1/statistics/?profile_id={bike_id}", headers=headers).json()
+        assert (bike["total_tests"], bike["average_score"]) == (1, 40.0)
+        assert client.get("/api/v1/statistics/?profile_id=999", headers=headers).status_code == 404
+    
+    def test_weak_areas_by_profile(self, client: TestClient, profiles: tuple):
+        """Test weak areas from one profile's tests"""
+        headers, car_id, bike_id = profiles
+        weak = client.get(f"/api/v1/statistics/weak-areas?profile_id={car_id}", headers=headers).json()["weak_areas"]
+        assert [(area["category"], area["total_attempts"]) for area in weak] == [("road_rules", 1)]
+        weak = client.get(f"/api/v1/statistics/weak-areas?profile_id={bike_id}", headers=headers).json()["weak_areas"]
+        assert [(area["category"], area["average_score"]) for area in weak] == [("traffic_signs", 40.0)]
+    
+    @pytest.mark.parametrize("path", ["/api/v1/statistics/", "/api/v1/statistics/weak-areas"])
+    def test_foreign_profile_checked_before_etag(self, client: TestClient, profiles: tuple, session: Session, path: str):
+        """Test that a current ETag doesn't turn another user's profile into a 304"""
+        headers, car_id, bike_id = profiles
+        other = User(email="other@example.com")
+        session.add(other)
+        session.commit()
+        foreign = OnboardingProfile(user_id=other.id, profile_name="Car", state="CA", test_type="car")
+        session.add(foreign)
+        session.commit()
+        
+        etag = client.get(path, headers=headers).headers["ETag"]
+        response = client.get(f"{path}?profile_id={foreign.id}", headers={**headers, "If-None-Match": etag})
+        assert response.status_code == 404
+    
+    def test_unknown_profile_rejected(self, client: TestClient, auth_headers: dict):
+        """Test that a test record cannot be linked to someone else's profile"""
+        headers = {"Authorization": auth_headers["Authorization"]}
+        response = client.post("/api/v1/test-records/", headers=headers, json={
+            "state_code": "CA", "test_type": "car", "category": "signs", "score": 80,
+            "total_questions": 20, "correct_answers": 16, "time_spent": 300,
+            "questions": "[]", "user_answers": "[]", "is_correct": "[]", "onboarding_profile_id": 999
+        })
+        assert response.status_code == 404
+    
+    def test_backfill_links_history(self, session: Session, test_user: User):
+        """Test linking records created before the column existed"""
+        user_id = test_user.id
+        profile = OnboardingProfile(user_id=user_id, profile_name="Car", state="CA", test_type="car")
+        session.add(profile)
+        session.add_all([
+            TestRecord(user_id=user_id, state_code="CA", test_type=test_type, category="signs", score=80,
+                       total_questions=20, correct_answers=16, time_spent=300,
+                       questions="[]", user_answers="[]", is_correct="[]")
+            for test_type in ("car", "car", "motorcycle")
+        ])
+        session.commit()
+        profile_id = profile.id
+        
+        assert StatisticsService.backfill_profile_links(session, chunk_size=2) == 3
+        linked = session.exec(select(TestRecord.test_type, TestRecord.onboarding_profile_id).order_by(TestRecord.id)).all()
+        assert [tuple(row) for row in linked] == [("car", profile_id), ("car", profile_id), ("motorcycle", None)]
@@ -0,0 +1,114 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.pool import StaticPool
+from app.core.cache import LRUCache, TieredCache
+from app.models.user import User
+from app.services.stats_cache import StatsCache
+
+TEST_RECORD = {
+    "state_code": "CA", "test_type": "car", "category": "traffic_signs", "score": 80,
+    "total_questions": 20, "correct_answers": 16, "time_spent": 300,
+    "questions": "[]", "user_answers": "[]", "is_correct": "[]"
+}
+
+class TestCaches:
+    """Test the in-process LRU and the tiered cache"""
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first"""
+        cache = LRUCache(max_entries=2)
+        cache.set("a", b"1")
+        cache.set("b", b"2")
+        assert cache.get("a") == b"1"
+        cache.set("c", b"3")
+        assert cache.get("b") is None
+        assert (cache.get("a"), cache.get("c")) == (b"1", b"3")
+
+    def test_lru_ttl(self):
+        """Test that expired entries are misses"""
+        cache = LRUCache()
+        cache.set("a", b"1", ex=-1)
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_tiered_reads_through_shared(self):
+        """Test that another process's entry is found in the shared backend and kept locally"""
+        shared = LRUCache()
+        TieredCache(LRUCache(), shared=shared).set("k", b"v")
+        other = TieredCache(LRUCache(), shared=shared)
+        assert other.get("k") == b"v"
+        assert other.local.get("k") == b"v"
+
+    def test_tiered_survives_backend_errors(self):
+        """Test that a failing shared backend degrades to the local cache"""
+        class Broken:
+            def get(self, key):
+                raise ConnectionError("down")
+            def set(self, key, value, ex=None):
+                raise ConnectionError("down")
+
+        cache = TieredCache(LRUCache(), shared=Broken())
+        cache.set("k", b"v")
+        assert cache.get("k") == b"v"
+        assert cache.get("missing") is None
+
+class TestStatsCache:
+    """Test ETags and invalidation on the statistics endpoints"""
+
+    @pytest.fixture(name="headers")
+    def headers_fixture(self, auth_headers: dict):
+        return {"Authorization": auth_headers["Authorization"]}
+
+    def test_bump(self, session: Session, test_user: User):
+        """Test that bumping changes the ETag"""
+        etag = StatsCache.etag(test_user)
+        StatsCache.bump(test_user.id, session)
+        assert test_user.stats_version == 1
+        assert StatsCache.etag(test_user) != etag
+
+    @pytest.mark.parametrize("path", ["/api/v1/statistics/", "/api/v1/statistics/weak-areas?threshold=90"])
+    def test_new_test_record_invalidates(self, client: TestClient, headers: dict, path: str):
+        """Test 304 for a current ETag and fresh data after a new test record"""
+        client.post("/api/v1/test-records/", headers=headers, json=TEST_RECORD)
+        response = client.get(path, headers=headers)
+        etag = response.headers["ETag"]
+        assert client.get(path, headers={**headers, "If-None-Match": etag}).status_code == 304
+
+        client.post("/api/v1/test-records/", headers=headers, json={**TEST_RECORD, "score": 40})
+        response = client.get(path, headers={**headers, "If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+    def test_cached_statistics_are_current(self, client: TestClient, headers: dict):
+        """Test that cached bodies never outlive a write"""
+        client.post("/api/v1/test-records/", headers=headers, json=TEST_RECORD)
+        assert client.get("/api/v1/statistics/", headers=headers).json()["total_tests"] == 1
+        client.post("/api/v1/test-records/", headers=headers, json=TEST_RECORD)
+        assert client.get("/api/v1/statistics/", headers=headers).json()["total_tests"] == 2
+
+    def test_profile_changes_invalidate(self, client: TestClient, headers: dict):
+        """Test that creating a profile changes total_profiles in the next response"""
+        assert client.get("/api/v1/statistics/", headers=headers).json()["total_profiles"] == 0
+        response = client.post(
+            "/api/v1/onboarding-profiles/", headers=headers,
+            json={"profile_name": "Car", "state": "CA", "test_type": "car"}
+        )
+        assert response.status_code == 201
+        assert client.get("/api/v1/statistics/", headers=headers).json()["total_profiles"] == 1
+
+    @pytest.mark.parametrize("replica_version, served_by", [(0, "primary"), (1, "replica")])
+    def test_lagging_replica_is_not_cached(self, session: Session, test_user: User, replica_version: int, served_by: str):
+        """Test that a body is computed on the primary when the replica hasn't seen the user's last write"""
+        StatsCache.bump(test_user.id, session)
+        session.commit()
+        session.refresh(test_user)
+        replica = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        SQLModel.metadata.create_all(replica)
+        with Session(replica) as replica_session:
+            replica_session.add(User(id=test_user.id, email=test_user.email, stats_version=replica_version))
+            replica_session.commit()
+            body = StatsCache.cached(
+                test_user, "probe", lambda db: "primary" if db is session else "replica", replica_session, session
+            )
+        assert body == f'"{served_by}"'.encode()
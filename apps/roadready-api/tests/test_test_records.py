@@ -2,6 +2,8 @@ import pytest
 from fastapi.testclient import TestClient
 from sqlmodel import Session
 from datetime import datetime, timedelta, date
+import gzip
+import json
 from app.models.user import User
 from app.models.test_record import TestRecord
 
@@ -48,6 +50,21 @@ class TestTestRecordsPagination:
         assert data["total_pages"] == 3
         assert len(data["items"]) == 10
     
+    def test_items_use_test_record_schema(self, client: TestClient, auth_headers: dict, many_test_records: list):
+        """Test that items are serialized through TestRecordRead"""
+        response = client.get(
+            "/api/v1/test-records/?page=1&page_size=1",
+            headers=auth_headers
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        item = response.json()["items"][0]
+        assert set(item) == {
+            "id", "user_id", "state_code", "test_type", "category", "score", "total_questions",
+            "correct_answers", "time_spent", "questions", "user_answers", "is_correct", "onboarding_profile_id",
+            "completed_at", "created_at"
+        }
+    
     def test_get_test_records_second_page(self, client: TestClient, auth_headers: dict, many_test_records: list):
         """Test getting second page"""
         response = client.get(
@@ -229,3 +246,52 @@ class TestTestRecordsCreate:
             headers=auth_headers
         )
         assert response.status_code == 404
+
+class TestTestRecordsExport:
+    """Test streaming export of the full test history"""
+    
+    def test_export_ndjson(self, client: TestClient, auth_headers: dict, many_test_records: list):
+        """Test exporting every record as one JSON object per line"""
+        response = client.get("/api/v1/test-records/export", headers=auth_headers)
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert len(rows) == 25
+        assert [row["id"] for row in rows] == sorted(record.id for record in many_test_records)
+        assert rows[0]["is_correct"] == "[]"
+    
+    def test_export_csv(self, client: TestClient, auth_headers: dict, many_test_records: list):
+        """Test exporting as CSV with a header row"""
+        response = client.get("/api/v1/test-records/export?format=csv", headers=auth_headers)
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        
+        lines = response.text.splitlines()
+        assert lines[0].startswith("id,user_id,state_code")
+        assert len(lines) == 26
+    
+    def test_export_gzip(self, client: TestClient, auth_headers: dict, many_test_records: list):
+        """Test gzip-compressed download"""
+        response = client.get("/api/v1/test-records/export?gzip=true", headers=auth_headers)
+        assert response.status_code == 200
+        assert 'filename="test_records.ndjson.gz"' in response.headers["content-disposition"]
+        assert len(gzip.decompress(response.content).splitlines()) == 25
+    
+    def test_export_excludes_other_users(self, client: TestClient, auth_headers: dict, verified_user: User, session: Session):
+        """Test that only the current user's records are exported"""
+        session.add(TestRecord(
+            user_id=verified_user.id, state_code="CA", test_type="car", category="road_rules",
+            score=90, total_questions=20, correct_answers=18, time_spent=400,
+            questions="[]", user_answers="[]", is_correct="[]"
+        ))
+        session.commit()
+        
+        response = client.get("/api/v1/test-records/export", headers=auth_headers)
+        assert response.status_code == 200
+        assert response.text == ""
+    
+    def test_export_rejects_unknown_format(self, client: TestClient, auth_headers: dict):
+        """Test format validation"""
+        response = client.get("/api/v1/test-records/export?format=xml", headers=auth_headers)
+        assert response.status_code == 422